@@ -0,0 +1,69 @@
+"""Compare the "bigm" and "tight" day-compactness formulations.
+
+For every instance and formulation this reports the build time, the LP
+relaxation bound, and the incumbent objective and wall time of a time
+limited CBC solve. A higher LP bound at the same optimum is what lets CBC
+close the gap.
+
+    python benchmarks/compactness.py --time-limit 60 --seeds 1 2 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pulp
+
+from scheduelModel import build_model, load_inputs
+from instances import generate_instance
+
+
+def run(name, data, compactness, time_limit):
+    start = time.perf_counter()
+    tm = build_model(data, compactness=compactness)
+    build_time = time.perf_counter() - start
+
+    tm.model.solve(pulp.PULP_CBC_CMD(msg=False, mip=False))
+    lp_bound = pulp.value(tm.model.objective)
+
+    start = time.perf_counter()
+    tm.model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    solve_time = time.perf_counter() - start
+
+    return {
+        "instance": name,
+        "formulation": compactness,
+        "build": build_time,
+        "lp_bound": lp_bound,
+        "objective": pulp.value(tm.model.objective),
+        "solve": solve_time,
+        "status": pulp.LpStatus[tm.model.status],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--time-limit", type=int, default=60)
+    parser.add_argument("--seeds", type=int, nargs="*", default=[1, 2])
+    parser.add_argument("--inputs", default="scheduling_inputs01.json",
+                        help="real inputs file benchmarked alongside the seeded instances")
+    args = parser.parse_args()
+
+    instances = []
+    if args.inputs and os.path.exists(args.inputs):
+        instances.append((os.path.basename(args.inputs), load_inputs(args.inputs)))
+    for seed in args.seeds:
+        instances.append((f"seed{seed}", generate_instance(seed)))
+
+    print(f"{'instance':<28}{'form':<7}{'build s':>9}{'LP bound':>11}{'objective':>11}{'solve s':>9}  status")
+    for name, data in instances:
+        for compactness in ("bigm", "tight"):
+            r = run(name, data, compactness, args.time_limit)
+            print(f"{r['instance']:<28}{r['formulation']:<7}{r['build']:>9.2f}{r['lp_bound']:>11.1f}"
+                  f"{r['objective']:>11.1f}{r['solve']:>9.1f}  {r['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import math
+import random
+
+
+def generate_instance(seed, environments=3, groups=2, classes=2, subjects=4,
+                      assistants=6, doctors=6, days=5, periods=5):
+    """Build a random but feasible inputs dictionary in the saved-inputs format.
+
+    The same seed always gives the same instance, so benchmark results stay
+    comparable between runs and formulation changes.
+    """
+    rng = random.Random(seed)
+    DAYS = range(1, days + 1)
+    PERIODS = range(1, periods + 1)
+
+    envs = [f"year{i + 1}" for i in range(environments)]
+    env_groups = {e: [f"{e}-g{j + 1}" for j in range(groups)] for e in envs}
+    group_classes = {g: [f"{g}-c{k + 1}" for k in range(classes)] for e in envs for g in env_groups[e]}
+
+    # a few subjects are shared between environments, like "network" in the sample
+    pool = [f"subject{i + 1}" for i in range(subjects * environments)]
+    env_subjects = {e: rng.sample(pool, subjects) for e in envs}
+    subj_list = sorted({s for e in envs for s in env_subjects[e]})
+
+    A = [f"assistant{i + 1}" for i in range(assistants)]
+    T = [f"doctor{i + 1}" for i in range(doctors)]
+
+    # loads and rooms are sized from the demand so the instance is feasible
+    n_lectures = sum(len(env_subjects[e]) for e in envs for g in env_groups[e])
+    n_sections = sum(len(env_subjects[e]) * len(group_classes[g]) for e in envs for g in env_groups[e])
+    slots = days * periods
+    AL = [math.ceil(n_sections / assistants) + 2, math.ceil(len(subj_list) / assistants) + 2]
+    TL = [math.ceil(n_lectures / doctors) + 2, math.ceil(len(subj_list) / doctors) + 2]
+
+    def time_prefs():
+        return {str(d): {str(p): int(rng.random() < 0.7) for p in PERIODS} for d in DAYS}
+
+    def subject_prefs():
+        liked = set(rng.sample(subj_list, min(len(subj_list), 3)))
+        return {s: int(s in liked) for s in subj_list}
+
+    return {
+        "halls": math.ceil(n_lectures / slots) + 1,
+        "labs": math.ceil(n_sections / slots) + 2,
+        "days": days,
+        "periods": periods,
+        "environments": envs,
+        "groups": env_groups,
+        "classes": group_classes,
+        "subjects": env_subjects,
+        "A": A,
+        "T": T,
+        "AL": AL,
+        "TL": TL,
+        "AT": {a: time_prefs() for a in A},
+        "TT": {t: time_prefs() for t in T},
+        "AS": {a: subject_prefs() for a in A},
+        "TS": {t: subject_prefs() for t in T},
+    }
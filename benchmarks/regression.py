@@ -0,0 +1,220 @@
+"""Performance regression gate over a fixed set of seeded instances.
+
+Every instance goes through scheduelModel() in its own child process, and
+the build time, solve time, time to the target gap and peak memory are
+compared with the stored baselines.
+A metric fails when it exceeds its baseline by more than the relative
+tolerance plus a small absolute slack, and an instance fails outright when
+its solve raises, crashes or overruns the time limit by TIMEOUT_MARGIN;
+the exit code is 1 on any failure.
+
+    python benchmarks/regression.py --update               # record the baselines
+    python benchmarks/regression.py                        # check against them
+    python benchmarks/regression.py --tolerance solve=0.5 --report report.json
+
+Baselines depend on the machine, so record them on the box that runs the
+gate. Everything runs offline: the instances come from instances.py.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instances import generate_instance
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name -> generate_instance() arguments
+INSTANCES = {
+    "seed1": dict(seed=1),
+    "seed2": dict(seed=2),
+    "seed3-6x8": dict(seed=3, days=6, periods=8),
+}
+
+METRICS = ("build", "solve", "time_to_gap", "peak_mb")
+
+# allowed relative increase over the baseline, and absolute slack for noise
+DEFAULT_TOLERANCES = {"build": 0.25, "solve": 0.25, "time_to_gap": 0.5, "peak_mb": 0.2}
+SLACK = {"build": 0.5, "solve": 2.0, "time_to_gap": 2.0, "peak_mb": 20}
+
+# seconds an instance may run past its time limit (build, verification, rendering)
+TIMEOUT_MARGIN = 300
+
+
+def _measure(name, settings, results):
+    """Child process: solve one instance and put its metrics, or its error, on `results`."""
+    from run_history import time_to_gap
+    from scheduelModel import scheduelModel
+
+    data = generate_instance(**INSTANCES[name])
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            solution = scheduelModel(data, time_limit=settings["time_limit"], output_dir=output_dir,
+                                     compactness=settings["compactness"], history_path=settings["history"],
+                                     run_label=f"regression {name}")
+            wall = time.perf_counter() - start
+    except Exception as e:
+        results.put({"instance": name, "error": f"{type(e).__name__}: {e}"})
+        return
+    solves = solution["solver"]["solves"]
+    reached = time_to_gap(solves, settings["target_gap"])
+    results.put({
+        "instance": name,
+        "status": solution["status"],
+        "objective": solution["objective"],
+        "feasible": solution["verification"]["feasible"],
+        "build": solution["timings"].get("build"),
+        "solve": solution["timings"].get("solve"),
+        # not reaching the gap counts as taking the whole run
+        "time_to_gap": reached if reached is not None else wall,
+        "reached_gap": reached is not None,
+        # the larger of the model build and CBC; ru_maxrss is in kilobytes on Linux
+        "peak_mb": max(resource.getrusage(who).ru_maxrss
+                       for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)) / 1024,
+    })
+
+
+def measure(name, settings):
+    """Metrics of one instance, solved in a fresh process so peak memory is its own.
+
+    A child that raises, dies or overruns its time limit by TIMEOUT_MARGIN
+    gives {"instance", "error"} instead.
+    """
+    context = mp.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=_measure, args=(name, settings, results))
+    child.start()
+    deadline = time.monotonic() + settings["time_limit"] + TIMEOUT_MARGIN
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1)
+        except queue.Empty:
+            if not child.is_alive():
+                # whatever it sent is in the pipe by the time it has exited
+                try:
+                    result = results.get(timeout=1)
+                except queue.Empty:
+                    result = {"instance": name, "error": f"Solver process exited with code {child.exitcode}"}
+            elif time.monotonic() > deadline:
+                child.kill()
+                result = {"instance": name, "error": f"No result within {settings['time_limit'] + TIMEOUT_MARGIN} s"}
+    child.join(10)
+    if child.is_alive():
+        child.kill()
+        child.join()
+    elif child.exitcode and "error" not in result:
+        result = {"instance": name, "error": f"Solver process exited with code {child.exitcode}"}
+    return result
+
+
+def _cell(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def compare(result, baseline, tolerances):
+    """Per-metric deltas of `result` against `baseline`; returns (rows, passed)."""
+    rows = []
+    passed = True
+    for metric in METRICS:
+        new, old = result[metric], baseline.get(metric)
+        if old is None or new is None:
+            rows.append({"metric": metric, "baseline": old, "value": new, "delta": None, "ok": True})
+            continue
+        limit = old * (1 + tolerances[metric]) + SLACK[metric]
+        ok = new <= limit
+        passed &= ok
+        rows.append({"metric": metric, "baseline": old, "value": new, "limit": limit,
+                     "delta": (new - old) / old if old else None, "ok": ok})
+    if baseline.get("feasible") and not result["feasible"]:
+        rows.append({"metric": "feasible", "baseline": True, "value": False, "delta": None, "ok": False})
+        passed = False
+    return rows, passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"), help="baselines JSON file")
+    parser.add_argument("--update", action="store_true", help="record the results as the new baselines")
+    parser.add_argument("--instances", nargs="*", choices=sorted(INSTANCES), default=sorted(INSTANCES))
+    parser.add_argument("--time-limit", type=int, default=60)
+    parser.add_argument("--compactness", choices=["bigm", "tight"], default="bigm")
+    parser.add_argument("--target-gap", type=float, default=0.05, help="relative gap for time_to_gap")
+    parser.add_argument("--tolerance", action="append", default=[], metavar="METRIC=FRACTION",
+                        help=f"allowed relative increase, METRIC one of {', '.join(METRICS)} (repeatable)")
+    parser.add_argument("--history", help="also append the runs to this run history (see run_history.py)")
+    parser.add_argument("--report", help="write the pass/fail report to this JSON file")
+    args = parser.parse_args()
+
+    tolerances = dict(DEFAULT_TOLERANCES)
+    for item in args.tolerance:
+        metric, _, value = item.partition("=")
+        if metric not in tolerances:
+            parser.error(f"unknown metric {metric!r}")
+        tolerances[metric] = float(value)
+    settings = {"time_limit": args.time_limit, "compactness": args.compactness,
+                "target_gap": args.target_gap, "history": args.history}
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    if not args.update and not baselines:
+        parser.error(f"no baselines in {args.baseline}, run with --update first")
+    recorded = {k: v for k, v in baselines.get("settings", {}).items() if k != "history"}
+    if not args.update and recorded != {k: v for k, v in settings.items() if k != "history"}:
+        print(f"Warning: the baselines were recorded with {recorded}")
+
+    results = []
+    failed = {}
+    for name in args.instances:
+        print(f"Solving {name}...", flush=True)
+        result = measure(name, settings)
+        if "error" in result:
+            print(f"{name} failed: {result['error']}")
+            failed[name] = result["error"]
+        else:
+            results.append(result)
+
+    if args.update:
+        baselines = {"settings": settings, "created_at": time.time(),
+                     "instances": dict(baselines.get("instances", {}), **{r["instance"]: r for r in results})}
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Baselines of {len(results)} instances written to {args.baseline}")
+        return 1 if failed else 0
+
+    report = {"settings": settings, "tolerances": tolerances, "passed": not failed,
+              "instances": {name: {"passed": False, "error": error} for name, error in failed.items()}}
+    print(f"\n{'instance':<12}{'metric':<13}{'baseline':>10}{'value':>10}{'delta':>9}  result")
+    for name, error in failed.items():
+        print(f"{name:<12}{'error':<13}{'':>10}{'':>10}{'':>9}  FAIL")
+    for result in results:
+        baseline = baselines["instances"].get(result["instance"])
+        if baseline is None:
+            print(f"{result['instance']:<12}no baseline, skipped")
+            continue
+        rows, passed = compare(result, baseline, tolerances)
+        report["instances"][result["instance"]] = {"passed": passed, "metrics": rows}
+        report["passed"] &= passed
+        for row in rows:
+            delta = f"{row['delta']:+.0%}" if row["delta"] is not None else "-"
+            print(f"{result['instance']:<12}{row['metric']:<13}{_cell(row['baseline']):>10}{_cell(row['value']):>10}"
+                  f"{delta:>9}  {'ok' if row['ok'] else 'FAIL'}")
+    print("\nPASS" if report["passed"] else "\nFAIL")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
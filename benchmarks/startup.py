@@ -0,0 +1,86 @@
+"""Cold-start time of the UI and of the headless entry point.
+
+Every measurement runs in a fresh interpreter, so it includes Python's own
+startup and every import, like a user launching the program:
+
+ui-import        import scheduler_ui
+ui-window        import it, build SchedulingApp and draw the window (needs a display)
+headless-import  import scheduelModel
+headless-help    python scheduelModel.py --help
+
+For each one the heavy libraries already loaded at that point are listed,
+since a new top-level import of matplotlib or numpy is the usual culprit:
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 10 --report startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("pulp", "numpy", "pandas", "matplotlib", "tkinter", "http.server")
+
+_LOADED = f"import sys, json; print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+
+# name -> python code run in the child; it prints the heavy modules it loaded
+TARGETS = {
+    "ui-import": "import scheduler_ui\n" + _LOADED,
+    "ui-window": ("import tkinter as tk, scheduler_ui\n"
+                  "root = tk.Tk()\n"
+                  "scheduler_ui.SchedulingApp(root)\n"
+                  "root.update()\n" + _LOADED + "\nroot.destroy()"),
+    "headless-import": "import scheduelModel\n" + _LOADED,
+    "headless-help": ("import runpy, sys, contextlib, io\n"
+                      "sys.argv = ['scheduelModel.py', '--help']\n"
+                      "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+                      "    runpy.run_path('scheduelModel.py', run_name='__main__')\n" + _LOADED),
+}
+
+
+def measure(code):
+    """Seconds from starting a fresh interpreter running `code` to its exit, and what it loaded."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return seconds, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", nargs="*", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5, help="runs per target, the median is reported")
+    parser.add_argument("--report", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    # the interpreter alone, to tell startup from imports
+    baseline = statistics.median(measure(_LOADED)[0] for _ in range(args.repeat))
+    results = {"python": {"median": baseline, "min": baseline, "loaded": []}}
+    print(f"{'target':<17}{'median s':>9}{'min s':>8}{'imports s':>10}  heavy modules loaded")
+    print(f"{'python':<17}{baseline:>9.3f}{baseline:>8.3f}{0:>10.3f}")
+    for name in args.targets:
+        try:
+            runs = [measure(TARGETS[name]) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            # typically no display for the window
+            print(f"{name:<17}skipped: {e}")
+            continue
+        times = [seconds for seconds, loaded in runs]
+        loaded = runs[-1][1]
+        results[name] = {"median": statistics.median(times), "min": min(times), "loaded": loaded}
+        print(f"{name:<17}{results[name]['median']:>9.3f}{min(times):>8.3f}"
+              f"{results[name]['median'] - baseline:>10.3f}  {', '.join(loaded) or '-'}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
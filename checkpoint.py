@@ -0,0 +1,100 @@
+"""Checkpoints of the incumbent schedule during long solves.
+
+CBC only hands its solution back when it exits, so a killed run loses
+everything it found. solve_with_checkpoints() splits the time limit into
+segments of `every` seconds; each segment is warm-started from the best
+schedule so far, and whenever that schedule improves it is written to the
+checkpoint file in compact form. An interrupted run loses at most one
+segment and can be resumed from the file:
+
+    python scheduelModel.py --time-limit 28800 --checkpoint night.json
+    python scheduelModel.py --time-limit 28800 --checkpoint night.json --resume night.json
+
+Every segment restarts CBC's search tree, so segments should be long.
+"""
+import json
+import os
+import time
+
+import pulp
+
+# a stopped solve still reports an incumbent through sol_status
+_FOUND = (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+
+
+def write_checkpoint(path, solution, input_hash):
+    """Write `solution` (lectures, sections, status, objective) to `path` atomically."""
+    record = {
+        "created_at": time.time(),
+        "input_hash": input_hash,
+        "status": solution.get("status"),
+        "objective": solution.get("objective"),
+        "elapsed": solution.get("elapsed"),
+        "lectures": solution["lectures"],
+        "sections": solution["sections"],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    # a crash while writing leaves the previous checkpoint in place
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, input_hash=None):
+    """The compact solution saved in `path`; with `input_hash`, it must be of those inputs."""
+    with open(path, encoding="utf-8") as f:
+        record = json.load(f)
+    if input_hash is not None and record["input_hash"] != input_hash:
+        raise ValueError(f"The checkpoint {path} was written for other inputs")
+    return record
+
+
+def solve_with_checkpoints(tm, solver, time_limit, path, input_hash, every=300, warm_start=False):
+    """Solve `tm` in segments of `every` seconds, checkpointing each better schedule to `path`.
+
+    The first segment is warm-started only with `warm_start` (a start set
+    with TimetableModel.set_start), the later ones always from the
+    incumbent. Stops when a segment proves its schedule optimal or finds
+    nothing. Leaves the best schedule in the variable values, like a
+    normal solve, and returns [(seconds, objective)] of the checkpoints.
+    """
+    from scheduelModel import extract_solution
+
+    model = tm.model
+    start = time.perf_counter()
+    deadline = start + time_limit
+    best = None
+    values = None
+    checkpoints = []
+    while True:
+        remaining = deadline - time.perf_counter()
+        model.solve(solver(max(1, min(every, remaining)), warmStart=warm_start or best is not None))
+        if model.sol_status not in _FOUND:
+            break
+        objective = pulp.value(model.objective)
+        if best is None or objective < best - 1e-6:
+            best = objective
+            values = {var.name: var.varValue for var in model.variables()}
+            status = model.status, model.sol_status
+            solution = extract_solution(tm.index, tm.Y, tm.X, tm.I, tm.J)
+            if tm.pools is not None:
+                from teacher_pools import disaggregate
+
+                solution = disaggregate(tm, solution)
+            if solution is not None:
+                elapsed = time.perf_counter() - start
+                write_checkpoint(path, dict(solution, status=pulp.LpStatus[model.status], objective=objective,
+                                            elapsed=elapsed), input_hash)
+                checkpoints.append((elapsed, objective))
+        if model.sol_status == pulp.LpSolutionOptimal or deadline - time.perf_counter() < 1:
+            break
+        # the next segment starts from the best schedule so far
+        for var in model.variables():
+            var.setInitialValue(values[var.name])
+    if values is not None:
+        # the last segment may have stopped on a worse incumbent, or on none
+        for var in model.variables():
+            var.varValue = values[var.name]
+        model.status, model.sol_status = status
+    return checkpoints
@@ -0,0 +1,408 @@
+"""Column generation over weekly group patterns.
+
+The slot-indexed MIP grows with days x periods x teachers. This engine
+splits the problem in two:
+
+1. Timing. A column is a complete weekly pattern of one group: a slot for
+   every lecture of the group (shared by its classes) and for every
+   section of each of its classes, with the exact day, gap and deviation
+   cost of its classes precomputed. The master problem picks one pattern
+   per group under the per-slot hall and lab capacities (capped by the
+   number of doctors and assistants available in the slot). Its LP duals
+   price the slots, and a small per-group MIP (the pricing subproblem)
+   returns the pattern of least reduced cost. The groups are priced in turn, each avoiding the
+   slots the earlier ones of the round filled, so every round also adds a
+   set of patterns that fit together. Rounds go on until none prices out
+   or the time share runs out, then the master is solved as a MIP over
+   the generated columns (price-and-branch).
+2. Teachers. With the times fixed, a teacher assignment MIP per session
+   enforces the AL/TL loads and single-slot rule and maximizes the
+   preferences.
+
+The first columns come from draft_schedule, so the master is feasible
+from the start; capacity slacks with a large penalty cover the rest. If
+no teacher assignment fits the chosen times after a few tries, or the
+integer master can only fit the groups by overflowing a slot, the draft
+itself is returned. A group for which not even the pricing subproblem
+finds a pattern makes the instance unschedulable.
+"""
+import math
+import time
+
+import pulp
+
+from draft_schedule import Instance, draft_schedule
+from preference_table import UNAVAILABLE
+from schedule_verifier import verify_schedule
+
+# cost of one session over a slot's capacity in the master
+OVERFLOW_COST = 10000
+
+# integer master solves tried before falling back to the draft
+MASTER_ATTEMPTS = 3
+
+
+class Pattern:
+    """One weekly pattern of a group.
+
+    `lectures` maps subject -> (day, period), `sections` maps
+    (class, subject) -> (day, period); `cost` is the objective share of
+    the group's classes under this pattern.
+    """
+    def __init__(self, group, lectures, sections, cost):
+        self.group = group
+        self.lectures = lectures
+        self.sections = sections
+        self.cost = cost
+        self.hall_use = {}
+        self.lab_use = {}
+        for slot in lectures.values():
+            self.hall_use[slot] = self.hall_use.get(slot, 0) + 1
+        for slot in sections.values():
+            self.lab_use[slot] = self.lab_use.get(slot, 0) + 1
+
+    def key(self):
+        return (tuple(sorted(self.lectures.items())), tuple(sorted(self.sections.items())))
+
+
+class _Engine:
+    def __init__(self, data, weights):
+        self.inst = inst = Instance(data)
+        self.weights = weights
+        self.half = math.ceil(inst.P / 2)
+        self.hall_cap = {slot: min(inst.halls, inst.doctors_open[slot]) for slot in inst.slots}
+        self.lab_cap = {slot: min(inst.labs, inst.assistants_open[slot]) for slot in inst.slots}
+        # preference proxy: share of the teachers who like a slot
+        self.doctor_like = {slot: sum(inst.TT[t, slot[0], slot[1]] > 0 for t in inst.T) / max(1, len(inst.T))
+                            for slot in inst.slots}
+        self.assistant_like = {slot: sum(inst.AT[a, slot[0], slot[1]] > 0 for a in inst.A) / max(1, len(inst.A))
+                               for slot in inst.slots}
+        self.patterns = {g: [] for e, g in inst.groups}
+        self.seen = set()
+        self.pricing = {}
+
+    # --------------------------------------- columns
+
+    def pattern(self, e, g, lectures, sections):
+        """A Pattern with its exact compactness cost and the preference proxy."""
+        inst = self.inst
+        w = self.weights
+        classes = inst.classes[g]
+        cost = 0
+        for c in classes:
+            busy = {}
+            for slot in list(lectures.values()) + [slot for (cc, s), slot in sections.items() if cc == c]:
+                busy.setdefault(slot[0], []).append(slot[1])
+            for periods in busy.values():
+                load = len(periods)
+                cost += (w["days"] + w["deviation"] * abs(load - self.half)
+                         + w["gaps"] * (max(periods) - min(periods) + 1 - load))
+        cost -= w["preferences"] * (
+            len(classes) * sum(self.doctor_like[slot] for slot in lectures.values())
+            + sum(self.assistant_like[slot] for slot in sections.values())
+        )
+        return Pattern(g, lectures, sections, cost)
+
+    def add(self, pattern):
+        key = (pattern.group, pattern.key())
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.patterns[pattern.group].append(pattern)
+        return True
+
+    def seed(self, draft):
+        """Columns of the groups the draft placed completely."""
+        lectures, sections = {}, {}
+        for e, g, c, s, d, p, t in draft["lectures"]:
+            lectures.setdefault((e, g), {})[s] = (d, p)
+        for e, g, c, s, d, p, a in draft["sections"]:
+            sections.setdefault((e, g), {})[c, s] = (d, p)
+        for e, g in self.inst.groups:
+            lec, sec = lectures.get((e, g), {}), sections.get((e, g), {})
+            if len(lec) == len(self.inst.subjects[e]) and len(sec) == len(self.inst.subjects[e]) * len(self.inst.classes[g]):
+                self.add(self.pattern(e, g, lec, sec))
+
+    # --------------------------------------- master
+
+    def master(self, integer=False, time_limit=None, excluded=()):
+        """Solve the restricted master.
+
+        Returns (model, duals) for the LP and (model, {group: pattern})
+        with `integer`; `excluded` lists pattern choices the MIP may not
+        repeat. An integer master that needs the capacity slacks chooses
+        no patterns, since its schedule would not fit the rooms.
+        """
+        inst = self.inst
+        model = pulp.LpProblem("Master", pulp.LpMinimize)
+        cat = pulp.LpBinary if integer else pulp.LpContinuous
+        lam = {(g, k): pulp.LpVariable(f"l_{n}_{k}", 0, 1, cat=cat)
+               for n, (e, g) in enumerate(inst.groups) for k in range(len(self.patterns[g]))}
+        over_h = {slot: pulp.LpVariable(f"oh_{slot[0]}_{slot[1]}", 0) for slot in inst.slots}
+        over_l = {slot: pulp.LpVariable(f"ol_{slot[0]}_{slot[1]}", 0) for slot in inst.slots}
+        model += (pulp.lpSum(self.patterns[g][k].cost * v for (g, k), v in lam.items())
+                  + OVERFLOW_COST * pulp.lpSum(list(over_h.values()) + list(over_l.values())))
+        for n, (e, g) in enumerate(inst.groups):
+            model += (pulp.lpSum(lam[g, k] for k in range(len(self.patterns[g]))) == 1, f"conv_{n}")
+        for d, p in inst.slots:
+            model += (pulp.lpSum(self.patterns[g][k].hall_use.get((d, p), 0) * v for (g, k), v in lam.items())
+                      - over_h[d, p] <= self.hall_cap[d, p], f"hall_{d}_{p}")
+            model += (pulp.lpSum(self.patterns[g][k].lab_use.get((d, p), 0) * v for (g, k), v in lam.items())
+                      - over_l[d, p] <= self.lab_cap[d, p], f"lab_{d}_{p}")
+        for chosen in excluded:
+            model += pulp.lpSum(lam[g, self.patterns[g].index(pattern)] for g, pattern in chosen.items()) <= len(chosen) - 1
+        options = {"timeLimit": max(1, time_limit)} if time_limit else {}
+        model.solve(pulp.PULP_CBC_CMD(msg=False, **options))
+        if integer:
+            if any((v.varValue or 0) > 1e-6 for v in list(over_h.values()) + list(over_l.values())):
+                return model, {}
+            chosen = {g: self.patterns[g][k] for (g, k), v in lam.items() if (v.varValue or 0) > 0.5}
+            return model, chosen
+        duals = {
+            "conv": {g: model.constraints[f"conv_{n}"].pi for n, (e, g) in enumerate(inst.groups)},
+            "hall": {(d, p): model.constraints[f"hall_{d}_{p}"].pi for d, p in inst.slots},
+            "lab": {(d, p): model.constraints[f"lab_{d}_{p}"].pi for d, p in inst.slots},
+        }
+        return model, duals
+
+    # --------------------------------------- pricing
+
+    def _pricing_model(self, e, g):
+        """The timing model of one group, without teachers and capacities."""
+        inst = self.inst
+        w = self.weights
+        classes, subjects = inst.classes[g], inst.subjects[e]
+        model = pulp.LpProblem("Pricing", pulp.LpMinimize)
+        binary = pulp.LpBinary
+        Z = {(s, slot): pulp.LpVariable(f"z_{i}_{slot[0]}_{slot[1]}", cat=binary)
+             for i, s in enumerate(subjects) for slot in inst.slots}
+        X = {(c, s, slot): pulp.LpVariable(f"x_{j}_{i}_{slot[0]}_{slot[1]}", cat=binary)
+             for j, c in enumerate(classes) for i, s in enumerate(subjects) for slot in inst.slots}
+        for s in subjects:
+            model += pulp.lpSum(Z[s, slot] for slot in inst.slots) == 1
+            for c in classes:
+                model += pulp.lpSum(X[c, s, slot] for slot in inst.slots) == 1
+
+        compact = []
+        for j, c in enumerate(classes):
+            for d in range(1, inst.D + 1):
+                BD = pulp.LpVariable(f"bd_{j}_{d}", cat=binary)
+                DEV = pulp.LpVariable(f"dev_{j}_{d}", 0)
+                BP = {p: pulp.lpSum(Z[s, (d, p)] + X[c, s, (d, p)] for s in subjects) for p in range(1, inst.P + 1)}
+                ST = {p: pulp.LpVariable(f"st_{j}_{d}_{p}", cat=binary) for p in BP}
+                NE = {p: pulp.LpVariable(f"ne_{j}_{d}_{p}", cat=binary) for p in BP}
+                load = pulp.lpSum(BP.values())
+                for p in BP:
+                    model += BP[p] <= BD         # NoDouble, and the day is a study day
+                    model += ST[p] >= BP[p]
+                    model += NE[p] >= BP[p]
+                    model += ST[p] <= BD
+                    model += NE[p] <= BD
+                    if p > 1:
+                        model += ST[p] >= ST[p - 1]
+                    if p < inst.P:
+                        model += NE[p] >= NE[p + 1]
+                model += DEV >= load - self.half
+                model += DEV >= self.half * BD - load
+                gap = pulp.lpSum(ST[p] + NE[p] for p in BP) - load - inst.P * BD
+                compact.append(w["days"] * BD + w["deviation"] * DEV + w["gaps"] * gap)
+        return model, Z, X, pulp.lpSum(compact)
+
+    def price(self, e, g, duals, time_limit, full=((), ())):
+        """The pattern of least reduced cost for group g; returns (pattern, reduced cost).
+
+        `full` holds the hall and lab slots taken by the patterns priced
+        before in the same round; they are penalized so that one round
+        yields columns that fit together.
+        """
+        if g not in self.pricing:
+            self.pricing[g] = self._pricing_model(e, g)
+        model, Z, X, compact = self.pricing[g]
+        w = self.weights
+        n_classes = len(self.inst.classes[g])
+        hall = duals["hall"] if duals else {}
+        lab = duals["lab"] if duals else {}
+        full_halls, full_labs = full
+        model.setObjective(
+            compact
+            + pulp.lpSum((-hall.get(slot, 0) - w["preferences"] * n_classes * self.doctor_like[slot]
+                          + OVERFLOW_COST * (slot in full_halls)) * z
+                         for (s, slot), z in Z.items())
+            + pulp.lpSum((-lab.get(slot, 0) - w["preferences"] * self.assistant_like[slot]
+                          + OVERFLOW_COST * (slot in full_labs)) * x
+                         for (c, s, slot), x in X.items())
+        )
+        model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=max(1, time_limit), gapRel=0.01))
+        if model.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+            return None, 0
+        lectures = {s: slot for (s, slot), z in Z.items() if (z.varValue or 0) > 0.5}
+        sections = {(c, s): slot for (c, s, slot), x in X.items() if (x.varValue or 0) > 0.5}
+        pattern = self.pattern(e, g, lectures, sections)
+        reduced = (pattern.cost
+                   - sum(hall.get(slot, 0) for slot in lectures.values())
+                   - sum(lab.get(slot, 0) for slot in sections.values())
+                   - (duals["conv"][g] if duals else 0))
+        return pattern, reduced
+
+
+def assign_teachers(inst, lectures, sections, weights, time_limit):
+    """Teachers for sessions whose times are fixed.
+
+    `lectures` is a list of (env, group, subject, slot) and `sections` of
+    (env, group, class, subject, slot). Returns the compact lecture and
+    section rows of the sessions that got a teacher, and the pulp status.
+    """
+    model = pulp.LpProblem("Teachers", pulp.LpMinimize)
+    W = {(t, i): pulp.LpVariable(f"w_{n}_{i}", cat=pulp.LpBinary)
+         for n, t in enumerate(inst.T) for i in range(len(lectures))}
+    V = {(a, i): pulp.LpVariable(f"v_{n}_{i}", cat=pulp.LpBinary)
+         for n, a in enumerate(inst.A) for i in range(len(sections))}
+    lecture_subjects = sorted({item[2] for item in lectures})
+    section_subjects = sorted({item[3] for item in sections})
+    TDS = {(t, s): pulp.LpVariable(f"tds_{n}_{m}", cat=pulp.LpBinary)
+           for n, t in enumerate(inst.T) for m, s in enumerate(lecture_subjects)}
+    ADS = {(a, s): pulp.LpVariable(f"ads_{n}_{m}", cat=pulp.LpBinary)
+           for n, a in enumerate(inst.A) for m, s in enumerate(section_subjects)}
+
+    objective = []
+    for teachers, items, assign, taught, limits, time_prefs, subject_prefs, weight_of in (
+            (inst.T, lectures, W, TDS, inst.TL, inst.TT, inst.TS, lambda item: len(inst.classes[item[1]])),
+            (inst.A, sections, V, ADS, inst.AL, inst.AT, inst.AS, lambda item: 1)):
+        for i in range(len(items)):
+            model += pulp.lpSum(assign[t, i] for t in teachers) == 1
+        by_slot = {}
+        for i, item in enumerate(items):
+            by_slot.setdefault(item[-1], []).append(i)
+        for t in teachers:
+            for slot_items in by_slot.values():
+                if len(slot_items) > 1:
+                    model += pulp.lpSum(assign[t, i] for i in slot_items) <= 1
+            model += pulp.lpSum(assign[t, i] for i in range(len(items))) <= limits[0]
+            subjects = {s for (tt, s) in taught if tt == t}
+            model += pulp.lpSum(taught[t, s] for s in subjects) <= limits[1]
+            for i, item in enumerate(items):
+                model += assign[t, i] <= taught[t, item[-2]]
+                slot = item[-1]
+                if time_prefs[t, slot[0], slot[1]] == UNAVAILABLE:
+                    assign[t, i].upBound = 0
+                objective.append(time_prefs[t, slot[0], slot[1]] * weight_of(item) * assign[t, i])
+            for s in subjects:
+                objective.append(subject_prefs.get(t, {}).get(s, 0) * taught[t, s])
+    model += -weights["preferences"] * pulp.lpSum(objective)
+    model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=max(1, time_limit)))
+
+    lecture_rows, section_rows = [], []
+    if model.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+        for (t, i), v in W.items():
+            if (v.varValue or 0) > 0.5:
+                e, g, s, (d, p) = lectures[i]
+                lecture_rows += [[e, g, c, s, d, p, t] for c in inst.classes[g]]
+        for (a, i), v in V.items():
+            if (v.varValue or 0) > 0.5:
+                e, g, c, s, (d, p) = sections[i]
+                section_rows.append([e, g, c, s, d, p, a])
+    return lecture_rows, section_rows, pulp.LpStatus[model.status]
+
+
+def column_generation(data, time_limit=120, weights=None, progress=None):
+    """Solve the timetable by column generation; returns a compact solution.
+
+    About 60% of `time_limit` goes to generating columns, 25% to the
+    integer master and the rest to the teacher assignment. The solution
+    carries "columns" (patterns per group) and "iterations" besides the
+    usual entries and its verification report; "unschedulable" lists the
+    groups without any pattern, whose status is then "Infeasible".
+    """
+    if weights is None:
+        from scheduelModel import DEFAULT_WEIGHTS
+        weights = DEFAULT_WEIGHTS
+
+    def report(phase):
+        if progress is not None:
+            progress(phase)
+
+    start = time.perf_counter()
+    engine = _Engine(data, weights)
+    inst = engine.inst
+    report("drafting")
+    draft = draft_schedule(data, time_limit=min(5, 0.1 * time_limit), weights=weights)
+    engine.seed(draft)
+    # groups the draft left incomplete are priced for their first column,
+    # out of the time share of the generation
+    generation_end = start + 0.6 * time_limit
+    unseeded = [(e, g) for e, g in inst.groups if not engine.patterns[g]]
+    unschedulable = []
+    for n, (e, g) in enumerate(unseeded):
+        budget = (generation_end - time.perf_counter()) / (len(unseeded) - n)
+        pattern, reduced = engine.price(e, g, None, min(10, budget))
+        if pattern is None:
+            unschedulable.append(g)
+        else:
+            engine.add(pattern)
+
+    report("generating columns")
+    iterations = 0
+    # the master has no solution while a group has no pattern
+    while not unschedulable and time.perf_counter() < generation_end:
+        _, duals = engine.master()
+        # the groups take turns to go first
+        order = inst.groups[iterations % len(inst.groups):] + inst.groups[:iterations % len(inst.groups)]
+        iterations += 1
+        halls, labs = {}, {}
+        improving = 0
+        for n, (e, g) in enumerate(order):
+            budget = (generation_end - time.perf_counter()) / (len(order) - n)
+            if budget <= 0:
+                break
+            full = ({slot for slot, used in halls.items() if used >= engine.hall_cap[slot]},
+                    {slot for slot, used in labs.items() if used >= engine.lab_cap[slot]})
+            pattern, reduced = engine.price(e, g, duals, min(10, budget), full)
+            if pattern is None:
+                continue
+            for slot, used in pattern.hall_use.items():
+                halls[slot] = halls.get(slot, 0) + used
+            for slot, used in pattern.lab_use.items():
+                labs[slot] = labs.get(slot, 0) + used
+            if engine.add(pattern) and reduced < -1e-6:
+                improving += 1
+        if not improving:
+            break
+
+    # the master only counts teachers per slot, so the chosen times may
+    # leave no room for the subject limits: exclude them and try again
+    excluded = []
+    solution = None
+    for attempt in range(0 if unschedulable else MASTER_ATTEMPTS):
+        report("solving master")
+        master, chosen = engine.master(integer=True, time_limit=0.25 * time_limit / MASTER_ATTEMPTS,
+                                       excluded=excluded)
+        if len(chosen) < len(inst.groups):
+            break
+        lectures = [(e, g, s, slot) for e, g in inst.groups for s, slot in chosen[g].lectures.items()]
+        sections = [(e, g, c, s, slot) for e, g in inst.groups for (c, s), slot in chosen[g].sections.items()]
+
+        report("assigning teachers")
+        budget = (start + time_limit - time.perf_counter()) / (MASTER_ATTEMPTS - attempt)
+        lecture_rows, section_rows, status = assign_teachers(inst, lectures, sections, weights, budget)
+        if lecture_rows:
+            solution = {"lectures": lecture_rows, "sections": section_rows}
+            break
+        excluded.append(chosen)
+
+    if solution is None:
+        # the draft's teachers are known to fit
+        solution = {"lectures": draft["lectures"], "sections": draft["sections"]}
+        status = "Infeasible" if unschedulable else "Draft"
+    verification = verify_schedule(data, solution, weights)
+    return dict(
+        solution,
+        status=status,
+        objective=verification["objective"],
+        components=verification["components"],
+        gaps=verification["components"]["gaps"],
+        days=verification["components"]["days"],
+        verification=verification,
+        columns={g: len(patterns) for g, patterns in engine.patterns.items()},
+        iterations=iterations,
+        unschedulable=unschedulable,
+    )
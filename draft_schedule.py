@@ -0,0 +1,300 @@
+"""Instant draft timetable from a reduced LP relaxation.
+
+The full model has a binary per teacher, class, subject and slot, far too
+many to solve in seconds. The draft works on a reduced LP instead: one
+continuous variable per group lecture slot and per class section slot,
+with hall, lab, class and teacher-count capacities per slot and a
+fractional study-day term. Its values drive a randomized, capacity-aware
+rounding that places the sessions one by one and picks a free teacher
+within the AL/TL loads; a repair pass moves sections out of the way of
+sessions that did not fit. The best of several roundings (scored with
+schedule_verifier) is returned, as a preview and as a MIP start.
+"""
+import random
+import time
+
+import pulp
+
+from preference_table import UNAVAILABLE
+from schedule_verifier import verify_schedule
+
+
+class Instance:
+    """The inputs in the shape the heuristics need: names, slots and preference lookups."""
+    def __init__(self, data):
+        self.D = data['days']
+        self.P = data['periods']
+        self.slots = [(d, p) for d in range(1, self.D + 1) for p in range(1, self.P + 1)]
+        if 'rooms' in data:
+            self.halls = len(data['rooms'].get('halls', []))
+            self.labs = len(data['rooms'].get('labs', []))
+        else:
+            self.halls, self.labs = data['halls'], data['labs']
+        self.AL, self.TL = data['AL'], data['TL']
+        self.A, self.T = list(data['A']), list(data['T'])
+        self.groups = [(e, g) for e in data['environments'] for g in data['groups'][e]]
+        self.classes = {g: list(data['classes'][g]) for e, g in self.groups}
+        self.subjects = {e: list(data['subjects'][e]) for e in data['environments']}
+        self.units = [(e, g, c) for e, g in self.groups for c in self.classes[g]]
+        self.lecture_items = [(e, g, s) for e, g in self.groups for s in self.subjects[e]]
+        self.section_items = [(e, g, c, s) for e, g, c in self.units for s in self.subjects[e]]
+
+        def time_prefs(prefs, teachers):
+            return {(t, d, p): prefs[t][str(d)][str(p)] for t in teachers for d, p in self.slots}
+
+        self.AT = time_prefs(data['AT'], self.A)
+        self.TT = time_prefs(data['TT'], self.T)
+        # teachers available per slot, a cap on the sessions it can hold
+        self.doctors_open = {slot: sum(self.TT[t, slot[0], slot[1]] != UNAVAILABLE for t in self.T)
+                             for slot in self.slots}
+        self.assistants_open = {slot: sum(self.AT[a, slot[0], slot[1]] != UNAVAILABLE for a in self.A)
+                                for slot in self.slots}
+        self.AS = data['AS']
+        self.TS = data['TS']
+
+
+def _lp_weights(inst, weights, time_limit):
+    """Solve the reduced LP; returns {item: {slot: value}} for lectures and sections."""
+    model = pulp.LpProblem("Draft", pulp.LpMinimize)
+    n = iter(range(10 ** 9))
+
+    def var(upBound=1):
+        return pulp.LpVariable(f"v{next(n)}", 0, upBound)
+
+    Z = {(item, slot): var() for item in inst.lecture_items for slot in inst.slots}
+    X = {(item, slot): var() for item in inst.section_items for slot in inst.slots}
+    BD = {(u, d): var() for u in inst.units for d in range(1, inst.D + 1)}
+
+    by_unit = {}
+    for (e, g, s), slot in Z:
+        for c in inst.classes[g]:
+            by_unit.setdefault(((e, g, c), slot), []).append(Z[(e, g, s), slot])
+    for (e, g, c, s), slot in X:
+        by_unit.setdefault(((e, g, c), slot), []).append(X[(e, g, c, s), slot])
+
+    for item in inst.lecture_items:
+        model += pulp.lpSum(Z[item, slot] for slot in inst.slots) == 1
+    for item in inst.section_items:
+        model += pulp.lpSum(X[item, slot] for slot in inst.slots) == 1
+    for slot in inst.slots:
+        lectures = pulp.lpSum(Z[item, slot] for item in inst.lecture_items)
+        sections = pulp.lpSum(X[item, slot] for item in inst.section_items)
+        model += lectures <= min(inst.halls, inst.doctors_open[slot])
+        model += sections <= min(inst.labs, inst.assistants_open[slot])
+    for (u, (d, p)), sessions in by_unit.items():
+        # NoDouble, and a session makes the day a study day
+        model += pulp.lpSum(sessions) <= BD[u, d]
+
+    # study days, a nudge towards early periods (fewer gaps) and the share
+    # of teachers who like the slot
+    doctor_like = {slot: sum(inst.TT[t, slot[0], slot[1]] > 0 for t in inst.T) / max(1, len(inst.T)) for slot in inst.slots}
+    assistant_like = {slot: sum(inst.AT[a, slot[0], slot[1]] > 0 for a in inst.A) / max(1, len(inst.A)) for slot in inst.slots}
+    model += (
+        weights["days"] * pulp.lpSum(BD.values())
+        + pulp.lpSum((0.1 * slot[1] - weights["preferences"] * doctor_like[slot]) * z for (item, slot), z in Z.items())
+        + pulp.lpSum((0.1 * slot[1] - weights["preferences"] * assistant_like[slot]) * x for (item, slot), x in X.items())
+    )
+    model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=max(1, time_limit)))
+
+    lecture_w, section_w = {}, {}
+    for (item, slot), v in Z.items():
+        if v.varValue:
+            lecture_w.setdefault(item, {})[slot] = v.varValue
+    for (item, slot), v in X.items():
+        if v.varValue:
+            section_w.setdefault(item, {})[slot] = v.varValue
+    return lecture_w, section_w
+
+
+class _Rounding:
+    """One randomized placement of all sessions."""
+    def __init__(self, inst, rng):
+        self.inst = inst
+        self.rng = rng
+        self.halls = {slot: 0 for slot in inst.slots}
+        self.labs = {slot: 0 for slot in inst.slots}
+        self.unit_busy = {}     # (unit, d, p) -> ("lecture", item) or ("section", item)
+        self.unit_days = {}     # unit -> set of days used
+        self.busy = set()       # (teacher, d, p)
+        self.load = {}
+        self.taught = {}
+        self.lectures = {}      # item -> (slot, doctor)
+        self.sections = {}      # item -> (slot, assistant)
+
+    def _pick_teacher(self, teachers, limits, time_prefs, subject_prefs, s, slot):
+        best, best_score = None, None
+        for t in teachers:
+            if (t, *slot) in self.busy or self.load.get(t, 0) >= limits[0]:
+                continue
+            if time_prefs[t, slot[0], slot[1]] == UNAVAILABLE:
+                continue
+            taught = self.taught.get(t, set())
+            if s not in taught and len(taught) >= limits[1]:
+                continue
+            score = (2 * (s in taught) + subject_prefs.get(t, {}).get(s, 0) + time_prefs[t, slot[0], slot[1]]
+                     - self.load.get(t, 0) / limits[0] + self.rng.random() * 0.5)
+            if best_score is None or score > best_score:
+                best, best_score = t, score
+        return best
+
+    def _take_teacher(self, t, s, slot, release=False):
+        step = -1 if release else 1
+        self.load[t] = self.load.get(t, 0) + step
+        if release:
+            self.busy.discard((t, *slot))
+            if not any(item[-1] == s and teacher == t for item, (_, teacher) in
+                       list(self.lectures.items()) + list(self.sections.items())):
+                self.taught.get(t, set()).discard(s)
+        else:
+            self.busy.add((t, *slot))
+            self.taught.setdefault(t, set()).add(s)
+
+    def _units(self, item, kind):
+        if kind == "lecture":
+            e, g, s = item
+            return [(e, g, c) for c in self.inst.classes[g]]
+        return [item[:3]]
+
+    def _fits(self, item, kind, slot):
+        inst = self.inst
+        if kind == "lecture" and self.halls[slot] >= inst.halls:
+            return None
+        if kind == "section" and self.labs[slot] >= inst.labs:
+            return None
+        if any((u, *slot) in self.unit_busy for u in self._units(item, kind)):
+            return None
+        if kind == "lecture":
+            return self._pick_teacher(inst.T, inst.TL, inst.TT, inst.TS, item[-1], slot)
+        return self._pick_teacher(inst.A, inst.AL, inst.AT, inst.AS, item[-1], slot)
+
+    def _put(self, item, kind, slot, teacher):
+        for u in self._units(item, kind):
+            self.unit_busy[(u, *slot)] = (kind, item)
+            self.unit_days.setdefault(u, set()).add(slot[0])
+        if kind == "lecture":
+            self.halls[slot] += 1
+            self.lectures[item] = (slot, teacher)
+        else:
+            self.labs[slot] += 1
+            self.sections[item] = (slot, teacher)
+        self._take_teacher(teacher, item[-1], slot)
+
+    def _remove_section(self, item):
+        slot, teacher = self.sections.pop(item)
+        self.labs[slot] -= 1
+        del self.unit_busy[(item[:3], *slot)]
+        self._take_teacher(teacher, item[-1], slot, release=True)
+        return slot, teacher
+
+    def place(self, item, kind, weights):
+        """Sample a feasible slot, favouring high LP values and days already in use."""
+        units = self._units(item, kind)
+        candidates, scores = [], []
+        for slot in self.inst.slots:
+            teacher = self._fits(item, kind, slot)
+            if teacher is None:
+                continue
+            score = weights.get(slot, 0) + 0.02
+            if any(slot[0] in self.unit_days.get(u, ()) for u in units):
+                score *= 1.5
+            candidates.append((slot, teacher))
+            scores.append(score ** 2)
+        if not candidates:
+            return False
+        slot, teacher = self.rng.choices(candidates, scores)[0]
+        self._put(item, kind, slot, teacher)
+        return True
+
+    def repair(self, item, kind):
+        """Place `item` by moving one section of its classes to another slot."""
+        for slot in self.inst.slots:
+            blockers = {self.unit_busy.get((u, *slot)) for u in self._units(item, kind)} - {None}
+            if len(blockers) != 1:
+                continue
+            blocker_kind, blocker = blockers.pop()
+            if blocker_kind != "section":
+                continue
+            old_slot, old_teacher = self._remove_section(blocker)
+            teacher = self._fits(item, kind, slot)
+            if teacher is not None:
+                self._put(item, kind, slot, teacher)
+                for new_slot in self.inst.slots:
+                    if new_slot == slot:
+                        continue
+                    new_teacher = self._fits(blocker, "section", new_slot)
+                    if new_teacher is not None:
+                        self._put(blocker, "section", new_slot, new_teacher)
+                        return True
+                # the section has nowhere else to go: undo
+                self._undo(item, kind, slot)
+            self._put(blocker, "section", old_slot, old_teacher)
+        return False
+
+    def _undo(self, item, kind, slot):
+        if kind == "lecture":
+            slot, teacher = self.lectures.pop(item)
+            self.halls[slot] -= 1
+            for u in self._units(item, kind):
+                del self.unit_busy[(u, *slot)]
+            self._take_teacher(teacher, item[-1], slot, release=True)
+        else:
+            self._remove_section(item)
+
+    def solution(self):
+        lectures = [
+            [e, g, c, s, d, p, t]
+            for (e, g, s), ((d, p), t) in self.lectures.items()
+            for c in self.inst.classes[g]
+        ]
+        sections = [[e, g, c, s, d, p, a] for (e, g, c, s), ((d, p), a) in self.sections.items()]
+        return {"lectures": lectures, "sections": sections}
+
+
+def draft_schedule(data, time_limit=5, seed=0, weights=None, tries=50):
+    """A feasible-looking timetable within about `time_limit` seconds.
+
+    Returns a compact solution (like extract_solution) with "status":
+    "Draft", its verification report and a "draft" entry with the number
+    of roundings tried and of sessions left unplaced.
+    """
+    if weights is None:
+        from scheduelModel import DEFAULT_WEIGHTS
+        weights = DEFAULT_WEIGHTS
+    start = time.perf_counter()
+    inst = Instance(data)
+    lecture_w, section_w = _lp_weights(inst, weights, time_limit * 0.5)
+    lp_time = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    best, best_key = None, None
+    attempts = 0
+    while attempts < tries and (attempts == 0 or time.perf_counter() - start < time_limit):
+        attempts += 1
+        rounding = _Rounding(inst, rng)
+        # the sessions the LP is most sure about go first
+        lectures = sorted(inst.lecture_items, key=lambda i: -max(lecture_w.get(i, {0: 0}).values()) - rng.random() * 0.2)
+        sections = sorted(inst.section_items, key=lambda i: -max(section_w.get(i, {0: 0}).values()) - rng.random() * 0.2)
+        unplaced = [(i, "lecture") for i in lectures if not rounding.place(i, "lecture", lecture_w.get(i, {}))]
+        unplaced += [(i, "section") for i in sections if not rounding.place(i, "section", section_w.get(i, {}))]
+        unplaced = [(i, kind) for i, kind in unplaced if not rounding.repair(i, kind)]
+
+        solution = rounding.solution()
+        report = verify_schedule(data, solution, weights)
+        key = (len(unplaced), not report["feasible"], report["objective"])
+        if best_key is None or key < best_key:
+            best, best_key = dict(solution, verification=report, unplaced=len(unplaced)), key
+        if not unplaced and attempts >= 3 and time.perf_counter() - start > 0.8 * time_limit:
+            break
+
+    report = best.pop("verification")
+    return dict(
+        best,
+        status="Draft",
+        objective=report["objective"],
+        components=report["components"],
+        gaps=report["components"]["gaps"],
+        days=report["components"]["days"],
+        verification=report,
+        draft={"tries": attempts, "unplaced": best.pop("unplaced"), "lp_time": lp_time,
+               "time": time.perf_counter() - start},
+    )
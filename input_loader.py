@@ -0,0 +1,246 @@
+"""Load, check and prepare an inputs file away from the Tk thread.
+
+`read_inputs` does everything SchedulingApp needs before it can show a
+file: JSON parsing, a schema check, mapping teachers to environments and
+building the preference tables. InputLoader runs it in a background
+thread with the same start/poll interface as SolverWorker, so the window
+stays responsive and the result is applied to the widgets in one go.
+"""
+import json
+import queue
+import threading
+
+from preference_table import UNAVAILABLE, PreferenceTable
+
+# Optional input keys used by room_assignment.py that have no widgets yet
+EXTRA_INPUT_KEYS = ("rooms", "sizes", "lecture_features", "section_features")
+
+_REQUIRED = {"environments": list, "groups": dict, "classes": dict, "subjects": dict, "A": list, "T": list}
+_OPTIONAL = {"AT": dict, "TT": dict, "AS": dict, "TS": dict, "AL": list, "TL": list}
+
+
+def validate_inputs(data):
+    """Check the structure of an inputs dictionary.
+
+    Returns (errors, warnings): errors make the file unusable, warnings
+    point at data the UI fills in or leaves out.
+    """
+    errors = []
+    warnings = []
+    if not isinstance(data, dict):
+        return ["The file does not contain a JSON object"], warnings
+    for key, kind in _REQUIRED.items():
+        if key not in data:
+            errors.append(f"Missing '{key}'")
+        elif not isinstance(data[key], kind):
+            errors.append(f"'{key}' must be a {kind.__name__}")
+    for key, kind in _OPTIONAL.items():
+        if key in data and not isinstance(data[key], kind):
+            errors.append(f"'{key}' must be a {kind.__name__}")
+    for key in ("halls", "labs", "days", "periods"):
+        if key in data and not (isinstance(data[key], int) and data[key] > 0):
+            errors.append(f"'{key}' must be a positive integer")
+    for key in ("AL", "TL"):
+        if isinstance(data.get(key), list) and not (
+                len(data[key]) == 2 and all(isinstance(v, int) and v > 0 for v in data[key])):
+            errors.append(f"'{key}' must be [max periods, max subjects]")
+    if errors:
+        return errors, warnings
+
+    environments = data["environments"]
+    for env in environments:
+        if not data["groups"].get(env):
+            warnings.append(f"Environment '{env}' has no groups")
+        if not data["subjects"].get(env):
+            warnings.append(f"Environment '{env}' has no subjects")
+        for group in data["groups"].get(env, []):
+            if not data["classes"].get(group):
+                warnings.append(f"Group '{group}' has no classes")
+    for key in ("groups", "subjects"):
+        unknown = set(data[key]) - set(environments)
+        if unknown:
+            warnings.append(f"'{key}' lists unknown environments: {', '.join(sorted(unknown))}")
+    for teachers, time_key, subject_key in (("A", "AT", "AS"), ("T", "TT", "TS")):
+        for teacher in data[teachers]:
+            if teacher not in data.get(time_key, {}):
+                warnings.append(f"'{teacher}' has no time preferences ({time_key}), none are set")
+            if teacher not in data.get(subject_key, {}):
+                warnings.append(f"'{teacher}' has no subject preferences ({subject_key})")
+    if all(key in data for key in ("days", "periods", "AL", "TL")):
+        warnings.extend(capacity_problems(data))
+    return errors, warnings
+
+
+def capacity_problems(data):
+    """Shortfalls of rooms and available teachers that make the inputs infeasible.
+
+    A slot holds at most as many lectures as there are halls and doctors
+    not UNAVAILABLE in it, and as many sections as labs and available
+    assistants. The week must fit every lecture and section within those
+    caps and within the teachers' period limits (AL/TL), counting only the
+    slots each teacher can take. Returns one message per shortfall; an
+    empty list does not prove the inputs feasible.
+    """
+    slots = [(str(d), str(p)) for d in range(1, data["days"] + 1) for p in range(1, data["periods"] + 1)]
+    if "rooms" in data:
+        halls, labs = len(data["rooms"].get("halls", [])), len(data["rooms"].get("labs", []))
+    else:
+        halls, labs = data.get("halls", 0), data.get("labs", 0)
+    lectures = sum(len(data["subjects"].get(e, [])) for e in data["environments"] for _ in data["groups"].get(e, []))
+    sections = sum(len(data["subjects"].get(e, [])) * len(data["classes"].get(g, []))
+                   for e in data["environments"] for g in data["groups"].get(e, []))
+
+    problems = []
+    for kind, sessions, rooms, teachers, time_key, limit in (
+            ("lectures", lectures, halls, data["T"], "TT", data["TL"][0]),
+            ("sections", sections, labs, data["A"], "AT", data["AL"][0])):
+        prefs = data.get(time_key, {})
+        open_slots = {t: {slot for slot in slots if prefs.get(t, {}).get(slot[0], {}).get(slot[1]) != UNAVAILABLE}
+                      for t in teachers}
+        per_slot = {slot: min(rooms, sum(slot in s for s in open_slots.values())) for slot in slots}
+        closed = [f"{d}/{p}" for (d, p), cap in per_slot.items() if cap == 0]
+        if sum(per_slot.values()) < sessions:
+            problems.append(f"{sessions} {kind} but the week has room for {sum(per_slot.values())} "
+                            f"(rooms and available teachers per slot)"
+                            + (f"; no {kind} possible in {', '.join(closed)}" if closed else ""))
+        load = sum(min(limit, len(s)) for s in open_slots.values())
+        if load < sessions:
+            problems.append(f"{sessions} {kind} but the teachers' loads and availability cover only {load}")
+    return problems
+
+
+def map_teachers(teachers, subject_prefs, env_subjects):
+    """{env: [teachers]} where a teacher joins every environment with a subject they prefer.
+
+    Teachers keep their input order within an environment.
+    """
+    subject_envs = {}
+    for env, subjects in env_subjects.items():
+        for subject in subjects:
+            subject_envs.setdefault(subject, []).append(env)
+    mapping = {env: [] for env in env_subjects}
+    for teacher in teachers:
+        envs = {env for subject, value in subject_prefs.get(teacher, {}).items() if value == 1
+                for env in subject_envs.get(subject, ())}
+        for env in env_subjects:
+            if env in envs:
+                mapping[env].append(teacher)
+    return mapping
+
+
+def read_inputs(path, progress=None):
+    """Read an inputs file into the structures SchedulingApp keeps.
+
+    Raises ValueError when the file fails the schema check.
+    """
+    def report(phase):
+        if progress is not None:
+            progress(phase)
+
+    report("reading")
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    report("validating")
+    errors, warnings = validate_inputs(data)
+    if errors:
+        raise ValueError("; ".join(errors[:10]))
+
+    report("mapping teachers")
+    environments = data["environments"]
+    env_subjects = {env: data["subjects"].get(env, []) for env in environments}
+    assistants = map_teachers(data["A"], data.get("AS", {}), env_subjects)
+    doctors = map_teachers(data["T"], data.get("TS", {}), env_subjects)
+    for role, teachers, mapping in (("Assistant", data["A"], assistants), ("Doctor", data["T"], doctors)):
+        mapped = {t for env_teachers in mapping.values() for t in env_teachers}
+        for teacher in teachers:
+            if teacher not in mapped:
+                warnings.append(f"{role} '{teacher}' prefers no subject of any environment and is not shown")
+
+    report("loading preferences")
+    days, periods = data.get("days", 5), data.get("periods", 5)
+    tables = {}
+    for name, teachers, key in (("assistant_time_prefs", data["A"], "AT"), ("doctor_time_prefs", data["T"], "TT")):
+        tables[name] = PreferenceTable()
+        tables[name].load_time({t: data.get(key, {}).get(t, {}) for t in teachers}, days, periods)
+    for name, key in (("assistant_subject_prefs", "AS"), ("doctor_subject_prefs", "TS")):
+        tables[name] = PreferenceTable()
+        for teacher, prefs in data.get(key, {}).items():
+            tables[name][teacher] = prefs
+
+    # classes as {env: {group: [classes]}}
+    classes = {
+        env: {group: data["classes"].get(group, []) for group in data["groups"].get(env, [])}
+        for env in environments
+    }
+    return dict(
+        tables,
+        halls=data.get("halls", 4),
+        labs=data.get("labs", 9),
+        days=days,
+        periods=periods,
+        AL=data.get("AL", [8, 3]),
+        TL=data.get("TL", [5, 3]),
+        environments=environments,
+        groups=data["groups"],
+        classes=classes,
+        subjects=data["subjects"],
+        assistants=assistants,
+        doctors=doctors,
+        extra_inputs={key: data[key] for key in EXTRA_INPUT_KEYS if key in data},
+        warnings=warnings,
+    )
+
+
+class InputLoader:
+    """Runs read_inputs() in a background thread.
+
+    Same interface as SolverWorker: `submit`, `running`, `poll` draining
+    ("progress", phase) / ("result", loaded) / ("error", message)
+    messages, and the `phase`, `result` and `error` attributes.
+    """
+    def __init__(self):
+        self.thread = None
+        self.messages = queue.Queue()
+        self.phase = None
+        self.result = None
+        self.error = None
+
+    def submit(self, path):
+        if self.running():
+            raise RuntimeError("An inputs file is already being loaded.")
+        self.phase = "starting"
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self._run, args=(path,), daemon=True)
+        self.thread.start()
+
+    def _run(self, path):
+        try:
+            loaded = read_inputs(path, progress=lambda phase: self.messages.put(("progress", phase)))
+            self.messages.put(("result", loaded))
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError is a ValueError
+            self.messages.put(("error", str(e)))
+        except Exception as e:
+            self.messages.put(("error", f"{type(e).__name__}: {e}"))
+
+    def running(self):
+        return self.thread is not None and (self.thread.is_alive() or not self.messages.empty())
+
+    def poll(self):
+        messages = []
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                return messages
+            messages.append((kind, payload))
+            if kind == "progress":
+                self.phase = payload
+            elif kind == "result":
+                self.result = payload
+                self.phase = "done"
+            else:
+                self.error = payload
+                self.phase = "failed"
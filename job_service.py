@@ -0,0 +1,403 @@
+"""Local scheduling job service.
+
+Planners submit inputs over HTTP; the jobs are queued and solved by a pool
+of worker processes (one SolverWorker per running job) on this machine.
+Only the standard library is used.
+
+    python job_service.py --port 8765 --workers 4
+
+Endpoints (JSON unless noted):
+    POST   /jobs               {"data": inputs, "options": {...}} -> {"id", "status"}
+    GET    /jobs               all jobs
+    GET    /jobs/<id>          status, phase and queue position
+    GET    /jobs/<id>/events   progress stream, one JSON object per line
+    GET    /jobs/<id>/result   the compact solution once the job is done
+    DELETE /jobs/<id>          cancel a queued or running job
+
+Checkpoints stay on the service's disk: "checkpoint": true writes them to
+the job's folder and "resume_from" names an earlier job to resume from.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from solver_worker import SolverWorker
+
+# scheduelModel() options a client may set; the output folder is chosen by the service
+ALLOWED_OPTIONS = ("time_limit", "compactness", "weights", "objective", "tiers", "run_label",
+                   "method", "window", "decompose", "improve_passes", "mip_start", "pool_teachers",
+                   "alternatives", "alternative_gap", "checkpoint", "checkpoint_every", "resume_from",
+                   "output_format")
+
+# checkpoint file of a job with "checkpoint": true, in its output folder
+CHECKPOINT_FILE = "checkpoint.json"
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class Job:
+    """One submitted solve and everything a client may ask about it."""
+    def __init__(self, data, options):
+        self.id = uuid.uuid4().hex[:12]
+        self.data = data
+        self.options = options
+        self.status = "queued"
+        self.phase = None
+        self.events = []
+        self.result = None
+        self.error = None
+        self.worker = None
+        self.cancel_requested = False
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def summary(self, position=None):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "phase": self.phase,
+            "position": position,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobService:
+    """Job table, FIFO queue and the pool of dispatcher threads.
+
+    Every dispatcher takes the next queued job and runs it in its own
+    SolverWorker process, so at most `workers` solves run at once.
+    """
+    def __init__(self, workers=2, output_root="jobs", store_path=None, history_path=None):
+        self.output_root = output_root
+        self.store_path = store_path
+        self.history_path = history_path
+        self.jobs = {}
+        self.queue = deque()
+        self.changed = threading.Condition()
+        self.threads = [threading.Thread(target=self._dispatch, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, data, options=None):
+        """Queue a job and return it."""
+        options = dict(options or {})
+        unknown = set(options) - set(ALLOWED_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unsupported options: {sorted(unknown)}")
+        if not isinstance(options.get("checkpoint", False), bool):
+            raise ValueError("The checkpoint option is true or false, the service chooses the file")
+        job = Job(data, options)
+        with self.changed:
+            resumed = options.get("resume_from")
+            if resumed is not None and (resumed not in self.jobs or not self.jobs[resumed].options.get("checkpoint")):
+                raise ValueError(f"resume_from must name an earlier job run with checkpoints: {resumed!r}")
+            self.jobs[job.id] = job
+            self.queue.append(job)
+            self._event(job, "queued")
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a job: queued jobs are dropped, running ones are killed."""
+        with self.changed:
+            job = self.jobs[job_id]
+            if job.status == "queued":
+                self.queue.remove(job)
+                self._finish(job, "cancelled", error="Solve cancelled")
+            elif job.status == "running":
+                # the dispatcher owns the worker and kills it on its next poll
+                job.cancel_requested = True
+        return job
+
+    def status(self, job_id):
+        with self.changed:
+            job = self.jobs[job_id]
+            position = self.queue.index(job) if job.status == "queued" else None
+            return job.summary(position)
+
+    def list(self):
+        with self.changed:
+            return [self.status(job_id) for job_id in self.jobs]
+
+    def events(self, job_id, timeout=None):
+        """Yield the job's progress events, blocking for new ones until it finishes."""
+        sent = 0
+        while True:
+            with self.changed:
+                job = self.jobs[job_id]
+                while sent == len(job.events) and job.status not in FINISHED:
+                    if not self.changed.wait(timeout):
+                        return
+                pending = job.events[sent:]
+                finished = job.status in FINISHED
+            for event in pending:
+                yield event
+            sent += len(pending)
+            if finished and sent == len(job.events):
+                return
+
+    def _event(self, job, phase):
+        # called with self.changed held
+        job.phase = phase
+        job.events.append({"time": time.time(), "status": job.status, "phase": phase})
+        self.changed.notify_all()
+
+    def _finish(self, job, status, result=None, error=None):
+        # called with self.changed held
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.worker = None
+        job.data = None   # the inputs are not needed anymore
+        self._event(job, status)
+
+    def _dispatch(self):
+        while True:
+            with self.changed:
+                while not self.queue:
+                    self.changed.wait()
+                job = self.queue.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+                job.worker = SolverWorker()
+                worker = job.worker
+                self._event(job, "starting")
+
+            options = dict(job.options, output_dir=os.path.join(self.output_root, job.id))
+            # checkpoints are files of the service, named by job
+            if options.pop("checkpoint", False):
+                options["checkpoint"] = os.path.join(options["output_dir"], CHECKPOINT_FILE)
+            if job.options.get("resume_from") is not None:
+                options["resume_from"] = os.path.join(self.output_root, job.options["resume_from"], CHECKPOINT_FILE)
+            if self.store_path is not None:
+                options["store_path"] = self.store_path
+            if self.history_path is not None:
+                options["history_path"] = self.history_path
+            try:
+                worker.submit(job.data, **options)
+                while worker.running():
+                    if job.cancel_requested:
+                        worker.terminate()
+                        break
+                    for kind, payload in worker.poll(0.2):
+                        if kind == "progress":
+                            with self.changed:
+                                self._event(job, payload)
+                worker.poll()
+            except Exception as e:
+                worker.error = worker.error or f"{type(e).__name__}: {e}"
+
+            with self.changed:
+                if worker.phase == "cancelled":
+                    self._finish(job, "cancelled", error=worker.error)
+                elif worker.error:
+                    self._finish(job, "failed", error=worker.error)
+                else:
+                    self._finish(job, "done", result=worker.result)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None   # set by make_server
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if not parts or parts[0] != "jobs":
+            return None, None
+        job_id = parts[1] if len(parts) > 1 else None
+        action = parts[2] if len(parts) > 2 else None
+        return job_id, action
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict) or not isinstance(request.get("options") or {}, dict):
+                raise ValueError("the body and its options must be JSON objects")
+            job = self.service.submit(request["data"], request.get("options"))
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"error": f"Invalid job request: {e}"})
+        self._send_json(202, {"id": job.id, "status": job.status})
+
+    def do_GET(self):
+        job_id, action = self._route()
+        if self.path.split("?")[0].rstrip("/") == "/jobs":
+            return self._send_json(200, self.service.list())
+        if job_id not in self.service.jobs:
+            return self._send_json(404, {"error": "Unknown job"})
+
+        if action is None:
+            return self._send_json(200, self.service.status(job_id))
+        if action == "result":
+            job = self.service.jobs[job_id]
+            if job.status == "done":
+                return self._send_json(200, job.result)
+            if job.status in FINISHED:
+                return self._send_json(410, {"error": job.error, "status": job.status})
+            return self._send_json(409, {"error": "Job not finished", "status": job.status})
+        if action == "events":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for event in self.service.events(job_id):
+                    self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+            return
+        self._send_json(404, {"error": "Not found"})
+
+    def do_DELETE(self):
+        job_id, action = self._route()
+        if job_id not in self.service.jobs or action is not None:
+            return self._send_json(404, {"error": "Unknown job"})
+        self.service.cancel(job_id)
+        self._send_json(200, self.service.status(job_id))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, workers=2, output_root="jobs", store_path=None, history_path=None):
+    """Create the HTTP server with its JobService; call serve_forever() on it."""
+    handler = type("Handler", (_Handler,), {"service": JobService(workers, output_root, store_path, history_path)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+class RemoteWorker:
+    """Client for the job service with the same interface as SolverWorker.
+
+    SchedulingApp can use it in place of a local SolverWorker: `submit`
+    posts the job and a reader thread follows its events stream, `poll`
+    hands out the phases read so far and fetches the result once the job
+    is done.
+    """
+    def __init__(self, url, timeout=10):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.job_id = None
+        self.phase = None
+        self.result = None
+        self.error = None
+        self._finished = True
+        self._events = None
+
+    def _request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(self.url + path, data=body, method=method,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def submit(self, data, **options):
+        reply = self._request("POST", "/jobs", {"data": data, "options": options})
+        self.job_id = reply["id"]
+        self.phase = reply["status"]
+        self.result = None
+        self.error = None
+        self._finished = False
+        # a queue per job, so a stream still open from an earlier job can not mix in
+        self._events = queue.SimpleQueue()
+        threading.Thread(target=self._follow, args=(self.job_id, self._events), daemon=True).start()
+
+    def _follow(self, job_id, events):
+        """Reader thread: put the job's events on `events`, then None when the stream ends."""
+        try:
+            # no timeout: a long solve can go quiet for hours between phases
+            with urllib.request.urlopen(f"{self.url}/jobs/{job_id}/events") as stream:
+                for line in stream:
+                    events.put(json.loads(line))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            events.put({"error": f"Lost connection to the job service: {e}"})
+        events.put(None)
+
+    def running(self):
+        return not self._finished
+
+    def poll(self, timeout=0):
+        """Messages like SolverWorker.poll: the phases read from the stream, then the outcome."""
+        messages = []
+        if self._finished:
+            return messages
+        try:
+            while True:
+                event = self._events.get(timeout=timeout) if timeout else self._events.get_nowait()
+                timeout = 0
+                if event is None or "error" in event or event["status"] in FINISHED:
+                    messages.append(self._outcome(event))
+                    break
+                self.phase = event["phase"]
+                messages.append(("progress", self.phase))
+        except queue.Empty:
+            pass
+        return messages
+
+    def _outcome(self, event):
+        self._finished = True
+        if event is not None and "error" in event:
+            self.error = event["error"]
+            return ("error", self.error)
+        try:
+            status = self._request("GET", f"/jobs/{self.job_id}")
+            self.phase = status["phase"]
+            if status["status"] == "done":
+                self.result = self._request("GET", f"/jobs/{self.job_id}/result")
+                return ("result", self.result)
+            # a stream that ended early leaves the job running on the service
+            self.error = status["error"] or f"The job is {status['status']}"
+        except (urllib.error.URLError, OSError) as e:
+            self.error = f"Lost connection to the job service: {e}"
+        return ("error", self.error)
+
+    def terminate(self):
+        if self.job_id is not None and not self._finished:
+            try:
+                self._request("DELETE", f"/jobs/{self.job_id}")
+            except (urllib.error.URLError, OSError):
+                pass
+            self.error = "Solve cancelled"
+            self.phase = "cancelled"
+            self._finished = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the local scheduling job service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="number of solves running at the same time")
+    parser.add_argument("--output-root", default="jobs", help="folder for the rendered schedules of each job")
+    parser.add_argument("--store", help="SQLite database every finished schedule is saved to")
+    parser.add_argument("--history", help="run history every job is appended to (see run_history.py)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.output_root, args.store, args.history)
+    print(f"Scheduling job service on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
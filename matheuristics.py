@@ -0,0 +1,140 @@
+"""Decomposition heuristics for large timetables.
+
+The full MIP of a large faculty can stall CBC for the whole time limit.
+These strategies only keep a window of days (or environments) integral at
+a time, so every solve is a fraction of the full model:
+
+relax-and-fix     windows are solved in order with the later ones relaxed
+                  to the LP; each solved window is fixed before moving on.
+fix-and-optimize  starting from a complete schedule, every window is
+                  re-opened in turn with the rest fixed and re-solved,
+                  warm-started from the current schedule.
+
+Both work in place on a TimetableModel from `build_model` and leave the
+final schedule in the variable values, like a normal solve.
+"""
+import time
+
+import pulp
+
+# a stopped solve still reports an incumbent through sol_status
+_FOUND = (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+
+
+def make_windows(blocks, size):
+    """Group the sorted block ids into consecutive windows of `size` blocks."""
+    ids = sorted(blocks)
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+def _window_vars(blocks, window):
+    return [var for block in window for var in blocks[block]]
+
+
+def _fix(variables):
+    for var in variables:
+        if var.varValue is not None:
+            var.fixValue()
+
+
+def _has_solution(tm):
+    return tm.model.sol_status in _FOUND
+
+
+def relax_and_fix(tm, solver, time_limit, window=2, by="days", gap=0.02, reserve=0.5):
+    """Build a schedule window by window; returns a list of per-window results.
+
+    The windows share all but `reserve` of `time_limit`, each getting an
+    equal part of what is left, and stop once within `gap` of their bound,
+    since fix-and-optimize polishes the result anyway. If a window finds
+    nothing, because of the earlier fixings or the time, or the windows run
+    out of time, everything is released and the rest of `time_limit` goes
+    to the full MIP. Whether that found a schedule shows in the model's
+    sol_status, as after a normal solve.
+    """
+    blocks = tm.blocks(by)
+    windows = make_windows(blocks, window)
+    original = {var.name: (var.cat, var.lowBound, var.upBound)
+                for block in blocks.values() for var in block}
+    variables = [var for block in blocks.values() for var in block]
+    for var in variables:
+        var.cat = pulp.LpContinuous
+
+    results = []
+    completed = False
+    deadline = time.perf_counter() + time_limit
+    # the fallback must have time to find a schedule of its own
+    windows_end = deadline - reserve * time_limit
+    for n, win in enumerate(windows):
+        if windows_end - time.perf_counter() < 1:
+            break
+        current = _window_vars(blocks, win)
+        for var in current:
+            var.cat = original[var.name][0]
+        budget = max(1, (windows_end - time.perf_counter()) / (len(windows) - n))
+        tm.model.solve(solver(budget, gapRel=gap))
+        status = pulp.LpStatus[tm.model.status]
+        results.append({"window": list(win), "status": status, "objective": pulp.value(tm.model.objective)})
+        if not _has_solution(tm):
+            break
+        # integral values only, in case CBC stopped on a slightly fractional point
+        for var in current:
+            if var.varValue is not None:
+                var.varValue = round(var.varValue)
+        _fix(current)
+    else:
+        completed = True
+
+    # release the fixings and restore the variable types
+    for var in variables:
+        var.cat, var.lowBound, var.upBound = original[var.name]
+
+    if not completed:
+        # the fixings painted the search into a corner: fall back to the full MIP
+        tm.model.solve(solver(max(1, deadline - time.perf_counter())))
+        results.append({"window": "all", "status": pulp.LpStatus[tm.model.status],
+                        "objective": pulp.value(tm.model.objective)})
+    return results
+
+
+def fix_and_optimize(tm, solver, time_limit, window=2, by="days", passes=1):
+    """Improve a complete schedule by re-solving one window at a time.
+
+    All other windows stay fixed at their current values and every solve is
+    warm-started from the current schedule, so the objective never gets
+    worse; a window whose solve fails keeps its previous values.
+    """
+    blocks = tm.blocks(by)
+    windows = make_windows(blocks, window)
+    if len(windows) < 2 or not _has_solution(tm):
+        return []
+    variables = [var for block in blocks.values() for var in block]
+    bounds = {var.name: (var.lowBound, var.upBound) for var in variables}
+
+    results = []
+    deadline = time.perf_counter() + time_limit
+    steps = passes * len(windows)
+    for step in range(steps):
+        win = windows[step % len(windows)]
+        if time.perf_counter() >= deadline:
+            break
+        before = {var.name: var.varValue for var in tm.model.variables()}
+        before_objective = pulp.value(tm.model.objective)
+
+        _fix(variables)
+        for var in _window_vars(blocks, win):
+            var.lowBound, var.upBound = bounds[var.name]
+        budget = max(1, (deadline - time.perf_counter()) / (steps - step))
+        tm.model.solve(solver(budget, warmStart=True))
+        objective = pulp.value(tm.model.objective)
+
+        improved = _has_solution(tm) and objective is not None and objective <= before_objective + 1e-6
+        if not improved:
+            for var in tm.model.variables():
+                var.varValue = before[var.name]
+            objective = before_objective
+        results.append({"window": list(win), "status": pulp.LpStatus[tm.model.status], "objective": objective})
+
+    for var in variables:
+        var.lowBound, var.upBound = bounds[var.name]
+    return results
@@ -0,0 +1,206 @@
+"""Array-backed storage of teacher preferences, with CSV import and export.
+
+Time preferences are keyed by (day, period) and subject preferences by the
+subject name. Both live in a PreferenceTable: one flat array('b') with a row
+per teacher, so a faculty of hundreds of teachers is a few kilobytes and the
+grid editor and save_inputs read and write cells without building dicts.
+A time slot is PREFERRED, NEUTRAL or UNAVAILABLE; the solver never puts a
+teacher in an unavailable slot. Subject preferences are 1 or 0.
+
+CSV layout (one file per kind, both roles in it):
+
+    role,teacher,D1P1,D1P2,...          role,teacher,Math,Physics,...
+    assistant,Ali,1,-1,...              doctor,Sara,1,0,...
+"""
+import csv
+import re
+from array import array
+
+ROLES = ("assistant", "doctor")
+
+# time preference values
+PREFERRED, NEUTRAL, UNAVAILABLE = 1, 0, -1
+
+_TIME_LABEL = re.compile(r"^D(\d+)P(\d+)$")
+
+
+def time_columns(days, periods):
+    return [(d, p) for d in range(1, days + 1) for p in range(1, periods + 1)]
+
+
+def column_label(column):
+    """CSV header of a column: D<day>P<period> for time slots, the name for subjects."""
+    if isinstance(column, tuple):
+        return f"D{column[0]}P{column[1]}"
+    return column
+
+
+def parse_label(label, kind):
+    if kind == "time":
+        match = _TIME_LABEL.match(label.strip())
+        if not match:
+            raise ValueError(f"Bad time column {label!r}, expected D<day>P<period>")
+        return int(match.group(1)), int(match.group(2))
+    return label.strip()
+
+
+class PreferenceTable:
+    """Preference values of many teachers, one array row per teacher.
+
+    Behaves like the {teacher: {column: value}} dictionaries the UI used
+    before (`in`, `get`, `[]`, `del`, iteration), so the dialogs keep
+    working; reading a teacher returns a fresh dict. Unknown columns are
+    added on assignment.
+    """
+    def __init__(self, columns=()):
+        self.columns = []
+        self.column_id = {}
+        self.teachers = []
+        self.row_id = {}
+        self.values = array('b')
+        self.add_columns(columns)
+
+    # --------------------------------------- structure
+
+    def add_columns(self, columns):
+        new = [c for c in dict.fromkeys(columns) if c not in self.column_id]
+        if not new:
+            return
+        old_width = len(self.columns)
+        for c in new:
+            self.column_id[c] = len(self.columns)
+            self.columns.append(c)
+        if self.teachers:
+            values = array('b')
+            padding = array('b', [0]) * len(new)
+            for r in range(len(self.teachers)):
+                values.extend(self.values[r * old_width:(r + 1) * old_width])
+                values.extend(padding)
+            self.values = values
+
+    def ensure(self, teacher, default=0):
+        """Row index of `teacher`, adding a row filled with `default` if needed."""
+        row = self.row_id.get(teacher)
+        if row is None:
+            row = self.row_id[teacher] = len(self.teachers)
+            self.teachers.append(teacher)
+            self.values.extend(array('b', [default]) * len(self.columns))
+        return row
+
+    def value(self, teacher, column, default=0):
+        row = self.row_id.get(teacher)
+        col = self.column_id.get(column)
+        if row is None or col is None:
+            return default
+        return self.values[row * len(self.columns) + col]
+
+    def set_value(self, teacher, column, value, default=0):
+        """Set one cell; a new teacher gets a row filled with `default` first."""
+        self.add_columns([column])
+        row = self.ensure(teacher, default)
+        self.values[row * len(self.columns) + self.column_id[column]] = value
+
+    def row(self, teacher):
+        """The teacher's values in column order (a read-only view), or None."""
+        row = self.row_id.get(teacher)
+        if row is None:
+            return None
+        width = len(self.columns)
+        return memoryview(self.values)[row * width:(row + 1) * width].toreadonly()
+
+    # --------------------------------------- dict interface
+
+    def __contains__(self, teacher):
+        return teacher in self.row_id
+
+    def __iter__(self):
+        return iter(list(self.teachers))
+
+    def __len__(self):
+        return len(self.teachers)
+
+    def __getitem__(self, teacher):
+        if teacher not in self.row_id:
+            raise KeyError(teacher)
+        return dict(zip(self.columns, self.row(teacher)))
+
+    def get(self, teacher, default=None):
+        return self[teacher] if teacher in self.row_id else default
+
+    def __setitem__(self, teacher, prefs):
+        self.add_columns(prefs)
+        row = self.ensure(teacher)
+        width = len(self.columns)
+        base = row * width
+        self.values[base:base + width] = array('b', [prefs.get(c, 0) for c in self.columns])
+
+    def __delitem__(self, teacher):
+        row = self.row_id.pop(teacher)
+        width = len(self.columns)
+        del self.values[row * width:(row + 1) * width]
+        del self.teachers[row]
+        for r in range(row, len(self.teachers)):
+            self.row_id[self.teachers[r]] = r
+
+    # --------------------------------------- inputs file format
+
+    def load_time(self, prefs, days, periods):
+        """Fill from AT/TT ({teacher: {"d": {"p": v}}}) for the given week."""
+        self.add_columns(time_columns(days, periods))
+        for teacher, by_day in prefs.items():
+            self[teacher] = {
+                (d, p): by_day.get(str(d), {}).get(str(p), 0)
+                for d in range(1, days + 1) for p in range(1, periods + 1)
+            }
+
+    def time_dict(self, teacher, DAYS, PERIODS):
+        """AT/TT entry of a teacher: {d: {p: value}}."""
+        return {d: {p: self.value(teacher, (d, p)) for p in PERIODS} for d in DAYS}
+
+
+# ---------------------------------------
+# CSV
+
+def export_csv(path, tables, columns, teachers=None, default=0):
+    """Write the tables ({role: PreferenceTable}) of one kind to a CSV file.
+
+    `teachers` ({role: [names]}) defaults to the teachers in each table;
+    cells a table does not hold are written as `default`.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["role", "teacher"] + [column_label(c) for c in columns])
+        for role in ROLES:
+            table = tables[role]
+            for teacher in (table.teachers if teachers is None else teachers[role]):
+                writer.writerow([role, teacher] + [table.value(teacher, c, default) for c in columns])
+
+
+def import_csv(path, kind):
+    """Read a preference CSV into {role: {teacher: {column: value}}}.
+
+    Raises ValueError naming the line of the first malformed row.
+    """
+    result = {role: {} for role in ROLES}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or [h.strip().lower() for h in header[:2]] != ["role", "teacher"]:
+            raise ValueError("The first columns must be 'role' and 'teacher'")
+        columns = [parse_label(label, kind) for label in header[2:]]
+        for line, row in enumerate(reader, start=2):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            # names are kept as written, some inputs have trailing spaces
+            role, teacher = row[0].strip().lower(), row[1]
+            if role not in ROLES:
+                raise ValueError(f"Line {line}: role must be 'assistant' or 'doctor', not {row[0]!r}")
+            try:
+                values = [int(cell) if cell.strip() else 0 for cell in row[2:2 + len(columns)]]
+            except ValueError:
+                raise ValueError(f"Line {line}: preference values must be integers")
+            allowed = (PREFERRED, NEUTRAL, UNAVAILABLE) if kind == "time" else (0, 1)
+            if any(v not in allowed for v in values):
+                raise ValueError(f"Line {line}: {kind} preferences must be one of {', '.join(map(str, allowed))}")
+            result[role][teacher] = dict(zip(columns, values))
+    return result
@@ -0,0 +1,336 @@
+"""Minimal-perturbation repair of a published timetable.
+
+Re-solving from scratch after a mid-term change gives every student a new
+week. A repair keeps the published schedule and re-opens only a
+neighborhood of the sessions the change breaks:
+
+sessions   only the affected sessions may move
+classes    every session of the classes with an affected session (default)
+all        the whole timetable
+
+Everything outside the neighborhood is fixed to its published slot and
+teacher, and each session that ends up in another slot or with another
+teacher costs `move_penalty` on top of the usual objective. When the
+neighborhood has no feasible repair it is widened to the next one.
+
+A change set is a JSON object with any of:
+
+    "unavailable":    {teacher: [[day, period], ...]}   a doctor or assistant
+    "rooms_lost":     {"halls": 1, "labs": ["L3"]}       a count, or room names with "rooms" inputs
+    "classes_added":  {group: [class, ...]}
+
+    python repair.py --store schedules.db --run 4 --changes week5.json --output schedule/week5
+"""
+import argparse
+import copy
+import json
+import os
+import time
+
+import pulp
+
+from preference_table import UNAVAILABLE
+from scheduelModel import (OBJECTIVES, _solver, build_model, extract_solution, input_hash, load_inputs,
+                           render_schedules)
+from schedule_kpis import compute_kpis, write_kpis
+from schedule_verifier import verify_schedule
+
+NEIGHBORHOODS = ("sessions", "classes", "all")
+
+# cost of one moved session; above a study day plus a gap, so moves only
+# happen when they are needed or clearly pay off
+MOVE_PENALTY = 100
+
+# relative gap a repair stops at; the neighborhoods are small, the proof of optimality is not
+GAP = 0.01
+
+# a stopped solve still reports an incumbent through sol_status
+_FOUND = (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+
+
+def apply_changes(data, changes):
+    """A copy of the inputs with `changes` applied.
+
+    Unavailable slots are marked UNAVAILABLE in AT/TT, so the model of the
+    changed inputs has no variable for them.
+    """
+    data = copy.deepcopy(data)
+    for kind, lost in changes.get("rooms_lost", {}).items():
+        if kind not in ("halls", "labs"):
+            raise ValueError(f"Unknown room kind: {kind!r}")
+        if isinstance(lost, int):
+            if "rooms" in data:
+                data["rooms"][kind] = data["rooms"][kind][:max(0, len(data["rooms"][kind]) - lost)]
+            else:
+                data[kind] = max(0, data[kind] - lost)
+        else:
+            if "rooms" not in data:
+                raise ValueError(f"Rooms lost by name need inputs with named rooms, got {lost!r}")
+            data["rooms"][kind] = [room for room in data["rooms"][kind] if room["name"] not in lost]
+    for group, classes in changes.get("classes_added", {}).items():
+        if group not in data["classes"]:
+            raise ValueError(f"Unknown group: {group!r}")
+        data["classes"][group] = data["classes"][group] + [c for c in classes if c not in data["classes"][group]]
+    for teacher, slots in changes.get("unavailable", {}).items():
+        if teacher in data["T"]:
+            prefs = data["TT"][teacher]
+        elif teacher in data["A"]:
+            prefs = data["AT"][teacher]
+        else:
+            raise ValueError(f"Unknown teacher: {teacher!r}")
+        for d, p in slots:
+            prefs[str(d)][str(p)] = UNAVAILABLE
+    return data
+
+
+def _capacity(data, kind):
+    return len(data["rooms"].get(kind, [])) if "rooms" in data else data[kind]
+
+
+def _published(data, published):
+    """Published sessions by key: {(env, group, subject): (d, p, doctor)} and
+    {(env, group, class, subject): (d, p, assistant)}, limited to the inputs."""
+    lectures = {}
+    for e, g, c, s, d, p, t in published["lectures"]:
+        if g in data["groups"].get(e, []) and s in data["subjects"][e] and t in data["T"]:
+            lectures[e, g, s] = (d, p, t)
+    sections = {}
+    for e, g, c, s, d, p, a in published["sections"]:
+        if (g in data["groups"].get(e, []) and c in data["classes"][g] and s in data["subjects"][e]
+                and a in data["A"]):
+            sections[e, g, c, s] = (d, p, a)
+    return lectures, sections
+
+
+def _unavailable(data):
+    """{(teacher, d, p)} of every slot a doctor or assistant is unavailable in."""
+    return {(t, int(d), int(p)) for key in ("TT", "AT") for t, days in data[key].items()
+            for d, periods in days.items() for p, value in periods.items() if value == UNAVAILABLE}
+
+
+def affected_sessions(data, published):
+    """Sessions the changed inputs break, as sets of lecture and section keys.
+
+    A session is affected when its teacher is unavailable at its slot,
+    when its slot now holds more sessions than rooms, or when it has no
+    published slot (a new class).
+    """
+    lectures, sections = _published(data, published)
+    unavailable = _unavailable(data)
+
+    lecture_keys = {(e, g, s) for e in data["environments"] for g in data["groups"][e] for s in data["subjects"][e]}
+    section_keys = {(e, g, c, s) for e, g, s in lecture_keys for c in data["classes"][g]}
+    affected_lectures = lecture_keys - set(lectures)
+    affected_sections = section_keys - set(sections)
+    affected_lectures |= {key for key, (d, p, t) in lectures.items() if (t, d, p) in unavailable}
+    affected_sections |= {key for key, (d, p, a) in sections.items() if (a, d, p) in unavailable}
+
+    for kind, sessions, affected in (("halls", lectures, affected_lectures), ("labs", sections, affected_sections)):
+        by_slot = {}
+        for key, (d, p, t) in sessions.items():
+            by_slot.setdefault((d, p), []).append(key)
+        for keys in by_slot.values():
+            if len(keys) > _capacity(data, kind):
+                affected.update(keys)
+    return affected_lectures, affected_sections
+
+
+def _neighborhood(data, affected, neighborhood):
+    """The lecture and section keys that may move in `neighborhood`."""
+    affected_lectures, affected_sections = affected
+    if neighborhood == "sessions":
+        return set(affected_lectures), set(affected_sections)
+    lectures = {(e, g, s) for e in data["environments"] for g in data["groups"][e] for s in data["subjects"][e]}
+    sections = {(e, g, c, s) for e, g, s in lectures for c in data["classes"][g]}
+    if neighborhood == "all":
+        return lectures, sections
+    classes = {(e, g, c) for e, g, c, s in affected_sections}
+    classes |= {(e, g, c) for e, g, s in affected_lectures for c in data["classes"][g]}
+    return ({(e, g, s) for e, g, c in classes for s in data["subjects"][e]},
+            {(e, g, c, s) for e, g, c, s in sections if (e, g, c) in classes})
+
+
+def _fix(tm, data, published, free):
+    """Bound the session variables of `tm` for one neighborhood.
+
+    Sessions outside `free` are fixed to their published slot and
+    teacher; free ones get their 0..1 bounds back.
+    """
+    index = tm.index
+    lectures, sections = _published(data, published)
+    free_lectures, free_sections = free
+
+    def lecture(e, g, c, s):
+        return index.environments[e], index.groups[g], index.subjects[s]
+
+    def section(e, g, c, s):
+        return index.environments[e], index.groups[g], index.classes[c], index.subjects[s]
+
+    for sessions, teaching, name_of, slots, free_keys, teachers in (
+            (tm.Y, tm.I, lecture, lectures, free_lectures, index.doctors),
+            (tm.X, tm.J, section, sections, free_sections, index.assistants)):
+        for (e, g, c, s, d, p), var in sessions.items():
+            key = name_of(e, g, c, s)
+            if key in free_keys:
+                var.lowBound, var.upBound = 0, 1
+            else:
+                var.lowBound = var.upBound = int(slots.get(key, (None, None, None))[:2] == (d, p))
+        for (t, e, g, c, s, d, p), var in teaching.items():
+            key = name_of(e, g, c, s)
+            if key in free_keys:
+                var.lowBound, var.upBound = 0, 1
+            else:
+                var.lowBound = var.upBound = int(slots.get(key) == (d, p, teachers[t]))
+
+
+def _moves(tm, data, published):
+    """Expression counting the published sessions that change slot or teacher.
+
+    A lecture counts once per class of its group, like its preference.
+    """
+    index = tm.index
+    env_id = {e: i for i, e in enumerate(index.environments)}
+    doctor_id = {t: i for i, t in enumerate(index.doctors)}
+    assistant_id = {a: i for i, a in enumerate(index.assistants)}
+    lectures, sections = _published(data, published)
+    stays = []
+    # a session whose teacher is now unavailable has no variable and moves for sure
+    for (e, g, s), (d, p, t) in lectures.items():
+        first = index.class_id[data["classes"][g][0]]
+        stays.append(len(data["classes"][g])
+                     * tm.I.get((doctor_id[t], env_id[e], index.group_id[g], first, index.subject_id[s], d, p), 0))
+    for (e, g, c, s), (d, p, a) in sections.items():
+        stays.append(tm.J.get((assistant_id[a], env_id[e], index.group_id[g], index.class_id[c],
+                               index.subject_id[s], d, p), 0))
+    total = sum(len(data["classes"][g]) for e, g, s in lectures) + len(sections)
+    return total - pulp.lpSum(stays)
+
+
+def diff_schedules(old, new):
+    """What changed between two compact solutions.
+
+    Returns {"moved": [...], "added": [...], "removed": [...]}; lectures
+    are listed once per group (class None). Moved entries carry "from"
+    and "to" as [day, period, teacher].
+    """
+    def sessions(solution):
+        found = {}
+        for e, g, c, s, d, p, t in solution["lectures"]:
+            found[("lecture", e, g, None, s)] = [d, p, t]
+        for e, g, c, s, d, p, a in solution["sections"]:
+            found[("section", e, g, c, s)] = [d, p, a]
+        return found
+
+    def entry(key, **slots):
+        kind, e, g, c, s = key
+        return dict(kind=kind, env=e, group=g, cls=c, subject=s, **slots)
+
+    before, after = sessions(old), sessions(new)
+    return {
+        "moved": [entry(k, **{"from": before[k], "to": after[k]})
+                  for k in before if k in after and before[k] != after[k]],
+        "added": [entry(k, to=after[k]) for k in after if k not in before],
+        "removed": [entry(k, **{"from": before[k]}) for k in before if k not in after],
+    }
+
+
+def repair_schedule(data, published, changes, time_limit=30, neighborhood="classes",
+                    move_penalty=MOVE_PENALTY, compactness="bigm", weights=None):
+    """Repair `published` for `changes`; returns a verified compact solution.
+
+    `data` are the inputs the schedule was solved for, `published` its
+    compact solution. The solution carries "repair": the neighborhood that
+    was solved, the number of affected and moved sessions, the diff (see
+    diff_schedules) and the changed inputs under "data".
+    """
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(f"Unknown neighborhood: {neighborhood!r}")
+    start = time.perf_counter()
+    data = apply_changes(data, changes)
+    affected = affected_sessions(data, published)
+
+    tm = build_model(data, compactness=compactness, weights=weights)
+    weighted = pulp.lpSum(tm.weights[k] * tm.objectives[k] for k in OBJECTIVES)
+    moves = _moves(tm, data, published)
+    tm.model.setObjective(weighted + move_penalty * moves)
+    lectures, sections = _published(data, published)
+    tm.set_start({"lectures": [[e, g, c, s, d, p, t] for (e, g, s), (d, p, t) in lectures.items()
+                               for c in data["classes"][g]],
+                  "sections": [[e, g, c, s, d, p, a] for (e, g, c, s), (d, p, a) in sections.items()]})
+
+    attempts = []
+    deadline = start + time_limit
+    for scope in NEIGHBORHOODS[NEIGHBORHOODS.index(neighborhood):]:
+        free = _neighborhood(data, affected, scope)
+        _fix(tm, data, published, free)
+        tm.model.solve(_solver(max(1, deadline - time.perf_counter()), warmStart=True, gapRel=GAP))
+        attempts.append({"neighborhood": scope, "free": len(free[0]) + len(free[1]),
+                         "status": pulp.LpStatus[tm.model.status]})
+        if tm.model.sol_status in _FOUND:
+            break
+    print("Repair:", ", ".join(f"{a['neighborhood']} ({a['free']} free) {a['status']}" for a in attempts))
+
+    solution = extract_solution(tm.index, tm.Y, tm.X, tm.I, tm.J)
+    solution["status"] = pulp.LpStatus[tm.model.status]
+    solution["objective"] = pulp.value(weighted)
+    solution["components"] = {k: pulp.value(tm.objectives[k]) for k in OBJECTIVES}
+    solution["gaps"] = solution["components"]["gaps"]
+    solution["days"] = solution["components"]["days"]
+    solution["verification"] = verify_schedule(data, solution, tm.weights)
+    diff = diff_schedules(published, solution)
+    solution["repair"] = {
+        "neighborhood": attempts[-1]["neighborhood"],
+        "attempts": attempts,
+        "affected": len(affected[0]) + len(affected[1]),
+        "moved": pulp.value(moves),
+        "diff": diff,
+        "seconds": time.perf_counter() - start,
+        "data": data,
+    }
+    return solution
+
+
+def _describe(entry):
+    who = entry["group"] if entry["cls"] is None else f"{entry['group']} {entry['cls']}"
+    slots = [f"day {d} period {p} ({t})" for d, p, t in filter(None, (entry.get("from"), entry.get("to")))]
+    return f"{entry['kind']:<8} {entry['env']} {who} {entry['subject']}: {' -> '.join(slots)}"
+
+
+if __name__ == "__main__":
+    from schedule_store import ScheduleStore
+
+    parser = argparse.ArgumentParser(description="Repair a published schedule after a change.")
+    parser.add_argument("--inputs", default="scheduling_inputs01.json", help="inputs the schedule was solved for")
+    parser.add_argument("--store", required=True, help="SQLite database holding the published schedule")
+    parser.add_argument("--run", type=int, help="run id of the published schedule (default: the latest run)")
+    parser.add_argument("--changes", required=True, help="change set JSON file")
+    parser.add_argument("--time-limit", type=int, default=30, help="solver time limit in seconds")
+    parser.add_argument("--neighborhood", choices=NEIGHBORHOODS, default="classes",
+                        help="sessions re-opened first; widened when it has no repair")
+    parser.add_argument("--move-penalty", type=float, default=MOVE_PENALTY, help="objective cost of a moved session")
+    parser.add_argument("--output", default="schedule/repair", help="folder for the rendered schedules")
+    parser.add_argument("--output-format", choices=["png", "pdf", "zip"], default="png",
+                        help="one PNG per timetable, or all of them in OUTPUT/schedules.pdf or .zip")
+    args = parser.parse_args()
+
+    with open(args.changes) as f:
+        changes = json.load(f)
+    store = ScheduleStore(args.store)
+    run_id = args.run if args.run is not None else store.latest_run()
+    published = store.solution(run_id)
+    solution = repair_schedule(load_inputs(args.inputs), published, changes, args.time_limit,
+                               args.neighborhood, args.move_penalty)
+    data = solution["repair"]["data"]
+    if not solution["verification"]["feasible"]:
+        print("Warning: the schedule breaks", ", ".join(solution["verification"]["violations"]))
+    new_id = store.save_run(data, solution, label=f"repair of run {run_id}", input_hash=input_hash(data))
+    store.close()
+
+    render_schedules(data, solution, args.output, args.output_format)
+    write_kpis(compute_kpis(data, solution), os.path.join(args.output, "kpis"))
+    diff = solution["repair"]["diff"]
+    for change in ("moved", "added", "removed"):
+        for entry in diff[change]:
+            print(f"{change:<8}", _describe(entry))
+    print(f"Run {new_id}: {len(diff['moved'])} moved, {len(diff['added'])} added, {len(diff['removed'])} removed "
+          f"in {solution['repair']['seconds']:.1f} s")
@@ -0,0 +1,190 @@
+"""Assign concrete halls and labs to a solved timetable.
+
+The MIP only counts sessions against the number of halls and labs per slot.
+This stage runs after the solve: for every (day, period) it matches the
+lectures to halls and the sections to labs with a min-cost bipartite
+matching, so it costs next to nothing even with hundreds of rooms.
+
+Optional inputs used here:
+    "rooms": {"halls": [{"name": "H1", "capacity": 120, "features": ["projector"]}, ...],
+              "labs":  [{"name": "L1", "capacity": 30, "features": ["pc"]}, ...]}
+    "sizes": {class: number of students}
+    "lecture_features" / "section_features": {subject: [required features]}
+"""
+
+# a session that fits no room is matched to a dummy column of this cost
+_NO_ROOM = 10 ** 6
+
+
+def min_cost_assignment(cost):
+    """Hungarian algorithm for a rows x columns cost matrix with rows <= columns.
+
+    Returns, for every row, the index of the column it is assigned to, such
+    that every column is used at most once and the total cost is minimal.
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    INF = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)   # match[j] = row (1-based) assigned to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            delta = INF
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
+
+
+def _match_slot(sessions, rooms, last_room):
+    """Match the sessions of one slot to rooms; returns a room name (or None) per session.
+
+    A session is (owner, size, required features) and `rooms` is sorted by
+    capacity. Staying in the room the owner used last costs nothing, moving
+    costs 1, and a small term prefers the tightest room that fits so large
+    rooms stay free for large sessions.
+    """
+    if not sessions:
+        return []
+    n = len(sessions)
+
+    # Only the owners' last rooms and the n tightest fitting rooms of each
+    # session can appear in an optimal matching: with n - 1 other sessions, one
+    # of those n is always free and no worse than any larger room.
+    candidates = {}
+    by_name = {room["name"]: k for k, room in enumerate(rooms)}
+    for owner, size, features in sessions:
+        if last_room.get(owner) in by_name:
+            candidates[by_name[last_room[owner]]] = True
+        found = 0
+        for k, room in enumerate(rooms):
+            if room["capacity"] >= size and features <= room["features"]:
+                candidates[k] = True
+                found += 1
+                if found == n:
+                    break
+    columns = [rooms[k] for k in sorted(candidates)]
+    if not columns:
+        return [None] * n
+
+    biggest = max(room["capacity"] for room in columns) or 1
+    cost = []
+    for i, (owner, size, features) in enumerate(sessions):
+        row = []
+        for room in columns:
+            if room["capacity"] < size or not features <= room["features"]:
+                row.append(_NO_ROOM)
+            else:
+                move = 0 if last_room.get(owner) == room["name"] else 1
+                row.append(move + 0.5 * (room["capacity"] - size) / biggest)
+        # one private dummy column per session keeps the matrix rectangular
+        row.extend(_NO_ROOM if k == i else _NO_ROOM * 2 for k in range(n))
+        cost.append(row)
+
+    names = []
+    for i, j in enumerate(min_cost_assignment(cost)):
+        if j < len(columns) and cost[i][j] < _NO_ROOM:
+            names.append(columns[j]["name"])
+        else:
+            names.append(None)
+    return names
+
+
+def _rooms(data, kind):
+    rooms = [
+        {"name": r["name"], "capacity": r.get("capacity", 0), "features": set(r.get("features", []))}
+        for r in data["rooms"].get(kind, [])
+    ]
+    return sorted(rooms, key=lambda room: room["capacity"])
+
+
+def assign_rooms(data, solution):
+    """Give every lecture a hall and every section a lab.
+
+    Lectures are matched once per group (all its classes attend together) and
+    sections once per class. Both try to keep each group in the same room
+    from one session to the next. Returns
+        {"lectures": [[env, group, subject, day, period, hall], ...],
+         "sections": [[env, group, class, subject, day, period, lab], ...],
+         "unassigned": count of sessions no room could hold}
+    """
+    halls = _rooms(data, "halls")
+    labs = _rooms(data, "labs")
+    sizes = data.get("sizes", {})
+    lecture_features = data.get("lecture_features", {})
+    section_features = data.get("section_features", {})
+    classes = data["classes"]
+
+    # collect the sessions of every slot
+    slot_lectures = {}
+    for e, g, c, s, d, p, t in solution["lectures"]:
+        if c == classes[g][0]:
+            slot_lectures.setdefault((d, p), []).append((e, g, s))
+    slot_sections = {}
+    for e, g, c, s, d, p, a in solution["sections"]:
+        slot_sections.setdefault((d, p), []).append((e, g, c, s))
+
+    result = {"lectures": [], "sections": [], "unassigned": 0}
+    last_hall = {}
+    last_lab = {}
+    for slot in sorted(set(slot_lectures) | set(slot_sections)):
+        d, p = slot
+
+        lectures = slot_lectures.get(slot, [])
+        sessions = [
+            (g, sum(sizes.get(c, 0) for c in classes[g]), set(lecture_features.get(s, [])))
+            for e, g, s in lectures
+        ]
+        for (e, g, s), hall in zip(lectures, _match_slot(sessions, halls, last_hall)):
+            result["lectures"].append([e, g, s, d, p, hall])
+            if hall is None:
+                result["unassigned"] += 1
+            else:
+                last_hall[g] = hall
+
+        sections = slot_sections.get(slot, [])
+        sessions = [(g, sizes.get(c, 0), set(section_features.get(s, []))) for e, g, c, s in sections]
+        for (e, g, c, s), lab in zip(sections, _match_slot(sessions, labs, last_lab)):
+            result["sections"].append([e, g, c, s, d, p, lab])
+            if lab is None:
+                result["unassigned"] += 1
+            else:
+                last_lab[g] = lab
+
+    return result
@@ -0,0 +1,242 @@
+"""Append-only history of solver runs.
+
+Every scheduelModel() run given a history_path (the command line and the
+UI use run_history.jsonl) appends one JSON line: the input hash and size,
+the solver settings, the model size, the CBC statistics read from its log
+(objective, bound, gap, nodes, time to the first incumbent) and the phase
+timings. The report shows how runs evolve across input versions:
+
+    python run_history.py run_history.jsonl
+    python run_history.py run_history.jsonl --input 3f2a --method mip --last 20
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+
+_INCUMBENT = re.compile(r"Cbc00(?:04|12)I Integer solution of (\S+) found.*\(([\d.]+) seconds\)")
+_BEST_POSSIBLE = re.compile(r"best possible (\S+)\)")
+_CONTINUOUS = re.compile(r"Continuous objective value is (\S+) - ([\d.]+) seconds")
+_ROOT_CUTS = re.compile(r"Cbc0013I At root node, .* to (\S+) in")
+_NODES = re.compile(r"Cbc0010I After .* (\S+) best solution, best possible (\S+) \(([\d.]+) seconds\)")
+_SEARCH_END = re.compile(r"Cbc000[15]I .*best objective ([^,\s]+).*\(([\d.]+) seconds\)")
+# CBC's "no solution" objective
+_INFINITY = 1e49
+_FIELDS = {
+    "Objective value:": "objective",
+    "Lower bound:": "bound",
+    "Gap:": "gap",
+    "Enumerated nodes:": "nodes",
+    "Total iterations:": "iterations",
+    "Time (Wallclock seconds):": "seconds",
+}
+
+
+def parse_cbc_log(text):
+    """Read the statistics of one CBC run from its log.
+
+    Returns a dict with version, result, objective, bound, gap, nodes,
+    iterations, seconds, incumbents ([objective, seconds] in the order
+    CBC found them) and progress ([seconds, incumbent, bound] whenever
+    either changes, None while unknown); entries missing from the log are
+    None.
+    """
+    stats = {"version": None, "result": None, "incumbents": [], "progress": []}
+    stats.update(dict.fromkeys(_FIELDS.values()))
+    state = [0.0, None, None]
+
+    def advance(seconds=None, incumbent=None, bound=None):
+        if seconds is not None:
+            state[0] = seconds
+        if incumbent is not None and incumbent < _INFINITY:
+            state[1] = incumbent
+        if bound is not None:
+            state[2] = bound
+        stats["progress"].append(list(state))
+
+    for line in text.splitlines():
+        line = line.strip()
+        for pattern, fields in ((_CONTINUOUS, ("bound", "seconds")), (_ROOT_CUTS, ("bound",)),
+                                (_NODES, ("incumbent", "bound", "seconds")),
+                                (_SEARCH_END, ("incumbent", "seconds"))):
+            match = pattern.search(line)
+            if match:
+                values = dict(zip(fields, map(float, match.groups())))
+                if line.startswith("Cbc0005I"):
+                    values["bound"] = float(_BEST_POSSIBLE.search(line).group(1))
+                elif line.startswith("Cbc0001I"):
+                    values["bound"] = values["incumbent"]
+                advance(**values)
+        if line.startswith("Version:"):
+            stats["version"] = line.split(":", 1)[1].strip()
+        elif line.startswith("Result - "):
+            stats["result"] = line[len("Result - "):]
+        elif line.startswith("Cbc0005I") and stats["bound"] is None:
+            # a partial search only states its bound here
+            match = _BEST_POSSIBLE.search(line)
+            if match:
+                stats["bound"] = float(match.group(1))
+        else:
+            match = _INCUMBENT.search(line)
+            if match:
+                stats["incumbents"].append([float(match.group(1)), float(match.group(2))])
+                advance(float(match.group(2)), float(match.group(1)))
+                continue
+            for prefix, key in _FIELDS.items():
+                if line.startswith(prefix):
+                    stats[key] = float(line[len(prefix):].split()[0])
+    if stats["result"] == "Optimal solution found" and stats["objective"] is not None:
+        stats["bound"] = stats["objective"]
+        stats["gap"] = 0.0
+    for key in ("nodes", "iterations"):
+        if stats[key] is not None:
+            stats[key] = int(stats[key])
+    return stats
+
+
+class SolverLog:
+    """Wraps a CBC command factory so that every solve logs to its own file.
+
+    Call it like the factory, `log(time_limit, **options)`; `statistics()`
+    then parses the logs written so far. `started` is the offset of each
+    solve from the creation of the SolverLog, so incumbent times can be
+    read against the start of the run.
+    """
+    def __init__(self, solver, directory):
+        self.solver = solver
+        self.directory = directory
+        self.start = time.perf_counter()
+        self.solves = []
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, time_limit, **options):
+        path = os.path.join(self.directory, f"cbc{len(self.solves) + 1}.log")
+        self.solves.append({"log": path, "started": time.perf_counter() - self.start, "time_limit": time_limit})
+        return self.solver(time_limit, logPath=path, **options)
+
+    def statistics(self):
+        """One dict per solve: its parse_cbc_log() entries plus log, started and time_limit."""
+        results = []
+        for solve in self.solves:
+            try:
+                with open(solve["log"]) as f:
+                    stats = parse_cbc_log(f.read())
+            except OSError:
+                stats = parse_cbc_log("")
+            results.append(dict(solve, **stats))
+        return results
+
+
+def summarize_solves(solves, offset=0):
+    """Run-level statistics from the per-solve ones.
+
+    The bound and gap are the last solve's, the nodes and iterations are
+    summed, and `first_incumbent` is the seconds from the start of the run
+    (`offset` seconds before the SolverLog was created) to the first
+    integer solution CBC reported.
+    """
+    found = [offset + s["started"] + s["incumbents"][0][1] for s in solves if s["incumbents"]]
+    last = solves[-1] if solves else {}
+    return {
+        "bound": last.get("bound"),
+        "gap": last.get("gap"),
+        "nodes": sum(s["nodes"] or 0 for s in solves),
+        "iterations": sum(s["iterations"] or 0 for s in solves),
+        "first_incumbent": min(found) if found else None,
+        "cbc_version": last.get("version"),
+    }
+
+
+def time_to_gap(solves, target, offset=0):
+    """Seconds from the start of the run until an incumbent was within `target` of the bound.
+
+    The gap is (incumbent - bound) / |incumbent|, read from the progress of
+    each solve in turn; None if no solve got there.
+    """
+    for solve in solves:
+        for seconds, incumbent, bound in solve["progress"]:
+            if incumbent is not None and bound is not None and incumbent - bound <= target * max(abs(incumbent), 1e-9):
+                return offset + solve["started"] + seconds
+    return None
+
+
+def append_record(path, record):
+    """Append one run record as a JSON line; a single write keeps concurrent runs from interleaving."""
+    with open(path, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+def load_records(path):
+    """All readable records of a history file, oldest first."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # an interrupted append leaves a partial last line
+                continue
+    return records
+
+
+def _number(value, fmt):
+    return format(value, fmt) if isinstance(value, (int, float)) else "-"
+
+
+def report(records):
+    """Print the runs, then per input version the trend of objective and times.
+
+    The objective columns of the trend only count feasible schedules.
+    """
+    print(f"{'when':<17}{'input':<10}{'method':<15}{'status':<12}{'objective':>11}{'gap':>8}"
+          f"{'1st inc s':>10}{'solve s':>9}{'total s':>9}")
+    for r in records:
+        timings = r.get("timings", {})
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(r['created_at'])):<17}"
+              f"{r['input_hash'][:8]:<10}{r['settings']['method']:<15}{str(r['status']):<12}"
+              f"{_number(r['objective'], '.1f'):>11}{_number(r['gap'], '.3f'):>8}"
+              f"{_number(r['first_incumbent'], '.1f'):>10}{_number(timings.get('solve'), '.1f'):>9}"
+              f"{_number(sum(timings.values()), '.1f'):>9}")
+
+    versions = {}
+    for r in records:
+        versions.setdefault(r["input_hash"], []).append(r)
+    print()
+    print(f"{'input':<10}{'runs':>5}{'best':>11}{'last':>11}{'change':>9}{'median 1st inc s':>18}{'median solve s':>16}")
+    for input_hash, runs in versions.items():
+        # schedules that break a hard constraint say nothing about quality
+        objectives = [r["objective"] for r in runs if r["objective"] is not None and r.get("feasible")]
+        firsts = [r["first_incumbent"] for r in runs if r["first_incumbent"] is not None]
+        solves = [r["timings"]["solve"] for r in runs if "solve" in r.get("timings", {})]
+        change = objectives[-1] - objectives[-2] if len(objectives) > 1 else None
+        print(f"{input_hash[:8]:<10}{len(runs):>5}{_number(min(objectives, default=None), '.1f'):>11}"
+              f"{_number(objectives[-1] if objectives else None, '.1f'):>11}{_number(change, '+.1f'):>9}"
+              f"{_number(statistics.median(firsts) if firsts else None, '.1f'):>18}"
+              f"{_number(statistics.median(solves) if solves else None, '.1f'):>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default="run_history.jsonl", help="history file")
+    parser.add_argument("--input", help="only runs whose input hash starts with this")
+    parser.add_argument("--method", help="only runs of this solve method")
+    parser.add_argument("--last", type=int, help="only the last N matching runs")
+    args = parser.parse_args()
+
+    records = load_records(args.path)
+    if args.input:
+        records = [r for r in records if r["input_hash"].startswith(args.input)]
+    if args.method:
+        records = [r for r in records if r["settings"]["method"] == args.method]
+    if args.last:
+        records = records[-args.last:]
+    if not records:
+        print("No runs recorded.")
+        return
+    report(records)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,232 @@
 import pulp
 import os
 import math
+import time
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
 import json
+import hashlib
 
-    # /////////////////////  Data //////////////////////
-
-def scheduelModel():
-
-    with open('scheduling_inputs01.json') as f:
-        data = json.load(f)
-
-        HALLS = data['halls']  # number of halls
-        LABS  = data['labs']   # number of labs
-        DAYS    = list(range(1,data['days'] + 1))  # 1..5
-        PERIODS = list(range(1,data['periods'] + 1))  # 1..5
-
-            # ------------------------------------------- #
-
-        environments = data['environments']
-
-        groups = data['groups']
-
-        classes = data['classes']
-
-        subjects = data['subjects']
-
-        subj_list = {s for e in environments for s in subjects[e]}
-        subj_list = list(subj_list)
-            # ------------------------------------------- #
-
-        A = data['A']
-        T = data['T']
+from run_history import SolverLog, append_record, summarize_solves
+from preference_table import UNAVAILABLE
+from input_loader import capacity_problems
 
-        AL = data['AL']   # maximum load for assistant (periods per week, subjects)
-        TL = data['TL']  # maximum load for Doctor (periods per week, subjects)
-
-
-        # AT[a][d][p] = 1 if TL a prefers time (d,p), else 0
-        AT = data['AT']
-        TT = data['TT']
+    # /////////////////////  Data //////////////////////
 
-        # AS[a][s] = 1 if TL a want to teach subject s, else 0
-        AS = data['AS']
-        TS = data['TS']
+class EntityIndex:
+    """Maps every named entity of the inputs to a dense integer id.
+
+    The model is built over these ids only, so variable keys are small int
+    tuples; the names are restored by `extract_solution` at export time.
+    """
+    def __init__(self, data):
+        self.environments = list(data['environments'])
+        self.groups = list(dict.fromkeys(g for e in self.environments for g in data['groups'][e]))
+        self.classes = list(dict.fromkeys(c for g in self.groups for c in data['classes'][g]))
+        self.subjects = sorted({s for e in self.environments for s in data['subjects'][e]})
+        self.assistants = list(data['A'])
+        self.doctors = list(data['T'])
+
+        self.group_id = {g: i for i, g in enumerate(self.groups)}
+        self.class_id = {c: i for i, c in enumerate(self.classes)}
+        self.subject_id = {s: i for i, s in enumerate(self.subjects)}
+
+        # the inputs' nested structure, expressed in ids
+        self.env_groups = [[self.group_id[g] for g in data['groups'][e]] for e in self.environments]
+        self.group_classes = [[self.class_id[c] for c in data['classes'][g]] for g in self.groups]
+        self.env_subjects = [[self.subject_id[s] for s in data['subjects'][e]] for e in self.environments]
+
+    def time_matrix(self, prefs, teachers, DAYS, PERIODS):
+        """Turn {teacher: {"d": {"p": v}}} into nested lists indexed [teacher][d-1][p-1]."""
+        return [[[prefs[t][str(d)][str(p)] for p in PERIODS] for d in DAYS] for t in teachers]
+
+    def subject_matrix(self, prefs, teachers):
+        """Turn {teacher: {subject: v}} into nested lists indexed [teacher][subject]."""
+        return [[prefs[t].get(s, 0) for s in self.subjects] for t in teachers]
+
+class TimetableModel:
+    """The pulp problem returned by `build_model`, with its variable families.
+
+    Attributes: model, data, index, DAYS, PERIODS and the variable dicts
+    Y, X, BP, BD, I, J, ADS, TDS, Load, DEV, GAP (and FP, LP for "bigm")
+    keyed by entity ids, plus `objectives` (one expression per component)
+    and the `weights` used.
+    """
+    # position of the day and of the environment in the keys of each family
+    BLOCK_KEYS = {
+        "Y": (4, 0), "X": (4, 0), "BP": (3, 0), "BD": (3, 0), "I": (5, 1), "J": (5, 1),
+        "Load": (3, 0), "DEV": (3, 0), "GAP": (3, 0), "FP": (3, 0), "LP": (3, 0),
+    }
+
+    def __init__(self, **parts):
+        self.__dict__.update(parts)
+
+    def blocks(self, by="days"):
+        """Split the integer variables by day or by environment.
+
+        Returns {day or environment id: [variables]}. ADS and TDS span the
+        whole week and belong to no block.
+        """
+        if by not in ("days", "environments"):
+            raise ValueError(f"Unknown decomposition: {by!r}")
+        blocks = {}
+        for family, (day_pos, env_pos) in self.BLOCK_KEYS.items():
+            position = day_pos if by == "days" else env_pos
+            for key, var in getattr(self, family, {}).items():
+                if var.cat != pulp.LpContinuous:
+                    blocks.setdefault(key[position], []).append(var)
+        return blocks
+
+    def set_start(self, solution):
+        """Load a compact solution as the initial values for a warmStart solve.
+
+        Every variable the schedule determines is set, the rest of the model
+        (ST/NE of the "tight" formulation) is completed by CBC. With pools a
+        teacher's sessions go to their pool.
+        """
+        index = self.index
+        env_id = {e: i for i, e in enumerate(index.environments)}
+        if self.pools is None:
+            doctor_id = {t: i for i, t in enumerate(index.doctors)}
+            assistant_id = {a: i for i, a in enumerate(index.assistants)}
+        else:
+            doctor_id = {t: i for i, pool in enumerate(self.pools["T"]) for t in pool}
+            assistant_id = {a: i for i, pool in enumerate(self.pools["A"]) for a in pool}
+        for family in ("Y", "X", "BP", "BD", "I", "J", "ADS", "TDS", "Load", "DEV", "GAP", "FP", "LP"):
+            for var in getattr(self, family, {}).values():
+                var.setInitialValue(0)
+
+        busy = {}
+        for rows, sessions, teaching, teacher_id, subjects in (
+                (solution["lectures"], self.Y, self.I, doctor_id, self.TDS),
+                (solution["sections"], self.X, self.J, assistant_id, self.ADS)):
+            taught = {}
+            for env, group, class_name, subject, d, p, teacher in rows:
+                e, g, c = env_id[env], index.group_id[group], index.class_id[class_name]
+                s, t = index.subject_id[subject], teacher_id[teacher]
+                sessions[e,g,c,s,d,p].setInitialValue(1)
+                if (t,e,g,c,s,d,p) in teaching:   # not when the teacher is unavailable there
+                    teaching[t,e,g,c,s,d,p].setInitialValue(1)
+                taught.setdefault((t,s), set()).add(teacher)
+                busy.setdefault((e,g,c,d), set()).add(p)
+            for (t,s), names in taught.items():
+                # 1, or the number of members of a pool teaching the subject
+                subjects[t,s].setInitialValue(len(names))
+
+        half = math.ceil(len(self.PERIODS) / 2)
+        for key, periods in busy.items():
+            for p in periods:
+                self.BP[(*key, p)].setInitialValue(1)
+            first, last, load = min(periods), max(periods), len(periods)
+            self.BD[key].setInitialValue(1)
+            self.Load[key].setInitialValue(load)
+            self.DEV[key].setInitialValue(abs(load - half))
+            self.GAP[key].setInitialValue(last - first + 1 - load)
+            if hasattr(self, "FP"):
+                self.FP[key].setInitialValue(first)
+                self.LP[key].setInitialValue(last)
+
+def _vars(prefix, keys, cat, lowBound=None, upBound=None):
+    """Create one variable per key, named `prefix` plus a running number."""
+    return {key: pulp.LpVariable(f"{prefix}{n}", lowBound, upBound, cat=cat) for n, key in enumerate(keys)}
+
+# objective components, minimized; "preferences" is the negated sum of the
+# time and subject preferences met by the assignment
+OBJECTIVES = ("deviation", "days", "gaps", "preferences")
+DEFAULT_WEIGHTS = {"deviation": 9, "days": 25, "gaps": 30, "preferences": 1}
+
+# default order of the lexicographic solve
+DEFAULT_TIERS = (("days",), ("gaps",), ("deviation", "preferences"))
+
+def objective_weights(weights=None):
+    """Return DEFAULT_WEIGHTS updated with `weights`, rejecting unknown components."""
+    unknown = set(weights or {}) - set(OBJECTIVES)
+    if unknown:
+        raise ValueError(f"Unknown objective components: {sorted(unknown)}")
+    return {**DEFAULT_WEIGHTS, **(weights or {})}
+
+def load_inputs(path='scheduling_inputs01.json'):
+    """Read the scheduling inputs JSON file written by the UI."""
+    with open(path) as f:
+        return json.load(f)
+
+def input_hash(data):
+    """Stable fingerprint of an inputs dictionary, to tell runs on the same inputs apart."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def build_model(data, compactness="bigm", weights=None, pools=None):
+    """Build the pulp timetable model for the inputs dictionary `data`.
+
+    `compactness` selects how the idle periods of a student day are counted:
+    "bigm" uses the first/last period integers of the original formulation,
+    "tight" uses monotone started/not-ended indicators per period, which
+    gives the same GAP value with a much stronger LP relaxation.
+    `weights` overrides entries of DEFAULT_WEIGHTS for the objective.
+    `pools` ({"A": [[assistant, ...]], "T": [[doctor, ...]]}, see
+    teacher_pools.find_pools) models every pool as its first teacher with
+    the capacity of all its members; ADS/TDS then count the members
+    teaching a subject, and teacher_pools.disaggregate names them.
+    """
+    if compactness not in ("bigm", "tight"):
+        raise ValueError(f"Unknown compactness formulation: {compactness!r}")
+
+    HALLS = data['halls']  # number of halls
+    LABS  = data['labs']   # number of labs
+    if 'rooms' in data:
+        # concrete rooms are listed, they are assigned after the solve
+        HALLS = len(data['rooms'].get('halls', []))
+        LABS = len(data['rooms'].get('labs', []))
+    DAYS    = list(range(1,data['days'] + 1))  # 1..5
+    PERIODS = list(range(1,data['periods'] + 1))  # 1..5
+
+        # ------------------------------------------- #
+
+    # every entity is interned to a dense int, the model only sees ids
+    if pools is None:
+        index = EntityIndex(data)
+    else:
+        index = EntityIndex(dict(data, A=[pool[0] for pool in pools["A"]], T=[pool[0] for pool in pools["T"]]))
+
+    environments = range(len(index.environments))
+
+    groups = index.env_groups
+
+    classes = index.group_classes
+
+    subjects = index.env_subjects
+
+    subj_list = range(len(index.subjects))
+        # ------------------------------------------- #
+
+    A = range(len(index.assistants))
+    T = range(len(index.doctors))
+
+    AL = data['AL']   # maximum load for assistant (periods per week, subjects)
+    TL = data['TL']  # maximum load for Doctor (periods per week, subjects)
+
+    # teachers behind each (pooled) assistant and doctor, 1 without pools
+    A_size = [len(pool) for pool in pools["A"]] if pools else [1] * len(A)
+    T_size = [len(pool) for pool in pools["T"]] if pools else [1] * len(T)
+
+
+    # AT[a][d-1][p-1] = 1 if TL a prefers time (d,p), 0 if neutral, -1 if unavailable
+    AT = index.time_matrix(data['AT'], index.assistants, DAYS, PERIODS)
+    TT = index.time_matrix(data['TT'], index.doctors, DAYS, PERIODS)
+
+    # the (teacher, d, p) a teacher can take; only these get I/J variables
+    A_open = {(a,d,p) for a in A for d in DAYS for p in PERIODS if AT[a][d-1][p-1] != UNAVAILABLE}
+    T_open = {(t,d,p) for t in T for d in DAYS for p in PERIODS if TT[t][d-1][p-1] != UNAVAILABLE}
+
+    # AS[a][s] = 1 if TL a want to teach subject s, else 0
+    AS = index.subject_matrix(data['AS'], index.assistants)
+    TS = index.subject_matrix(data['TS'], index.doctors)
 
             
     # ///////////////////// Model /////////////////////
     model = pulp.LpProblem("College_Scheduling", pulp.LpMinimize)
 
     # --- Decision Variables ---
-    Y = pulp.LpVariable.dicts(
-        "Lecture",
+    Y = _vars(
+        "y",
         [(e,g,c,s,d,p) 
         for e in environments 
         for g in groups[e]
@@ -65,8 +237,8 @@ def scheduelModel():
         cat='Binary'
     )
 
-    X = pulp.LpVariable.dicts(
-        "Section",
+    X = _vars(
+        "x",
         [(e,g,c,s,d,p)
         for e in environments
         for g in groups[e]
@@ -77,8 +249,8 @@ def scheduelModel():
         cat='Binary'
     )
 
-    BP = pulp.LpVariable.dicts(
-        "BusyPeriod",
+    BP = _vars(
+        "bp",
         [(e,g,c,d,p)
         for e in environments
         for g in groups[e]
@@ -88,8 +260,8 @@ def scheduelModel():
         cat='Binary'
     )
 
-    BD = pulp.LpVariable.dicts(
-        "BusyDay",
+    BD = _vars(
+        "bd",
         [(e,g,c,d)
         for e in environments
         for g in groups[e]
@@ -100,53 +272,63 @@ def scheduelModel():
 
             # ------------------------------------------- #
 
-    I = pulp.LpVariable.dicts(
-        "DoctorsIndexer",
+    # only the subjects a group studies, or a teacher could "teach" a session
+    # that does not exist and earn its subject preference for free
+    I = _vars(
+        "i",
         [(t,e,g,c,s,d,p)
         for t in T
         for e in environments
         for g in groups[e]
         for c in classes[g]
-        for s in subj_list
+        for s in subjects[e]
         for d in DAYS
-        for p in PERIODS],
+        for p in PERIODS
+        if (t,d,p) in T_open],
         cat='Binary'
     )
 
-    J = pulp.LpVariable.dicts(
-        "assistantIndexer",
+    J = _vars(
+        "j",
         [(a,e,g,c,s,d,p)
         for a in A
         for e in environments
         for g in groups[e]
         for c in classes[g]
-        for s in subj_list
+        for s in subjects[e]
         for d in DAYS
-        for p in PERIODS],
+        for p in PERIODS
+        if (a,d,p) in A_open],
         cat='Binary'
     )
 
     # the days that will be assigned to teachers
-    ADS = pulp.LpVariable.dicts(
-        "AssistantSubject",
+    ADS = _vars(
+        "ads",
         [(a,s)
         for a in A
         for s in subj_list],
         cat='Binary'
     )
 
-    TDS = pulp.LpVariable.dicts(
-        "DoctorSubject",
+    TDS = _vars(
+        "tds",
         [(t,s)
         for t in T
         for s in subj_list],
         cat='Binary'
     )
 
+    # a pool counts how many of its members teach the subject
+    for subjects_taught, size in ((ADS, A_size), (TDS, T_size)):
+        for (t, s), var in subjects_taught.items():
+            if size[t] > 1:
+                var.cat, var.upBound = pulp.LpInteger, size[t]
+
             # ------------------------------------------- #
 
-    Load = pulp.LpVariable.dicts(
-        "studentDayLoad",
+    Load = _vars(
+        "ld",
         [(e,g,c,d)
         for e in environments
         for g in groups[e]
@@ -155,8 +337,8 @@ def scheduelModel():
         cat='Integer'
     )
 
-    DEV = pulp.LpVariable.dicts(
-        "studentDayDeviation",
+    DEV = _vars(
+        "dev",
         [(e,g,c,d)
         for e in environments
         for g in groups[e]
@@ -165,35 +347,70 @@ def scheduelModel():
         cat='Integer'
     )
 
-    FP = pulp.LpVariable.dicts(
-        "FirstPeriod",
-        [(e,g,c,d)
-        for e in environments
-        for g in groups[e]
-        for c in classes[g]
-        for d in DAYS],
-        cat='Integer'
-    )
+    if compactness == "bigm":
+        FP = _vars(
+            "fp",
+            [(e,g,c,d)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS],
+            cat='Integer'
+        )
 
-    LP = pulp.LpVariable.dicts(
-        "LastPeriod",
-        [(e,g,c,d)
-        for e in environments
-        for g in groups[e]
-        for c in classes[g]
-        for d in DAYS],
-        cat='Integer'
-    )
+        LP = _vars(
+            "lp",
+            [(e,g,c,d)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS],
+            cat='Integer'
+        )
 
-    GAP = pulp.LpVariable.dicts(
-        "dayGap",
-        [(e,g,c,d)
-        for e in environments
-        for g in groups[e]
-        for c in classes[g]
-        for d in DAYS],
-        cat='Integer'
-    )
+        GAP = _vars(
+            "gap",
+            [(e,g,c,d)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS],
+            cat='Integer'
+        )
+    else:
+        # ST[p] = 1 once the day has started at or before p,
+        # NE[p] = 1 while the day has not ended before p
+        ST = _vars(
+            "st",
+            [(e,g,c,d,p)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS
+            for p in PERIODS],
+            cat='Continuous', lowBound=0, upBound=1
+        )
+
+        NE = _vars(
+            "ne",
+            [(e,g,c,d,p)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS
+            for p in PERIODS],
+            cat='Continuous', lowBound=0, upBound=1
+        )
+
+        GAP = _vars(
+            "gap",
+            [(e,g,c,d)
+            for e in environments
+            for g in groups[e]
+            for c in classes[g]
+            for d in DAYS],
+            cat='Continuous', lowBound=0
+        )
 
     # ---------------------------------------
 
@@ -205,8 +422,7 @@ def scheduelModel():
                         for e in environments 
                         for g in groups[e] 
                         for s in subjects[e])
-                <= HALLS,
-                f"HallCap_{d}_{p}"
+                <= HALLS
             )
 
     # Lab capacity
@@ -216,8 +432,7 @@ def scheduelModel():
                         for g in groups[e] 
                         for c in classes[g]
                         for s in subjects[e])
-                <= LABS,
-                f"LabCap_{d}_{p}"
+                <= LABS
             )
 
     # ---------------------------------------
@@ -228,14 +443,12 @@ def scheduelModel():
             for c in classes[g]:
                 for s in subjects[e]:
                     model += (
-                        pulp.lpSum(Y[e,g,c,s,d,p] for d in DAYS for p in PERIODS) == 1,
-                        f"LectureOnce_{e}_{g}_{c}_{s}"
+                        pulp.lpSum(Y[e,g,c,s,d,p] for d in DAYS for p in PERIODS) == 1
                     )
 
     # Each section per group once
                     model += (
-                        pulp.lpSum(X[e,g,c,s,d,p] for d in DAYS for p in PERIODS) == 1,
-                        f"SectionOnce_{e}_{g}_{c}_{s}"
+                        pulp.lpSum(X[e,g,c,s,d,p] for d in DAYS for p in PERIODS) == 1
                     )
 
     # All classes of the same group takes the lecture together
@@ -243,14 +456,14 @@ def scheduelModel():
                 for d in DAYS:
                     for p in PERIODS:
                         model += (           # if the first class takes the lecture, all classes of the same group takes the lecture together
-                            pulp.lpSum(Y[e,g,c,s,d,p] for c in classes[g]) == (len(classes[g]) * Y[e,g, classes[g][0] ,s,d,p]),
-                            f"GroupClass_{e}_{g}_{s}_{d}_{p}"
+                            pulp.lpSum(Y[e,g,c,s,d,p] for c in classes[g]) == (len(classes[g]) * Y[e,g, classes[g][0] ,s,d,p])
                         )
 
                         for t in T:
+                            if (t,d,p) not in T_open:
+                                continue
                             model += (
-                                pulp.lpSum(I[t,e,g,c,s,d,p] for c in classes[g]) == (len(classes[g]) * I[t,e,g,classes[g][0],s,d,p]),
-                                f"GroupDoctor_{t}_{e}_{g}_{s}_{d}_{p}"
+                                pulp.lpSum(I[t,e,g,c,s,d,p] for c in classes[g]) == (len(classes[g]) * I[t,e,g,classes[g][0],s,d,p])
                             )
 
     # ---------------------------------------
@@ -258,29 +471,25 @@ def scheduelModel():
     # Assistant subject Load 
     for a in A:
         model += (
-            pulp.lpSum(ADS[a,s] for s in subj_list) <= AL[1],
-            f"AssistantLoadSubject_{a}"
+            pulp.lpSum(ADS[a,s] for s in subj_list) <= AL[1] * A_size[a]
         )
 
     # Doctor subject Load 
     for t in T:
         model += (
-            pulp.lpSum(TDS[t,s] for s in subj_list) <= TL[1],
-            f"DoctorLoadSubject_{t}"
+            pulp.lpSum(TDS[t,s] for s in subj_list) <= TL[1] * T_size[t]
         )
 
     # Assistant period Load per week
     for a in A:
         model += (
-            pulp.lpSum(J[a,e,g,c,s,d,p] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e] for d in DAYS for p in PERIODS) <= AL[0],
-            f"AssistantLoad_{a}"
+            pulp.lpSum(J[a,e,g,c,s,d,p] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e] for d in DAYS for p in PERIODS if (a,d,p) in A_open) <= AL[0] * A_size[a]
         )
 
     # Doctor period Load per week
     for t in T:
         model += (
-            pulp.lpSum(I[t,e,g,classes[g][0],s,d,p] for e in environments for g in groups[e] for s in subjects[e] for d in DAYS for p in PERIODS) <= TL[0],
-            f"DoctorLoad_{t}"
+            pulp.lpSum(I[t,e,g,classes[g][0],s,d,p] for e in environments for g in groups[e] for s in subjects[e] for d in DAYS for p in PERIODS if (t,d,p) in T_open) <= TL[0] * T_size[t]
         )
 
     # ---------------------------------------
@@ -292,8 +501,7 @@ def scheduelModel():
                 for s in subjects[e]:
                     for d in DAYS:
                         for p in PERIODS:
-                            model += (pulp.lpSum(I[t, e, g, c, s, d, p] for t in T) == Y[e, g, c, s, d, p],
-                                    f"AssignDoctorToLecture_{e}_{g}_{c}_{s}_{d}_{p}")
+                            model += (pulp.lpSum(I[t, e, g, c, s, d, p] for t in T if (t, d, p) in T_open) == Y[e, g, c, s, d, p])
 
     for e in environments:
         for g in groups[e]:
@@ -301,67 +509,75 @@ def scheduelModel():
                 for s in subjects[e]:
                     for d in DAYS:
                         for p in PERIODS:
-                            model += (pulp.lpSum(J[a, e, g, c, s, d, p] for a in A) == X[e, g, c, s, d, p],
-                                    f"AssignTAToSection_{e}_{g}_{c}_{s}_{d}_{p}")
+                            model += (pulp.lpSum(J[a, e, g, c, s, d, p] for a in A if (a, d, p) in A_open) == X[e, g, c, s, d, p])
 
     for s in subj_list:
         for a in A:
             model += (
                 pulp.lpSum(J[a, e, g, c, s, d, p]
-                        for e in environments
+                        for e in environments if s in subjects[e]
                         for g in groups[e]
                         for c in classes[g]
                         for d in DAYS
-                        for p in PERIODS)
-                <= ADS[a, s] * AL[0],
-                f"LinkADS_ub_{a}_{s}"
+                        for p in PERIODS
+                        if (a, d, p) in A_open)
+                <= ADS[a, s] * AL[0]
             )
             model += (
                 pulp.lpSum(J[a, e, g, c, s, d, p]
-                        for e in environments
+                        for e in environments if s in subjects[e]
                         for g in groups[e]
                         for c in classes[g]
                         for d in DAYS
-                        for p in PERIODS)
-                >= ADS[a, s],
-                f"LinkADS_lb_{a}_{s}"
+                        for p in PERIODS
+                        if (a, d, p) in A_open)
+                >= ADS[a, s]
             )  
 
         for t in T:
             model += (
                 pulp.lpSum(I[t, e, g, classes[g][0], s, d, p]
-                        for e in environments
+                        for e in environments if s in subjects[e]
                         for g in groups[e]
                         for d in DAYS
-                        for p in PERIODS)
-                <= TDS[t, s] * TL[0],
-                f"LinkTDS_ub_{t}_{s}"
+                        for p in PERIODS
+                        if (t, d, p) in T_open)
+                <= TDS[t, s] * TL[0]
             )
             model += (
                 pulp.lpSum(I[t, e, g, classes[g][0], s, d, p]
-                        for e in environments
+                        for e in environments if s in subjects[e]
                         for g in groups[e]
                         for d in DAYS
-                        for p in PERIODS)
-                >= TDS[t, s],
-                f"LinkTDS_lb_{t}_{s}"
+                        for p in PERIODS
+                        if (t, d, p) in T_open)
+                >= TDS[t, s]
             )  
 
     # assistants and doctors have just 1 subject in the single period
-    for a in A:
-        for d in DAYS:
-            for p in PERIODS:
+    for a, d, p in sorted(A_open):
+        model += (
+            pulp.lpSum(J[a, e, g, c, s, d, p] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) <= A_size[a]
+        )
+
+    for t, d, p in sorted(T_open):
+        model += (
+            pulp.lpSum(I[t, e, g, classes[g][0], s, d, p] for e in environments for g in groups[e] for s in subjects[e]) <= T_size[t]
+        )
+
+    # and in a pool, only the members teaching a subject can teach it in a period
+    for a, d, p in sorted(A_open):
+        if A_size[a] > 1:
+            for s in subj_list:
                 model += (
-                    pulp.lpSum(J[a, e, g, c, s, d, p] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) <= 1,
-                    f"AssignTAToSection_{a}_{d}_{p}"
+                    pulp.lpSum(J[a, e, g, c, s, d, p] for e in environments if s in subjects[e] for g in groups[e] for c in classes[g]) <= ADS[a, s]
                 )
 
-    for t in T:
-        for d in DAYS:
-            for p in PERIODS:
+    for t, d, p in sorted(T_open):
+        if T_size[t] > 1:
+            for s in subj_list:
                 model += (
-                    pulp.lpSum(I[t, e, g, classes[g][0], s, d, p] for e in environments for g in groups[e] for s in subjects[e]) <= 1,
-                    f"AssignTAToLecture_{t}_{d}_{p}"
+                    pulp.lpSum(I[t, e, g, classes[g][0], s, d, p] for e in environments if s in subjects[e] for g in groups[e]) <= TDS[t, s]
                 )
     # ---------------------------------------
     for e in environments:
@@ -377,292 +593,611 @@ def scheduelModel():
                             pulp.lpSum(Y[e,g,c,s,d,p] for s in subjects[e])
                         )
 
-                        model += (BP[e,g,c,d,p] <= 1 , f"NoDouble_{e}_{g}_{c}_{d}_{p}")
+                        model += (BP[e,g,c,d,p] <= 1)
 
 
                     # day study periods for each section
                     model += (
-                        pulp.lpSum(BP[e,g,c,d,p] for p in PERIODS) == Load[e,g,c,d],
-                        f"dayLoad_{e}_{g}_{c}_{d}"
+                        pulp.lpSum(BP[e,g,c,d,p] for p in PERIODS) == Load[e,g,c,d]
                     )
 
                     # If any session ⇒ z=1
-                    model += (Load[e,g,c,d] >= BD[e,g,c,d], f"Zone_{e}_{g}_{c}_{d}")
+                    model += (Load[e,g,c,d] >= BD[e,g,c,d])
                     # If no sessions ⇒ z=0
-                    model += (Load[e,g,c,d] <= len(PERIODS) * BD[e,g,c,d], f"Zzero_{e}_{g}_{c}_{d}")
+                    model += (Load[e,g,c,d] <= len(PERIODS) * BD[e,g,c,d])
 
                     # achive mean load:     DEV >= | Load - len(PERIODS)/2 |
                     model += (
-                        DEV[e,g,c,d] >= Load[e,g,c,d] - math.ceil(len(PERIODS)/2),
-                        f"dayDeviationPositive_{e}_{g}_{c}_{d}"
+                        DEV[e,g,c,d] >= Load[e,g,c,d] - math.ceil(len(PERIODS)/2)
                     )
 
                     model += (
-                        DEV[e,g,c,d] >= BD[e,g,c,d] * (math.ceil(len(PERIODS)/2)) - Load[e,g,c,d],
-                        f"dayDeviationNegative_{e}_{g}_{c}_{d}"
+                        DEV[e,g,c,d] >= BD[e,g,c,d] * (math.ceil(len(PERIODS)/2)) - Load[e,g,c,d]
                     )
                     
-                    model += (DEV[e,g,c,d] <= len(PERIODS) * BD[e,g,c,d], f"DevZeroIfFree_{e}_{g}_{c}_{d}")
+                    model += (DEV[e,g,c,d] <= len(PERIODS) * BD[e,g,c,d])
 
                     # ---------------------------------------
 
-                    # to ensure that the last period will equal 0 if the day is not studied 
-                    # and will be less than largest period if the day is studied
-                    model += (
-                        LP[e,g,c,d] <= BD[e,g,c,d] * len(PERIODS),
-                        f"LastPeriodMin_{e}_{g}_{c}_{d}"
-                    )
+                    if compactness == "bigm":
+                        # to ensure that the last period will equal 0 if the day is not studied 
+                        # and will be less than largest period if the day is studied
+                        model += (
+                            LP[e,g,c,d] <= BD[e,g,c,d] * len(PERIODS)
+                        )
 
-                    # to ensure that the first period will always equal 0
-                    model += (
-                        FP[e,g,c,d] <= BD[e,g,c,d] * len(PERIODS),
-                        f"FirstPeriodMax_{e}_{g}_{c}_{d}"
-                    )
+                        # to ensure that the first period will always equal 0
+                        model += (
+                            FP[e,g,c,d] <= BD[e,g,c,d] * len(PERIODS)
+                        )
 
-                    # calculate the gap between the first and last period
-                    model += (
-                        GAP[e,g,c,d] == LP[e,g,c,d] - FP[e,g,c,d] - Load[e,g,c,d] + BD[e,g,c,d],
-                        f"Gap_{e}_{g}_{c}_{d}"
-                    )
+                        # calculate the gap between the first and last period
+                        model += (
+                            GAP[e,g,c,d] == LP[e,g,c,d] - FP[e,g,c,d] - Load[e,g,c,d] + BD[e,g,c,d]
+                        )
 
 
-                    for p in PERIODS:
+                        for p in PERIODS:
                         
-                        # the first period is less than all day periods
-                        model += (
-                            FP[e,g,c,d] <= p + PERIODS[-1]*(1 - BP[e,g,c,d,p]),
-                            f"FirstPeriodMin_{e}_{g}_{c}_{d}_{p}"
-                        )
+                            # the first period is less than all day periods
+                            model += (
+                                FP[e,g,c,d] <= p + PERIODS[-1]*(1 - BP[e,g,c,d,p])
+                            )
 
-                        # the last period is greater than all day periods
+                            # the last period is greater than all day periods
+                            model += (
+                                LP[e,g,c,d] >= BP[e,g,c,d,p] * p
+                            )
+
+                    else:
+                        for p in PERIODS:
+                            # started and not-ended are monotone and cover every busy period
+                            model += (ST[e,g,c,d,p] >= BP[e,g,c,d,p])
+                            model += (NE[e,g,c,d,p] >= BP[e,g,c,d,p])
+                            model += (ST[e,g,c,d,p] <= BD[e,g,c,d])
+                            model += (NE[e,g,c,d,p] <= BD[e,g,c,d])
+                            if p > PERIODS[0]:
+                                model += (ST[e,g,c,d,p] >= ST[e,g,c,d,p-1])
+                            if p < PERIODS[-1]:
+                                model += (NE[e,g,c,d,p] >= NE[e,g,c,d,p+1])
+
+                        # ST + NE - 1 marks the periods between the first and the last
+                        # busy period, so the idle ones are those minus the busy ones
                         model += (
-                            LP[e,g,c,d] >= BP[e,g,c,d,p] * p,
-                            f"LastPeriodMax_{e}_{g}_{c}_{d}_{p}"
+                            GAP[e,g,c,d] == pulp.lpSum(ST[e,g,c,d,p] + NE[e,g,c,d,p] for p in PERIODS)
+                                            - Load[e,g,c,d] - len(PERIODS) * BD[e,g,c,d]
                         )
 
 
 
     
     # === Objective ===
+    # the components are kept apart so they can be weighted or solved in tiers
+    objectives = {
+        "deviation": pulp.lpSum(DEV[e,g,c,d] for e in environments for g in groups[e] for c in classes[g] for d in DAYS),
+        "days": pulp.lpSum(BD[e,g,c,d] for e in environments for g in groups[e] for c in classes[g] for d in DAYS),
+        "gaps": pulp.lpSum(GAP[e,g,c,d] for e in environments for g in groups[e] for c in classes[g] for d in DAYS),
+        "preferences": -(
+            pulp.lpSum( pulp.lpSum( J[a,e,g,c,s,d,p] * AT[a][d-1][p-1] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) for a, d, p in sorted(A_open))
+            + pulp.lpSum( pulp.lpSum( I[t,e,g,c,s,d,p] * TT[t][d-1][p-1] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) for t, d, p in sorted(T_open))
+            + pulp.lpSum(ADS[a,s] * AS[a][s] for a in A for s in subj_list)
+            + pulp.lpSum(TDS[t,s] * TS[t][s] for t in T for s in subj_list)
+        ),
+    }
+    weights = objective_weights(weights)
+
     model += (
-        pulp.lpSum( 9* DEV[e,g,c,d] +   25 * BD[e,g,c,d] +   30 * GAP[e,g,c,d] for e in environments for g in groups[e] for c in classes[g] for d in DAYS)
-        - pulp.lpSum( pulp.lpSum( J[a,e,g,c,s,d,p] * AT[a][str(d)][str(p)] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) for a in A for d in DAYS for p in PERIODS)
-        - pulp.lpSum( pulp.lpSum( I[t,e,g,c,s,d,p] * TT[t][str(d)][str(p)] for e in environments for g in groups[e] for c in classes[g] for s in subjects[e]) for t in T for d in DAYS for p in PERIODS)
-        - pulp.lpSum(ADS[a,s] * AS[a][s] for a in A for s in subj_list)
-        - pulp.lpSum(TDS[t,s] * TS[t][s] for t in T for s in subj_list)
+        pulp.lpSum(weights[k] * objectives[k] for k in OBJECTIVES)
         , "MinimizeStudyDays"
     )
 
 
+    return TimetableModel(
+        model=model, data=data, index=index, DAYS=DAYS, PERIODS=PERIODS,
+        Y=Y, X=X, BP=BP, BD=BD, I=I, J=J, ADS=ADS, TDS=TDS,
+        Load=Load, DEV=DEV, GAP=GAP, objectives=objectives, weights=weights, pools=pools,
+        **({"FP": FP, "LP": LP} if compactness == "bigm" else {}),
+    )
+
+def _solver(time_limit, **options):
+    # with a logPath CBC's output goes to that file instead of the console
+    return pulp.PULP_CBC_CMD(msg="logPath" not in options, timeLimit=time_limit, **options)
+
+def solve_lexicographic(tm, tiers=DEFAULT_TIERS, time_limit=120, warm_start=False, solver=_solver):
+    """Optimize the objective tiers of `tm` one after another.
+
+    Each tier minimizes the weighted sum of its components, then its value is
+    fixed as a constraint and the next tier is warm-started from the current
+    incumbent (the first one too with `warm_start`, see TimetableModel.set_start).
+    Time left over by a tier that finishes early goes to the following ones.
+    `solver` makes the CBC command of each solve, as `_solver` does.
+    Returns a list with the status and value of every tier.
+    """
+    for tier in tiers:
+        unknown = set(tier) - set(OBJECTIVES)
+        if unknown:
+            raise ValueError(f"Unknown objective components: {sorted(unknown)}")
+
+    model = tm.model
+    results = []
+    deadline = time.perf_counter() + time_limit
+    for n, tier in enumerate(tiers):
+        budget = max(1, (deadline - time.perf_counter()) / (len(tiers) - n))
+        expression = pulp.lpSum(tm.weights[k] * tm.objectives[k] for k in tier)
+        model.setObjective(expression)
+        model.solve(solver(budget, warmStart=warm_start or n > 0))
+
+        value = pulp.value(expression)
+        results.append({"tier": list(tier), "status": pulp.LpStatus[model.status], "value": value})
+        if value is None or model.status not in (pulp.LpStatusOptimal, pulp.LpStatusNotSolved):
+            break
+        # keep this tier at its incumbent value while the next ones are optimized
+        model += (expression <= value + 1e-6)
+
+    # report the weighted objective of the final schedule
+    model.setObjective(pulp.lpSum(tm.weights[k] * tm.objectives[k] for k in OBJECTIVES))
+    return results
+
+METHODS = ("mip", "relax-and-fix", "draft", "columns")
+
+# seconds given to draft_schedule, as the "draft" method or as a MIP start
+DRAFT_TIME = 5
+
+# share of the time limit kept for the alternative schedules, when asked for
+ALTERNATIVES_SHARE = 0.3
+
+def scheduelModel(data=None, time_limit=120, output_dir="schedule", progress=None, compactness="bigm",
+                  weights=None, objective="weighted", tiers=DEFAULT_TIERS, store_path=None, run_label=None,
+                  method="mip", window=2, decompose="days", improve_passes=1, mip_start=False,
+                  pool_teachers=False, alternatives=0, alternative_gap=0.05, checkpoint=None, checkpoint_every=300,
+                  resume_from=None, output_format="png", history_path=None):
+    """Build and solve the timetable model, then render the schedules.
+
+    `data` is the inputs dictionary (read from scheduling_inputs01.json when
+    omitted) and `progress` an optional callable receiving phase names and
+    "warning: ..." notes; the warnings are also listed in solution["warnings"].
+    `objective` is "weighted" for a single solve of the weighted objective or
+    "lexicographic" to solve `tiers` in order with `solve_lexicographic`.
+    `method` "relax-and-fix" solves `window` days (or environments, see
+    `decompose`) at a time and then runs `improve_passes` fix-and-optimize
+    passes over the same windows (see matheuristics.py); the windows get at
+    most half of `time_limit`, the rest goes to improving their schedule,
+    or to the full MIP if they found none.
+    `method` "draft" only rounds the LP relaxation (see draft_schedule.py),
+    in a few seconds and without building the full model. `mip_start` makes
+    the same draft first, renders it to `output_dir`/draft as a preview and
+    warm-starts the MIP from it. `method` "columns" solves by column
+    generation over weekly group patterns (see column_generation.py), which
+    never builds the slot-indexed model and suits long weeks; when it finds
+    no feasible schedule the full MIP gets the rest of `time_limit`.
+    `pool_teachers` models teachers with identical preferences as pools
+    and names them after the solve (see teacher_pools.py).
+    `alternatives` more schedules within `alternative_gap` of the objective
+    are then searched for with the same model in the last
+    ALTERNATIVES_SHARE of `time_limit` (see solution_pool.py); the best
+    verified schedule found becomes the answer, the others are rendered
+    with their KPIs to `output_dir`/alternatives/<n> and listed, best
+    first, in solution["alternatives"].
+    With a `checkpoint` path the MIP runs in segments of `checkpoint_every`
+    seconds and writes every better schedule there (see checkpoint.py);
+    `resume_from` warm-starts the MIP from such a checkpoint.
+    The timetables go to `output_dir` as PNG files, or bundled in one PDF
+    or zip file with `output_format` (see schedule_render.py).
+    Quality KPIs are written to `output_dir`/kpis (see schedule_kpis.py).
+    With `store_path` the schedule is also saved to that SQLite database
+    (see schedule_store.py) under `run_label`. CBC logs to `output_dir`/logs,
+    and with `history_path` a record of the run (settings, model size, CBC
+    statistics, timings) is appended to that file (see run_history.py); the
+    command line and the UI keep it in run_history.jsonl.
+    Returns the compact solution produced by `extract_solution`.
+    """
+    if objective not in ("weighted", "lexicographic"):
+        raise ValueError(f"Unknown objective mode: {objective!r}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown solve method: {method!r}")
+    if method != "mip" and objective != "weighted":
+        raise ValueError("The lexicographic objective needs method='mip'")
+    if mip_start and method != "mip":
+        raise ValueError("A MIP start needs method='mip'")
+    if pool_teachers and method not in ("mip", "relax-and-fix"):
+        raise ValueError("Teacher pools need the full model, method='mip' or 'relax-and-fix'")
+    if alternatives and method not in ("mip", "relax-and-fix"):
+        raise ValueError("Alternative schedules need the full model, method='mip' or 'relax-and-fix'")
+    if (checkpoint or resume_from) and (method != "mip" or objective != "weighted"):
+        raise ValueError("Checkpoints need method='mip' with the weighted objective")
+    if resume_from and mip_start:
+        raise ValueError("Resume from a checkpoint or from a draft, not both")
+    if output_format not in ("png", "pdf", "zip"):
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    if data is None:
+        data = load_inputs()
+    def report(phase):
+        if progress is not None:
+            progress(phase)
+
+    # warnings reach the console, the progress stream and solution["warnings"]
+    notes = []
+
+    def note(message):
+        print("Warning:", message)
+        notes.append(message)
+        report(f"warning: {message}")
+
+    # unavailable teachers can leave too few slots; CBC would only say "Infeasible"
+    for problem in capacity_problems(data):
+        note(problem)
+
+    run_start = time.perf_counter()
+    settings = {"method": method, "compactness": compactness, "objective": objective, "time_limit": time_limit,
+                "weights": objective_weights(weights), "mip_start": mip_start, "pool_teachers": pool_teachers,
+                "alternatives": alternatives, "alternative_gap": alternative_gap,
+                "checkpoint_every": checkpoint_every if checkpoint else None, "resumed": resume_from is not None,
+                "window": window,
+                "decompose": decompose, "improve_passes": improve_passes}
+    timings = {}
+    solver_log = SolverLog(_solver, os.path.join(output_dir, "logs"))
+    draft = None
+    columns = None
+    if method == "draft" or mip_start:
+        from draft_schedule import draft_schedule
+
+        phase_start = time.perf_counter()
+        report("drafting")
+        draft = draft_schedule(data, time_limit=min(DRAFT_TIME, time_limit), weights=objective_weights(weights))
+        timings["draft"] = time.perf_counter() - phase_start
+        print("Draft:", draft["objective"], "with", draft["draft"]["unplaced"], "sessions unplaced")
+
+    solution = None
+    if method == "draft":
+        # the draft is already verified
+        solution = draft
+    elif method == "columns":
+        from column_generation import column_generation
+
+        phase_start = time.perf_counter()
+        columns = column_generation(data, time_limit, objective_weights(weights), progress=report)
+        timings["columns"] = time.perf_counter() - phase_start
+        print("Column generation:", columns["objective"], "after", columns["iterations"], "rounds")
+        if columns["unschedulable"]:
+            note("no weekly pattern fits the groups " + ", ".join(columns["unschedulable"]))
+        if columns["verification"]["feasible"]:
+            solution = columns
+            timings["solve"] = timings["columns"]
+        else:
+            # the patterns or their teachers did not fit, the full model decides
+            note("column generation found no feasible schedule, solving the full MIP")
+            time_limit = max(1, time_limit - timings["columns"])
+    if solution is None:
+        start = draft
+        if draft is not None:
+            render_schedules(data, draft, os.path.join(output_dir, "draft"), output_format)
+            time_limit = max(1, time_limit - (time.perf_counter() - phase_start))
+        if resume_from is not None:
+            from checkpoint import load_checkpoint
+
+            start = load_checkpoint(resume_from, input_hash(data))
+            print("Resuming from", resume_from, "at", start["objective"])
+            report(f"resuming from {resume_from}")
+        checkpointing = None if checkpoint is None else (checkpoint, checkpoint_every, input_hash(data))
+        solution = _solve(data, time_limit, report, timings, compactness, weights, objective, tiers,
+                          "mip" if method == "columns" else method, window, decompose, improve_passes, start,
+                          solver_log, pool_teachers, alternatives, alternative_gap, checkpointing, note)
+
+    if solution["verification"]["feasible"]:
+        _publish(data, solution, output_dir, output_format, store_path, run_label, report, timings)
+    else:
+        # a broken timetable is not rendered or stored, only recorded in the run history
+        note("no feasible schedule found, it breaks " + ", ".join(solution["verification"]["violations"])
+             + "; nothing rendered or stored")
+    solution["timings"] = timings
+    solution["warnings"] = notes
+
+    solves = solver_log.statistics()
+    summary = summarize_solves(solves, solver_log.start - run_start)
+    # schedules that do not come from CBC count as incumbents as well
+    found = [summary["first_incumbent"]] if summary["first_incumbent"] is not None else []
+    if draft is not None and draft["verification"]["feasible"]:
+        found.append(timings["draft"])
+    if columns is not None and columns["verification"]["feasible"]:
+        found.append(timings["columns"])
+    summary["first_incumbent"] = min(found, default=None)
+    solution["solver"] = dict(summary, solves=solves)
+    if history_path is not None:
+        append_record(history_path, {
+            "created_at": time.time(),
+            "label": run_label,
+            "input_hash": input_hash(data),
+            "instance": {"days": data["days"], "periods": data["periods"],
+                         "classes": sum(len(data["classes"][g]) for e in data["environments"]
+                                        for g in data["groups"][e]),
+                         "doctors": len(data["T"]), "assistants": len(data["A"])},
+            "settings": settings,
+            "model_size": solution.get("model_size"),
+            "status": solution["status"],
+            "objective": solution["objective"],
+            "feasible": solution["verification"]["feasible"],
+            **{k: v for k, v in solution["solver"].items() if k != "solves"},
+            "timings": timings,
+            "solves": solves,
+        })
+
+    return solution
+
+def _publish(data, solution, output_dir, output_format, store_path, run_label, report, timings):
+    """Assign rooms to a verified schedule and its alternatives, store and render them."""
+    if 'rooms' in data:
+        from room_assignment import assign_rooms
+
+        phase_start = time.perf_counter()
+        report("assigning rooms")
+        solution["rooms"] = assign_rooms(data, solution)
+        for alternative in solution.get("alternatives", []):
+            alternative["rooms"] = assign_rooms(data, alternative)
+        timings["rooms"] = time.perf_counter() - phase_start
+
+    if store_path is not None:
+        from schedule_store import ScheduleStore
+
+        phase_start = time.perf_counter()
+        report("storing")
+        store = ScheduleStore(store_path)
+        solution["run_id"] = store.save_run(data, solution, label=run_label, input_hash=input_hash(data))
+        for n, alternative in enumerate(solution.get("alternatives", []), 1):
+            alternative["run_id"] = store.save_run(data, alternative, label=f"{run_label or 'run'} alternative {n}",
+                                                   input_hash=input_hash(data))
+        store.close()
+        timings["store"] = time.perf_counter() - phase_start
+
+    from schedule_kpis import compute_kpis, write_kpis
+
+    phase_start = time.perf_counter()
+    report("rendering")
+    render_schedules(data, solution, output_dir, output_format)
+    kpis = compute_kpis(data, solution)
+    write_kpis(kpis, os.path.join(output_dir, "kpis"))
+    solution["kpis"] = kpis["summary"]
+    for n, alternative in enumerate(solution.get("alternatives", []), 1):
+        alternative_dir = os.path.join(output_dir, "alternatives", str(n))
+        render_schedules(data, alternative, alternative_dir, output_format)
+        kpis = compute_kpis(data, alternative)
+        write_kpis(kpis, os.path.join(alternative_dir, "kpis"))
+        alternative["kpis"] = kpis["summary"]
+        print(f"Alternative {n}: {alternative['objective']} with {alternative['changes']} sessions moved")
+    timings["render"] = time.perf_counter() - phase_start
+
+def _solve(data, time_limit, report, timings, compactness, weights, objective, tiers,
+           method, window, decompose, improve_passes, start, solver, pool_teachers=False,
+           alternatives=0, alternative_gap=0.05, checkpointing=None, note=print):
+    """Build and solve the full model; returns its verified compact solution.
+
+    With `pool_teachers` the pooled model is solved instead, and solved
+    again without pools, for the rest of `time_limit`, if its schedule can
+    not be split among the teachers.
+    `alternatives` more verified schedules go to solution["alternatives"].
+    `checkpointing` is (path, seconds, input hash) for solve_with_checkpoints.
+    `note` receives the warnings meant for the caller.
+    """
+    from schedule_verifier import verify_schedule
+
+    solve_start = phase_start = time.perf_counter()
+    report("building")
+    pools = None
+    if pool_teachers:
+        from teacher_pools import find_pools
+
+        pools = find_pools(data)
+        print(f"Teacher pools: {len(data['A'])} assistants in {len(pools['A'])}, "
+              f"{len(data['T'])} doctors in {len(pools['T'])}")
+    tm = build_model(data, compactness=compactness, weights=weights, pools=pools)
+    model = tm.model
+    if start is not None:
+        tm.set_start(start)
+    timings["build"] = time.perf_counter() - phase_start
+
     # === Solve ===
-    # model.solve(pulp.PULP_CBC_CMD(msg=1))
-    model.solve(pulp.PULP_CBC_CMD(msg=True, timeLimit=120))  # Limit to 30 seconds
+    phase_start = time.perf_counter()
+    report("solving")
+    # the rest of the time limit goes to the alternatives
+    solve_limit = (1 - ALTERNATIVES_SHARE) * time_limit if alternatives else time_limit
+    tier_results = None
+    window_results = None
+    checkpoints = None
+    if objective == "lexicographic":
+        tier_results = solve_lexicographic(tm, tiers, solve_limit, warm_start=start is not None, solver=solver)
+    elif method == "relax-and-fix":
+        from matheuristics import relax_and_fix, fix_and_optimize
+
+        deadline = time.perf_counter() + solve_limit
+        window_results = relax_and_fix(tm, solver, solve_limit, window, decompose)
+        if deadline - time.perf_counter() >= 1:
+            window_results += fix_and_optimize(tm, solver, deadline - time.perf_counter(),
+                                               window, decompose, improve_passes)
+    elif checkpointing is not None:
+        from checkpoint import solve_with_checkpoints
+
+        path, every, digest = checkpointing
+        checkpoints = solve_with_checkpoints(tm, solver, solve_limit, path, digest, every, warm_start=start is not None)
+    else:
+        model.solve(solver(solve_limit, warmStart=start is not None))
+    timings["solve"] = time.perf_counter() - phase_start
 
     # === Results ===
     print("Status:", pulp.LpStatus[model.status])
-
-    ##################################################################
-
-    def draw_schedule(group, class_name, environment, path):
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.set_axis_off()
-
-        # Table setup
-        cell_text = []
-        cell_colors = []
-
-        for d in DAYS:
-            row_text = []
-            row_colors = []
-
-            for p in PERIODS:
-                lecture_found = False
-                section_found = False
-                subjects_str = ""
-                
-                for s in subjects[environment]:
-                    val_lecture = pulp.value(Y[environment, group, class_name, s, d, p])
-                    val_section = pulp.value(X[environment, group, class_name, s, d, p])
-
-                    if val_lecture and val_lecture > 0.5:
-                        lecture_found = True
-                        for t in T:
-                            if pulp.value(I[t,environment, group, class_name, s, d, p]):
-                                # print(f'{group}{class_name} {d} {p} Lec:{s}: {t}')
-                                subjects_str += f"Lec:{s}: {t}"
-
-                    if val_section and val_section > 0.5:
-                        section_found = True
-                        for a in A:
-                            if pulp.value(J[a,environment, group, class_name, s, d, p]):
-                                subjects_str += f"Sec:{s}: {a}"
-
-
-                row_text.append(subjects_str.strip())
-
-                if lecture_found:
-                    row_colors.append("lightblue")
-                elif section_found:
-                    row_colors.append("lightgreen")
-                else:
-                    row_colors.append("whitesmoke")
-
-            cell_text.append(row_text)
-            cell_colors.append(row_colors)
-
-        # Create the table
-        table = ax.table(cellText=cell_text,
-                        cellColours=cell_colors,
-                        colLabels=[f"P{p}" for p in PERIODS],
-                        rowLabels=[f"Day {d}" for d in DAYS],
-                        cellLoc='center',
-                        loc='center')
-
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.scale(1.2, 1.2)
-
-        plt.title(f"Schedule for {group} - {class_name}", fontsize=14)
-        plt.tight_layout()
-        img_path = os.path.join(path, f"{group}_{class_name}_{environment}.png")
-        plt.savefig(img_path)
-        plt.close(fig)  
-
-    def Teacher_schedule(a, subj_list, path):
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.set_axis_off()
-
-        # Table setup
-        cell_text = []
-        cell_colors = []
-
-        for d in DAYS:
-            row_text = []
-            row_colors = []
-
-            for p in PERIODS:
-                subjects_str = ""
-                section_found = False
-                
-                for s in subj_list:
-                    for e in environments:
-                        for g in groups[e]: 
-                            for c in classes[g]:
-                                val_assistant = pulp.value(J[a, e, g, c, s, d, p])
-
-                                if val_assistant and val_assistant > 0.5:
-                                    subjects_str += f"sec:{c} - {s}"
-                                    section_found = True
-
-
-                row_text.append(subjects_str.strip())
-
-                if section_found:
-                    row_colors.append("lightgreen")
-                else:
-                    row_colors.append("whitesmoke")
-
-            cell_text.append(row_text)
-            cell_colors.append(row_colors)
-
-        # Create the table
-        table = ax.table(cellText=cell_text,
-                        cellColours=cell_colors,
-                        colLabels=[f"P{p}" for p in PERIODS],
-                        rowLabels=[f"Day {d}" for d in DAYS],
-                        cellLoc='center',
-                        loc='center',)
-
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.scale(1.2, 1.2)
-
-        plt.title(f"Schedule for {a}", fontsize=14)
-        plt.tight_layout()
-        img_path = os.path.join(path, f"{a}.png")
-        plt.savefig(img_path)
-        plt.close(fig)  
-
-    def Doctor_schedule(t, subj_list, path):
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.set_axis_off()
-
-        # Table setup
-        cell_text = []
-        cell_colors = []
-
-        for d in DAYS:
-            row_text = []
-            row_colors = []
-
-            for p in PERIODS:
-                subjects_str = ""
-                lecture_found = False
-                
-                for s in subj_list:
-                    for e in environments:
-                        for g in groups[e]: 
-                            val_doctor = pulp.value(I[t, e, g, classes[g][0], s, d, p])
-
-                            if val_doctor and val_doctor > 0.5:
-                                subjects_str += f"group:{g} - {s}"
-                                lecture_found = True
-
-
-                row_text.append(subjects_str.strip())
-
-                if lecture_found:
-                    row_colors.append("lightblue")
-                else:
-                    row_colors.append("whitesmoke")
-
-            cell_text.append(row_text)
-            cell_colors.append(row_colors)
-
-        # Create the table
-        table = ax.table(cellText=cell_text,
-                        cellColours=cell_colors,
-                        colLabels=[f"P{p}" for p in PERIODS],
-                        rowLabels=[f"Day {d}" for d in DAYS],
-                        cellLoc='center',
-                        loc='center')
-
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.scale(1.2, 1.2)
-
-        plt.title(f"Schedule for {t}", fontsize=14)
-        plt.tight_layout()
-        img_path = os.path.join(path, f"{t}.png")
-        plt.savefig(img_path)
-        plt.close(fig)  
-
-    # print schedule for year1 groups
-    os.makedirs("schedule", exist_ok=True)
-
-    gaps = 0
-    days = 0
-    for e in environments:
-        env_dir = os.path.join("schedule", e)
-        os.makedirs(env_dir, exist_ok=True)  # Create subfolder for environment
-
-        for g in groups[e]:
-            group_dir = os.path.join(env_dir, g)
-            os.makedirs(group_dir, exist_ok=True)  # Create subfolder for group
-
-            for c in classes[g]:
-                draw_schedule(g, c, e, group_dir)
-
-                for d in DAYS:
-                    gaps +=  pulp.value(GAP[e,g,c,d])
-                    days += pulp.value(BD[e,g,c,d])
-
-    assist_dir = os.path.join("schedule", 'assistants')
-    for a in A:
-        os.makedirs(assist_dir, exist_ok=True)  # Create subfolder for environment
-        Teacher_schedule(a, subj_list, assist_dir)
-
-    doc_dir = os.path.join("schedule", 'doctors')
-    for t in T:
-        os.makedirs(doc_dir, exist_ok=True)  # Create subfolder for environment
-        Doctor_schedule(t, subj_list, doc_dir)
+    if solver.solves:
+        print("CBC log:", solver.solves[-1]["log"])
+
+    found = model.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+    if found:
+        solution = extract_solution(tm.index, tm.Y, tm.X, tm.I, tm.J)
+    else:
+        # no incumbent: the values left behind are an LP point or a fallback's leftovers
+        solution = {"lectures": [], "sections": []}
+    if pools is not None and solution["lectures"]:
+        from teacher_pools import disaggregate
+
+        phase_start = time.perf_counter()
+        report("naming pooled teachers")
+        named = disaggregate(tm, solution)
+        timings["disaggregate"] = time.perf_counter() - phase_start
+        if named is None:
+            note("the pooled schedule can not be split among the teachers, solving without pools")
+            timings["pooled"] = time.perf_counter() - solve_start
+            return _solve(data, max(1, time_limit - timings["pooled"]), report, timings, compactness, weights, objective, tiers,
+                          method, window, decompose, improve_passes, start, solver,
+                          alternatives=alternatives, alternative_gap=alternative_gap, checkpointing=checkpointing,
+                          note=note)
+        solution = named
+    solution["status"] = pulp.LpStatus[model.status]
+    solution["objective"] = pulp.value(model.objective) if found else None
+    solution["gaps"] = sum(pulp.value(v) or 0 for v in tm.GAP.values())
+    solution["days"] = sum(pulp.value(v) or 0 for v in tm.BD.values())
+    solution["components"] = {k: pulp.value(tm.objectives[k]) for k in OBJECTIVES}
+    solution["model_size"] = {"variables": model.numVariables(), "constraints": model.numConstraints(),
+                              "nonzeros": sum(len(c) for c in model.constraints.values())}
+    if tier_results is not None:
+        solution["tiers"] = tier_results
+    if window_results is not None:
+        solution["windows"] = window_results
+    if checkpoints is not None:
+        solution["checkpoints"] = checkpoints
+    if start is not None and "draft" in start:
+        solution["draft"] = dict(start["draft"], objective=start["objective"])
+
+    # CBC's status is not reliable when the time limit stops the run
+    phase_start = time.perf_counter()
+    solution["verification"] = verify_schedule(data, solution, tm.weights)
+    timings["verify"] = time.perf_counter() - phase_start
+
+    if alternatives and solution["lectures"]:
+        from solution_pool import solution_pool
+
+        phase_start = time.perf_counter()
+        report("searching alternatives")
+        found = []
+        for alternative in solution_pool(tm, solver, alternatives, max(1, solve_start + time_limit - phase_start),
+                                         alternative_gap):
+            alternative["verification"] = verify_schedule(data, alternative, tm.weights)
+            # a broken alternative is neither offered nor rendered
+            if alternative["verification"]["feasible"]:
+                found.append(alternative)
+        found.sort(key=lambda alternative: alternative["objective"])
+        if found and (not solution["verification"]["feasible"]
+                      or found[0]["objective"] < solution["objective"] - 1e-6):
+            # the main solve stopped on the time limit and the pool did better
+            print("An alternative beats the schedule found, it becomes the answer")
+            report("promoting an alternative")
+            best = found.pop(0)
+            previous = {key: solution[key] for key in _SCHEDULE_KEYS}
+            solution.update({key: best[key] for key in _SCHEDULE_KEYS})
+            solution["gaps"] = best["components"]["gaps"]
+            solution["days"] = best["components"]["days"]
+            if previous["verification"]["feasible"]:
+                found.append(previous)
+            limit = solution["objective"] + alternative_gap * abs(solution["objective"])
+            found = sorted((a for a in found if a["objective"] <= limit + 1e-6), key=lambda a: a["objective"])
+        placed = _placements(solution)
+        for alternative in found:
+            alternative["changes"] = len(placed - _placements(alternative))
+        solution["alternatives"] = found
+        timings["alternatives"] = time.perf_counter() - phase_start
+    return solution
+
+# what tells a schedule of the same model from another
+_SCHEDULE_KEYS = ("lectures", "sections", "status", "objective", "components", "verification")
+
+def _placements(solution):
+    """{(kind, env, group, class, subject, day, period)} of a compact solution, teachers left out."""
+    return ({("lecture", *r[:6]) for r in solution["lectures"]}
+            | {("section", *r[:6]) for r in solution["sections"]})
+
+##################################################################
+
+def extract_solution(index, Y, X, I, J):
+    """Read the solved variables into a compact, picklable solution.
+
+    Ids are translated back to names here: lectures are stored per class as
+    [env, group, class, subject, day, period, doctor] and sections as
+    [env, group, class, subject, day, period, assistant].
+    """
+    lectures = []
+    sections = []
+    for (e,g,c,s,d,p), var in Y.items():
+        if (pulp.value(var) or 0) > 0.5:
+            for t in range(len(index.doctors)):
+                # a teacher has no variable in a slot they are unavailable in
+                if (pulp.value(I.get((t,e,g,c,s,d,p), 0)) or 0) > 0.5:
+                    lectures.append([index.environments[e], index.groups[g], index.classes[c],
+                                     index.subjects[s], d, p, index.doctors[t]])
+
+    for (e,g,c,s,d,p), var in X.items():
+        if (pulp.value(var) or 0) > 0.5:
+            for a in range(len(index.assistants)):
+                if (pulp.value(J.get((a,e,g,c,s,d,p), 0)) or 0) > 0.5:
+                    sections.append([index.environments[e], index.groups[g], index.classes[c],
+                                     index.subjects[s], d, p, index.assistants[a]])
+
+    return {"lectures": lectures, "sections": sections}
+
+def render_schedules(data, solution, output_dir="schedule", output_format="png"):
+    """Draw every class, assistant and doctor timetable, see schedule_render.py."""
+    # matplotlib is only imported by the first schedule drawn
+    from schedule_render import render_schedules
+
+    return render_schedules(data, solution, output_dir, output_format)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Solve the college timetable without the UI.")
+    parser.add_argument("--inputs", default="scheduling_inputs01.json", help="inputs JSON file")
+    parser.add_argument("--time-limit", type=int, default=120, help="solver time limit in seconds")
+    parser.add_argument("--output", default="schedule", help="folder for the rendered schedules")
+    parser.add_argument("--output-format", choices=["png", "pdf", "zip"], default="png",
+                        help="one PNG per timetable, or all of them in OUTPUT/schedules.pdf or .zip")
+    parser.add_argument("--compactness", choices=["bigm", "tight"], default="bigm",
+                        help="formulation of the student day gaps")
+    parser.add_argument("--weight", action="append", default=[], metavar="NAME=VALUE",
+                        help=f"objective weight, NAME one of {', '.join(OBJECTIVES)} (repeatable)")
+    parser.add_argument("--lexicographic", action="store_true",
+                        help="solve the objective tiers in order instead of one weighted solve")
+    parser.add_argument("--method", choices=METHODS, default="mip",
+                        help="one full MIP solve, relax-and-fix followed by fix-and-optimize, "
+                             "only a rounded LP draft, or column generation over weekly patterns")
+    parser.add_argument("--window", type=int, default=2, help="days (or environments) per relax-and-fix window")
+    parser.add_argument("--decompose", choices=["days", "environments"], default="days",
+                        help="what the relax-and-fix windows are made of")
+    parser.add_argument("--improve-passes", type=int, default=1, help="fix-and-optimize passes over the windows")
+    parser.add_argument("--mip-start", action="store_true",
+                        help="warm-start the MIP from a rounded LP draft, rendered to OUTPUT/draft")
+    parser.add_argument("--pool-teachers", action="store_true",
+                        help="model teachers with identical preferences as pools, named after the solve")
+    parser.add_argument("--alternatives", type=int, default=0,
+                        help="also find this many different schedules near the best one, see solution_pool.py")
+    parser.add_argument("--alternative-gap", type=float, default=0.05,
+                        help="relative objective tolerance of the alternative schedules")
+    parser.add_argument("--checkpoint", help="write every better schedule of the MIP to this JSON file")
+    parser.add_argument("--checkpoint-every", type=int, default=300,
+                        help="seconds of CBC between checkpoints, each restarts the search")
+    parser.add_argument("--resume", help="warm-start the MIP from this checkpoint file")
+    parser.add_argument("--store", help="SQLite database the schedule is saved to")
+    parser.add_argument("--label", help="label of the run in the database, e.g. the term")
+    parser.add_argument("--history", default="run_history.jsonl",
+                        help="file the run record is appended to (see run_history.py)")
+    args = parser.parse_args()
+
+    weights = {}
+    for item in args.weight:
+        name, _, value = item.partition("=")
+        weights[name] = float(value)
+
+    solution = scheduelModel(load_inputs(args.inputs), time_limit=args.time_limit,
+                             output_dir=args.output, compactness=args.compactness, weights=weights,
+                             objective="lexicographic" if args.lexicographic else "weighted",
+                             store_path=args.store, run_label=args.label, method=args.method, window=args.window,
+                             decompose=args.decompose, improve_passes=args.improve_passes, mip_start=args.mip_start,
+                             pool_teachers=args.pool_teachers, alternatives=args.alternatives,
+                             alternative_gap=args.alternative_gap, checkpoint=args.checkpoint,
+                             checkpoint_every=args.checkpoint_every, resume_from=args.resume,
+                             output_format=args.output_format, history_path=args.history)
+    if not solution["verification"]["feasible"]:
+        raise SystemExit(1)
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class ScheduleArrays:
+    """A compact solution and its inputs as NumPy arrays.
+
+    Every class of every group is a "unit" u (an (env, group, class) triple in
+    input order). Lectures and sections become int arrays with one entry per
+    solution row, so rule checks and statistics are bincounts and uniques
+    over whole columns instead of Python loops over cells:
+
+        lec_unit, lec_group, lec_subject, lec_day, lec_period, lec_teacher
+        sec_unit, sec_group, sec_subject, sec_day, sec_period, sec_teacher
+
+    Days and periods are 0-based. `busy[u, d, p]` counts the sessions of a
+    unit in a slot and `required[u, s]` marks the subjects of its environment.
+    """
+    def __init__(self, data, solution):
+        self.D = data['days']
+        self.P = data['periods']
+        self.environments = list(data['environments'])
+        self.groups = list(dict.fromkeys(g for e in self.environments for g in data['groups'][e]))
+        self.subjects = sorted({s for e in self.environments for s in data['subjects'][e]})
+        self.assistants = list(data['A'])
+        self.doctors = list(data['T'])
+        self.units = [(e, g, c) for e in self.environments for g in data['groups'][e] for c in data['classes'][g]]
+
+        group_id = {g: i for i, g in enumerate(self.groups)}
+        subject_id = {s: i for i, s in enumerate(self.subjects)}
+        unit_id = {u: i for i, u in enumerate(self.units)}
+        env_id = {e: i for i, e in enumerate(self.environments)}
+
+        self.unit_env = np.array([env_id[e] for e, g, c in self.units], dtype=np.int32)
+        self.unit_group = np.array([group_id[g] for e, g, c in self.units], dtype=np.int32)
+        self.group_size = np.array([len(data['classes'][g]) for g in self.groups], dtype=np.int32)
+
+        self.required = np.zeros((len(self.units), len(self.subjects)), dtype=bool)
+        for u, (e, g, c) in enumerate(self.units):
+            self.required[u, [subject_id[s] for s in data['subjects'][e]]] = True
+
+        self.unknown = []   # rows naming entities that are not in the inputs
+        self.lec_unit, self.lec_group, self.lec_subject, self.lec_day, self.lec_period, self.lec_teacher = \
+            self._rows(solution['lectures'], unit_id, group_id, subject_id, {t: i for i, t in enumerate(self.doctors)})
+        self.sec_unit, self.sec_group, self.sec_subject, self.sec_day, self.sec_period, self.sec_teacher = \
+            self._rows(solution['sections'], unit_id, group_id, subject_id, {a: i for i, a in enumerate(self.assistants)})
+
+        self.busy = np.zeros((len(self.units), self.D, self.P), dtype=np.int32)
+        np.add.at(self.busy, (self.lec_unit, self.lec_day, self.lec_period), 1)
+        np.add.at(self.busy, (self.sec_unit, self.sec_day, self.sec_period), 1)
+
+    def _rows(self, rows, unit_id, group_id, subject_id, teacher_id):
+        columns = [[] for _ in range(6)]
+        for row in rows:
+            e, g, c, s, d, p, teacher = row
+            if (e, g, c) not in unit_id or s not in subject_id or teacher not in teacher_id \
+                    or not (1 <= d <= self.D and 1 <= p <= self.P):
+                self.unknown.append(row)
+                continue
+            for column, value in zip(columns, (unit_id[e, g, c], group_id[g], subject_id[s], d - 1, p - 1, teacher_id[teacher])):
+                column.append(value)
+        return [np.array(column, dtype=np.int32) for column in columns]
+
+    def time_matrix(self, prefs, teachers):
+        """Stack {teacher: {"d": {"p": v}}} into an array indexed [teacher, d, p]."""
+        return np.array(
+            [[[prefs[t][str(d)][str(p)] for p in range(1, self.P + 1)] for d in range(1, self.D + 1)] for t in teachers],
+            dtype=np.int32,
+        ).reshape(len(teachers), self.D, self.P)
+
+    def subject_matrix(self, prefs, teachers):
+        """Stack {teacher: {subject: v}} into an array indexed [teacher, subject]."""
+        return np.array(
+            [[prefs[t].get(s, 0) for s in self.subjects] for t in teachers], dtype=np.int32
+        ).reshape(len(teachers), len(self.subjects))
+
+    def lecture_events(self):
+        """One entry per group lecture (not per class): arrays group, subject, day, period, teacher."""
+        key = np.stack([self.lec_group, self.lec_subject, self.lec_day, self.lec_period, self.lec_teacher], axis=1)
+        if len(key) == 0:
+            return [np.zeros(0, dtype=np.int32) for _ in range(5)]
+        unique = np.unique(key, axis=0)
+        return [unique[:, k] for k in range(5)]
+
+    def day_statistics(self):
+        """Per unit and day: load, busy flag, deviation from the mean load and idle gap periods."""
+        occupied = self.busy > 0
+        load = occupied.sum(axis=2)
+        busy_day = load > 0
+        half = -(-self.P // 2)   # ceil(P / 2), as in the model
+        deviation = np.where(busy_day, np.abs(load - half), 0)
+        first = occupied.argmax(axis=2)
+        last = self.P - 1 - occupied[:, :, ::-1].argmax(axis=2)
+        gap = np.where(busy_day, last - first + 1 - load, 0)
+        return load, busy_day, deviation, gap
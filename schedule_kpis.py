@@ -0,0 +1,163 @@
+"""Quality figures of a solved schedule for dashboards.
+
+Computed in one pass over the ScheduleArrays of a compact solution and
+written as kpis.json plus one CSV per level (classes, groups,
+environments, teachers, slots):
+
+    python schedule_kpis.py inputs.json solution.json --output kpis
+"""
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+from preference_table import UNAVAILABLE
+from schedule_arrays import ScheduleArrays
+
+LEVELS = ("classes", "groups", "environments", "teachers", "slots")
+
+
+def _rate(hits, total):
+    return np.divide(hits, total, out=np.zeros(len(total)), where=total > 0).round(4)
+
+
+def _sums(keys, values, size):
+    """Sum the rows of `values` ({column: per-unit array}) per key."""
+    return {k: np.bincount(keys, weights=v, minlength=size).astype(np.int64) for k, v in values.items()}
+
+
+def _records(names, columns):
+    """Turn {column: array} into one dict per name."""
+    return [
+        dict(names[i], **{k: v[i].item() for k, v in columns.items()})
+        for i in range(len(names))
+    ]
+
+
+def compute_kpis(data, solution):
+    """Per class, group, environment, teacher and slot statistics of `solution`.
+
+    Returns {"summary": {...}, level: [row dicts]} for every level in LEVELS.
+    """
+    arrays = ScheduleArrays(data, solution)
+    D, P = arrays.D, arrays.P
+    n_units = len(arrays.units)
+    AL, TL = data['AL'], data['TL']
+    if 'rooms' in data:
+        HALLS = len(data['rooms'].get('halls', []))
+        LABS = len(data['rooms'].get('labs', []))
+    else:
+        HALLS, LABS = data['halls'], data['labs']
+
+    # === Classes ===
+    load, busy_day, deviation, gap = arrays.day_statistics()
+    per_unit = {
+        "periods": load.sum(axis=1),
+        "lectures": np.bincount(arrays.lec_unit, minlength=n_units),
+        "sections": np.bincount(arrays.sec_unit, minlength=n_units),
+        "days": busy_day.sum(axis=1),
+        "gaps": gap.sum(axis=1),
+        "deviation": deviation.sum(axis=1),
+    }
+    classes = _records([{"environment": e, "group": g, "class": c} for e, g, c in arrays.units], per_unit)
+    for row, days in zip(classes, per_unit["days"]):
+        row["average_daily_load"] = round(row["periods"] / days, 2) if days else 0
+
+    groups = _records([{"group": g} for g in arrays.groups],
+                      _sums(arrays.unit_group, per_unit, len(arrays.groups)))
+    environments = _records([{"environment": e} for e in arrays.environments],
+                            _sums(arrays.unit_env, per_unit, len(arrays.environments)))
+
+    # === Teachers ===
+    ev_group, ev_subject, ev_day, ev_period, ev_teacher = arrays.lecture_events()
+    AT = arrays.time_matrix(data['AT'], arrays.assistants)
+    TT = arrays.time_matrix(data['TT'], arrays.doctors)
+    AS = arrays.subject_matrix(data['AS'], arrays.assistants)
+    TS = arrays.subject_matrix(data['TS'], arrays.doctors)
+
+    def teacher_rows(role, names, teacher, subject, day, period, time_prefs, subject_prefs, limits):
+        n = len(names)
+        taught = np.zeros((n, len(arrays.subjects)), dtype=bool)
+        taught[teacher, subject] = True
+        days = np.zeros((n, D), dtype=bool)
+        days[teacher, day] = True
+        periods = np.bincount(teacher, minlength=n)
+        preferred_periods = np.bincount(teacher, weights=time_prefs[teacher, day, period] > 0, minlength=n)
+        subjects = taught.sum(axis=1)
+        preferred_subjects = (taught & (subject_prefs > 0)).sum(axis=1)
+        return _records([{"teacher": t, "role": role} for t in names], {
+            "periods": periods,
+            "period_limit": np.full(n, limits[0]),
+            "period_usage": _rate(periods, np.full(n, limits[0])),
+            "subjects": subjects,
+            "subject_limit": np.full(n, limits[1]),
+            "days": days.sum(axis=1),
+            "available_slots": (time_prefs != UNAVAILABLE).sum(axis=(1, 2)),
+            "time_preference_rate": _rate(preferred_periods, periods),
+            "subject_preference_rate": _rate(preferred_subjects, subjects),
+        })
+
+    teachers = teacher_rows("doctor", arrays.doctors, ev_teacher, ev_subject, ev_day, ev_period, TT, TS, TL)
+    teachers += teacher_rows("assistant", arrays.assistants, arrays.sec_teacher, arrays.sec_subject,
+                             arrays.sec_day, arrays.sec_period, AT, AS, AL)
+
+    # === Slots ===
+    halls_used = np.bincount(ev_day * P + ev_period, minlength=D * P)
+    labs_used = np.bincount(arrays.sec_day * P + arrays.sec_period, minlength=D * P)
+    slots = _records([{"day": d, "period": p} for d in range(1, D + 1) for p in range(1, P + 1)], {
+        "halls_used": halls_used,
+        "halls": np.full(D * P, HALLS),
+        "hall_utilization": _rate(halls_used, np.full(D * P, HALLS)),
+        "labs_used": labs_used,
+        "labs": np.full(D * P, LABS),
+        "lab_utilization": _rate(labs_used, np.full(D * P, LABS)),
+    })
+
+    taught_periods = sum(t["periods"] for t in teachers)
+    summary = {
+        "status": solution.get("status"),
+        "objective": solution.get("objective"),
+        "run_id": solution.get("run_id"),
+        "days": int(busy_day.sum()),
+        "gaps": int(gap.sum()),
+        "deviation": int(deviation.sum()),
+        "time_preference_rate": round(
+            sum(t["time_preference_rate"] * t["periods"] for t in teachers) / taught_periods, 4
+        ) if taught_periods else 0,
+        "hall_utilization": round(int(halls_used.sum()) / (HALLS * D * P), 4) if HALLS else 0,
+        "lab_utilization": round(int(labs_used.sum()) / (LABS * D * P), 4) if LABS else 0,
+    }
+    return {"summary": summary, "classes": classes, "groups": groups,
+            "environments": environments, "teachers": teachers, "slots": slots}
+
+
+def write_kpis(kpis, output_dir):
+    """Write kpis.json and one <level>.csv per level into `output_dir`."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "kpis.json"), "w", encoding="utf-8") as f:
+        json.dump(kpis, f, indent=2, ensure_ascii=False)
+    for level in LEVELS:
+        rows = kpis[level]
+        if not rows:
+            continue
+        with open(os.path.join(output_dir, f"{level}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the quality KPIs of a solved schedule.")
+    parser.add_argument("inputs")
+    parser.add_argument("solution")
+    parser.add_argument("--output", default="kpis", help="folder for kpis.json and the CSV files")
+    args = parser.parse_args()
+
+    with open(args.inputs, encoding="utf-8") as f:
+        inputs = json.load(f)
+    with open(args.solution, encoding="utf-8") as f:
+        kpis = compute_kpis(inputs, json.load(f))
+    write_kpis(kpis, args.output)
+    print(json.dumps(kpis["summary"], indent=2))
@@ -0,0 +1,288 @@
+"""Timetables of a compact solution: one per class, assistant and doctor.
+
+Kept apart from scheduelModel.py because matplotlib is by far its slowest
+import; the model and the UI only load this module when they draw.
+
+The output format is one of FORMATS:
+
+png  one file per timetable under <output>/<env>/<group>/, assistants/ and doctors/
+pdf  a single <output>/schedules.pdf, index pages first, then one page per timetable
+zip  a single <output>/schedules.zip holding the same PNG paths and an index.csv
+
+The bundled formats avoid thousands of small files on slow (network)
+disks. Laying out and drawing a whole table figure is what costs, so
+every timetable is drawn on a TableTemplate: the figure of a days x
+periods table is built and its labels drawn once, and each PNG page
+restores those pixels and draws only its cells and title on top. Figures
+are drawn straight on the Agg canvas, pyplot and its interactive
+backends are never loaded.
+"""
+import csv
+import functools
+import io
+import math
+import os
+import zipfile
+
+from PIL import Image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+FORMATS = ("png", "pdf", "zip")
+
+# entries per index page of the PDF, in two columns
+_INDEX_ROWS = 30
+
+
+def _figure():
+    figure = Figure(figsize=(10, 5))
+    FigureCanvasAgg(figure)
+    return figure
+
+
+# color of an empty cell
+_EMPTY = "whitesmoke"
+
+
+class TableTemplate:
+    """A days x periods timetable figure, laid out once and refilled per page.
+
+    fill() puts a timetable in the figure for any savefig (the PDF pages);
+    png() draws it over the cached labels and encodes the pixels.
+    """
+    def __init__(self, days, periods):
+        self.figure = _figure()
+        ax = self.figure.add_subplot()
+        ax.set_axis_off()
+
+        # Create the table
+        table = ax.table(cellText=[[""] * periods for d in range(days)],
+                        cellColours=[[_EMPTY] * periods for d in range(days)],
+                        colLabels=[f"P{p}" for p in range(1, periods + 1)],
+                        rowLabels=[f"Day {d}" for d in range(1, days + 1)],
+                        cellLoc='center',
+                        loc='center')
+
+        table.auto_set_font_size(False)
+        table.set_fontsize(10)
+        table.scale(1.2, 1.2)
+
+        # the layout only depends on the table size, a title is there to make room for
+        self.title = ax.set_title("Schedule", fontsize=14)
+        self.figure.tight_layout()
+        # without this every savefig would lay the figure out and draw it twice
+        self.figure.set_layout_engine(None)
+        self.axes = ax
+        # row 0 holds the period labels
+        self.cells = [[table[d, p] for p in range(periods)] for d in range(1, days + 1)]
+
+        # the labels alone, the background of every PNG page
+        self.title.set_text("")
+        for row in self.cells:
+            for cell in row:
+                cell.set_visible(False)
+        self.figure.canvas.draw()
+        self.background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        for row in self.cells:
+            for cell in row:
+                cell.set_visible(True)
+
+    def fill(self, cell_text, cell_colors, title):
+        """Put one timetable in the figure and return the figure."""
+        for row, texts, colors in zip(self.cells, cell_text, cell_colors):
+            for cell, text, color in zip(row, texts, colors):
+                cell.get_text().set_text(text)
+                cell.set_facecolor(color)
+        self.title.set_text(title)
+        return self.figure
+
+    def png(self, cell_text, cell_colors, title):
+        """One timetable as PNG bytes, its cells drawn over the cached labels."""
+        canvas = self.figure.canvas
+        canvas.restore_region(self.background)
+        self.fill(cell_text, cell_colors, title)
+        # in the table's own order, so a long text is still covered by the next cell
+        for row in self.cells:
+            for cell in row:
+                self.axes.draw_artist(cell)
+        self.axes.draw_artist(self.title)
+        width, height = canvas.get_width_height()
+        image = io.BytesIO()
+        Image.frombuffer("RGBA", (width, height), canvas.buffer_rgba(), "raw", "RGBA", 0, 1).save(image, format="png")
+        return image.getvalue()
+
+
+@functools.lru_cache(maxsize=4)
+def table_template(days, periods):
+    """The shared TableTemplate of a layout size; the main, draft and alternative schedules reuse it.
+
+    Not thread safe: every solve renders in its own process.
+    """
+    return TableTemplate(days, periods)
+
+
+def _class_table(environment, group, class_name, cells, DAYS, PERIODS):
+    # Table setup
+    cell_text = []
+    cell_colors = []
+
+    for d in DAYS:
+        row_text = []
+        row_colors = []
+
+        for p in PERIODS:
+            lecture_found = False
+            section_found = False
+            subjects_str = ""
+
+            for kind, s, teacher, room in cells.get((environment, group, class_name, d, p), []):
+                if kind == "lecture":
+                    lecture_found = True
+                    subjects_str += f"Lec:{s}: {teacher}"
+                else:
+                    section_found = True
+                    subjects_str += f"Sec:{s}: {teacher}"
+                if room:
+                    subjects_str += f"\n{room}"
+
+            row_text.append(subjects_str.strip())
+
+            if lecture_found:
+                row_colors.append("lightblue")
+            elif section_found:
+                row_colors.append("lightgreen")
+            else:
+                row_colors.append("whitesmoke")
+
+        cell_text.append(row_text)
+        cell_colors.append(row_colors)
+    return cell_text, cell_colors
+
+
+def _teacher_table(teacher, cells, label, color, DAYS, PERIODS):
+    """Sessions of an assistant (label "sec") or a doctor (label "group")."""
+    cell_text = []
+    cell_colors = []
+
+    for d in DAYS:
+        row_text = []
+        row_colors = []
+
+        for p in PERIODS:
+            subjects_str = ""
+            found = False
+
+            for x, s in cells.get((teacher, d, p), []):
+                subjects_str += f"{label}:{x} - {s}"
+                found = True
+
+            row_text.append(subjects_str.strip())
+            row_colors.append(color if found else "whitesmoke")
+
+        cell_text.append(row_text)
+        cell_colors.append(row_colors)
+    return cell_text, cell_colors
+
+
+def _pages(data, solution):
+    """(entry, path, title, make) per timetable, in output order.
+
+    `entry` names it in the index, `path` is its PNG path relative to the
+    output folder and make() builds its (cell_text, cell_colors).
+    """
+    DAYS = list(range(1, data['days'] + 1))
+    PERIODS = list(range(1, data['periods'] + 1))
+    classes = data['classes']
+
+    # index the solution once instead of scanning every variable per cell
+    class_cells = {}
+    doctor_cells = {}
+    assistant_cells = {}
+    halls = {}
+    labs = {}
+    if "rooms" in solution:
+        halls = {(e, g, s, d, p): room for e, g, s, d, p, room in solution["rooms"]["lectures"]}
+        labs = {(e, g, c, s, d, p): room for e, g, c, s, d, p, room in solution["rooms"]["sections"]}
+
+    for e, g, c, s, d, p, t in solution["lectures"]:
+        class_cells.setdefault((e, g, c, d, p), []).append(("lecture", s, t, halls.get((e, g, s, d, p))))
+        if c == classes[g][0]:
+            doctor_cells.setdefault((t, d, p), []).append((g, s))
+    for e, g, c, s, d, p, a in solution["sections"]:
+        class_cells.setdefault((e, g, c, d, p), []).append(("section", s, a, labs.get((e, g, c, s, d, p))))
+        assistant_cells.setdefault((a, d, p), []).append((c, s))
+
+    pages = []
+    for e in data['environments']:
+        for g in data['groups'][e]:
+            for c in classes[g]:
+                pages.append((f"{e} / {g} / {c}", os.path.join(e, g, f"{g}_{c}_{e}.png"),
+                              f"Schedule for {g} - {c}",
+                              lambda e=e, g=g, c=c: _class_table(e, g, c, class_cells, DAYS, PERIODS)))
+    for a in data['A']:
+        pages.append((f"Assistant {a}", os.path.join("assistants", f"{a}.png"), f"Schedule for {a}",
+                      lambda a=a: _teacher_table(a, assistant_cells, "sec", "lightgreen", DAYS, PERIODS)))
+    for t in data['T']:
+        pages.append((f"Doctor {t}", os.path.join("doctors", f"{t}.png"), f"Schedule for {t}",
+                      lambda t=t: _teacher_table(t, doctor_cells, "group", "lightblue", DAYS, PERIODS)))
+    return pages
+
+
+def _draw_index(fig, entries, number, count):
+    """One index page: `entries` are (entry, page) pairs in two columns."""
+    fig.clear()
+    fig.text(0.5, 0.95, f"Index ({number}/{count})", ha="center", va="top", fontsize=14)
+    for i, (entry, page) in enumerate(entries):
+        x = 0.05 if i < _INDEX_ROWS else 0.53
+        y = 0.87 - (i % _INDEX_ROWS) * 0.8 / _INDEX_ROWS
+        fig.text(x, y, entry, fontsize=8, va="center")
+        fig.text(x + 0.42, y, str(page), fontsize=8, va="center", ha="right")
+
+
+def render_schedules(data, solution, output_dir="schedule", output_format="png"):
+    """Draw every class, assistant and doctor timetable of a compact solution.
+
+    `output_format` is one of FORMATS, see the module docstring. Returns the
+    path of the bundle, or `output_dir` for PNG files.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+    pages = _pages(data, solution)
+    template = table_template(data['days'], data['periods'])
+    os.makedirs(output_dir, exist_ok=True)
+    if output_format == "png":
+        for entry, path, title, make in pages:
+            full_path = os.path.join(output_dir, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "wb") as f:
+                f.write(template.png(*make(), title))
+        return output_dir
+
+    if output_format == "pdf":
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        bundle = os.path.join(output_dir, "schedules.pdf")
+        per_page = 2 * _INDEX_ROWS
+        index_pages = max(1, math.ceil(len(pages) / per_page))
+        entries = [(entry, index_pages + i + 1) for i, (entry, path, title, make) in enumerate(pages)]
+        index = _figure()
+        with PdfPages(bundle, metadata={"Title": "Schedules"}) as pdf:
+            for n in range(index_pages):
+                _draw_index(index, entries[n * per_page:(n + 1) * per_page], n + 1, index_pages)
+                pdf.savefig(index)
+            for entry, path, title, make in pages:
+                pdf.savefig(template.fill(*make(), title))
+        return bundle
+
+    bundle = os.path.join(output_dir, "schedules.zip")
+    index = io.StringIO()
+    writer = csv.writer(index)
+    writer.writerow(["entry", "file"])
+    # PNGs are compressed already
+    with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_STORED) as archive:
+        for entry, path, title, make in pages:
+            name = path.replace(os.sep, "/")
+            archive.writestr(name, template.png(*make(), title))
+            writer.writerow([entry, name])
+        archive.writestr("index.csv", index.getvalue())
+    return bundle
@@ -0,0 +1,253 @@
+"""SQLite store of solved schedules.
+
+Every run is saved as one row in `runs` plus one row per lecture/section in
+`sessions`, indexed on the slot, the teacher, the group/class and the
+subject so the usual planner questions are answered without re-solving:
+
+    python schedule_store.py schedules.db runs
+    python schedule_store.py schedules.db free-rooms --day 3 --period 2
+    python schedule_store.py schedules.db teacher "name" --day 2
+    python schedule_store.py schedules.db class g1 S1
+    python schedule_store.py schedules.db compare 4 7
+
+Queries default to the latest run when no --run is given.
+"""
+import argparse
+import json
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    label       TEXT,
+    created_at  REAL,
+    input_hash  TEXT,
+    status      TEXT,
+    objective   REAL,
+    halls       INTEGER,
+    labs        INTEGER
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    run_id   INTEGER NOT NULL REFERENCES runs(id),
+    day      INTEGER NOT NULL,
+    period   INTEGER NOT NULL,
+    kind     TEXT NOT NULL,          -- 'lecture' or 'section'
+    env      TEXT NOT NULL,
+    grp      TEXT NOT NULL,
+    cls      TEXT NOT NULL,
+    subject  TEXT NOT NULL,
+    teacher  TEXT NOT NULL,
+    room     TEXT
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    run_id  INTEGER NOT NULL REFERENCES runs(id),
+    kind    TEXT NOT NULL,           -- 'hall' or 'lab'
+    name    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_slot    ON sessions(run_id, day, period);
+CREATE INDEX IF NOT EXISTS sessions_teacher ON sessions(run_id, teacher, day);
+CREATE INDEX IF NOT EXISTS sessions_class   ON sessions(run_id, grp, cls);
+CREATE INDEX IF NOT EXISTS sessions_subject ON sessions(run_id, subject);
+CREATE INDEX IF NOT EXISTS rooms_run        ON rooms(run_id, kind);
+"""
+
+# columns identifying a session when two runs are compared
+_SESSION_KEY = "kind, env, grp, cls, subject, day, period, teacher"
+
+
+class ScheduleStore:
+    """A SQLite database of solved schedules, see the module docstring."""
+    def __init__(self, path="schedules.db"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def save_run(self, data, solution, label=None, input_hash=None):
+        """Insert a solved schedule in one transaction and return its run id."""
+        halls = {}
+        labs = {}
+        if "rooms" in solution:
+            halls = {(e, g, s, d, p): room for e, g, s, d, p, room in solution["rooms"]["lectures"]}
+            labs = {(e, g, c, s, d, p): room for e, g, c, s, d, p, room in solution["rooms"]["sections"]}
+
+        rows = [
+            (d, p, "lecture", e, g, c, s, t, halls.get((e, g, s, d, p)))
+            for e, g, c, s, d, p, t in solution["lectures"]
+        ]
+        rows.extend(
+            (d, p, "section", e, g, c, s, a, labs.get((e, g, c, s, d, p)))
+            for e, g, c, s, d, p, a in solution["sections"]
+        )
+
+        if "rooms" in data:
+            n_halls = len(data["rooms"].get("halls", []))
+            n_labs = len(data["rooms"].get("labs", []))
+        else:
+            n_halls, n_labs = data["halls"], data["labs"]
+
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (label, created_at, input_hash, status, objective, halls, labs) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (label, time.time(), input_hash, solution.get("status"), solution.get("objective"), n_halls, n_labs),
+            )
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO sessions (run_id, day, period, kind, env, grp, cls, subject, teacher, room) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in rows],
+            )
+            if "rooms" in data:
+                self.db.executemany(
+                    "INSERT INTO rooms (run_id, kind, name) VALUES (?, ?, ?)",
+                    [(run_id, "hall", r["name"]) for r in data["rooms"].get("halls", [])]
+                    + [(run_id, "lab", r["name"]) for r in data["rooms"].get("labs", [])],
+                )
+        return run_id
+
+    # ---------------------------------------
+
+    def runs(self):
+        return [dict(r) for r in self.db.execute("SELECT * FROM runs ORDER BY id")]
+
+    def latest_run(self, label=None):
+        """Id of the newest run (with the given label, if any), or None."""
+        if label is None:
+            row = self.db.execute("SELECT max(id) FROM runs").fetchone()
+        else:
+            row = self.db.execute("SELECT max(id) FROM runs WHERE label = ?", (label,)).fetchone()
+        return row[0]
+
+    def _run(self, run_id):
+        return self.latest_run() if run_id is None else run_id
+
+    def slot_sessions(self, day, period, run_id=None):
+        """Everything scheduled in one (day, period)."""
+        return [dict(r) for r in self.db.execute(
+            "SELECT * FROM sessions WHERE run_id = ? AND day = ? AND period = ? ORDER BY kind, grp, cls",
+            (self._run(run_id), day, period))]
+
+    def free_rooms(self, day, period, run_id=None):
+        """Rooms nobody uses in (day, period).
+
+        With concrete rooms this lists their names; otherwise it returns how
+        many of the halls and labs are still free.
+        """
+        run_id = self._run(run_id)
+        run = self.db.execute("SELECT halls, labs FROM runs WHERE id = ?", (run_id,)).fetchone()
+        names = self.db.execute(
+            "SELECT kind, name FROM rooms WHERE run_id = ? AND name NOT IN "
+            "(SELECT room FROM sessions WHERE run_id = ? AND day = ? AND period = ? AND room IS NOT NULL) "
+            "ORDER BY kind, name",
+            (run_id, run_id, day, period)).fetchall()
+        if names or self.db.execute("SELECT 1 FROM rooms WHERE run_id = ? LIMIT 1", (run_id,)).fetchone():
+            return {
+                "halls": [r["name"] for r in names if r["kind"] == "hall"],
+                "labs": [r["name"] for r in names if r["kind"] == "lab"],
+            }
+
+        # a lecture is one row per class but takes a single hall per group
+        used = self.db.execute(
+            "SELECT count(DISTINCT CASE WHEN kind = 'lecture' THEN grp || '/' || subject END), "
+            "       count(CASE WHEN kind = 'section' THEN 1 END) "
+            "FROM sessions WHERE run_id = ? AND day = ? AND period = ?",
+            (run_id, day, period)).fetchone()
+        return {"halls": run["halls"] - used[0], "labs": run["labs"] - used[1]}
+
+    def teacher_schedule(self, teacher, day=None, run_id=None):
+        """What a doctor or assistant teaches, optionally on one day only."""
+        sql = "SELECT * FROM sessions WHERE run_id = ? AND teacher = ?"
+        params = [self._run(run_id), teacher]
+        if day is not None:
+            sql += " AND day = ?"
+            params.append(day)
+        rows = self.db.execute(sql + " ORDER BY day, period", params)
+        # a doctor's lecture is stored once per class, report it once per group
+        seen = set()
+        result = []
+        for r in rows:
+            key = (r["kind"], r["grp"], r["subject"], r["day"], r["period"])
+            if r["kind"] == "section":
+                key += (r["cls"],)
+            if key not in seen:
+                seen.add(key)
+                result.append(dict(r))
+        return result
+
+    def class_schedule(self, group, class_name=None, run_id=None):
+        """The timetable of a group, or of one of its classes."""
+        sql = "SELECT * FROM sessions WHERE run_id = ? AND grp = ?"
+        params = [self._run(run_id), group]
+        if class_name is not None:
+            sql += " AND cls = ?"
+            params.append(class_name)
+        return [dict(r) for r in self.db.execute(sql + " ORDER BY day, period, cls", params)]
+
+    def subject_sessions(self, subject, run_id=None):
+        return [dict(r) for r in self.db.execute(
+            "SELECT * FROM sessions WHERE run_id = ? AND subject = ? ORDER BY day, period, grp, cls",
+            (self._run(run_id), subject))]
+
+    def solution(self, run_id=None):
+        """The lectures and sections of a run as the compact solution rows scheduelModel() returns."""
+        solution = {"lectures": [], "sections": []}
+        for r in self.db.execute(
+                "SELECT kind, env, grp, cls, subject, day, period, teacher FROM sessions "
+                "WHERE run_id = ? ORDER BY rowid", (self._run(run_id),)):
+            key = "lectures" if r["kind"] == "lecture" else "sections"
+            solution[key].append([r["env"], r["grp"], r["cls"], r["subject"], r["day"], r["period"], r["teacher"]])
+        return solution
+
+    def compare_runs(self, run_a, run_b):
+        """Sessions only in `run_a` ("removed") and only in `run_b` ("added")."""
+        def only_in(x, y):
+            return [dict(r) for r in self.db.execute(
+                f"SELECT {_SESSION_KEY} FROM sessions WHERE run_id = ? "
+                f"EXCEPT SELECT {_SESSION_KEY} FROM sessions WHERE run_id = ? ORDER BY day, period",
+                (x, y))]
+        return {"removed": only_in(run_a, run_b), "added": only_in(run_b, run_a)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the saved schedules.")
+    parser.add_argument("database")
+    parser.add_argument("--run", type=int, help="run id (default: the latest run)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs")
+    free = commands.add_parser("free-rooms")
+    free.add_argument("--day", type=int, required=True)
+    free.add_argument("--period", type=int, required=True)
+    teacher = commands.add_parser("teacher")
+    teacher.add_argument("name")
+    teacher.add_argument("--day", type=int)
+    group = commands.add_parser("class")
+    group.add_argument("group")
+    group.add_argument("class_name", nargs="?")
+    subject = commands.add_parser("subject")
+    subject.add_argument("name")
+    compare = commands.add_parser("compare")
+    compare.add_argument("run_a", type=int)
+    compare.add_argument("run_b", type=int)
+    args = parser.parse_args()
+
+    store = ScheduleStore(args.database)
+    if args.command == "runs":
+        result = store.runs()
+    elif args.command == "free-rooms":
+        result = store.free_rooms(args.day, args.period, args.run)
+    elif args.command == "teacher":
+        result = store.teacher_schedule(args.name, args.day, args.run)
+    elif args.command == "class":
+        result = store.class_schedule(args.group, args.class_name, args.run)
+    elif args.command == "subject":
+        result = store.subject_sessions(args.name, args.run)
+    else:
+        result = store.compare_runs(args.run_a, args.run_b)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
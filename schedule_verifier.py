@@ -0,0 +1,159 @@
+"""Independent check of a solved schedule against every rule of the model.
+
+CBC's status cannot be trusted when a time limit stops the run, so the
+compact solution is re-checked here from scratch with NumPy:
+
+    python schedule_verifier.py inputs.json solution.json
+"""
+import json
+import sys
+
+import numpy as np
+
+from preference_table import UNAVAILABLE
+from schedule_arrays import ScheduleArrays
+
+# examples kept per violated rule
+_EXAMPLES = 10
+
+
+def _count(keys, size):
+    return np.bincount(keys, minlength=size) if size else np.zeros(0, dtype=np.int64)
+
+
+def verify_schedule(data, solution, weights=None):
+    """Check `solution` against `data` and recompute its objective.
+
+    Returns {"feasible": bool, "violations": {rule: {"count": n, "examples": [...]}},
+             "components": {deviation, days, gaps, preferences}, "objective": float}.
+    `weights` defaults to the model's DEFAULT_WEIGHTS. Subject preferences
+    count only subjects a teacher actually teaches, so "preferences" can be
+    lower than the model's value when the solver set ADS/TDS without using them.
+    """
+    arrays = ScheduleArrays(data, solution)
+    D, P = arrays.D, arrays.P
+    n_units, n_subjects = arrays.required.shape
+    n_groups = len(arrays.groups)
+    n_doctors, n_assistants = len(arrays.doctors), len(arrays.assistants)
+    AL, TL = data['AL'], data['TL']
+    if 'rooms' in data:
+        HALLS = len(data['rooms'].get('halls', []))
+        LABS = len(data['rooms'].get('labs', []))
+    else:
+        HALLS, LABS = data['halls'], data['labs']
+
+    violations = {}
+
+    def report(rule, mask, describe):
+        bad = np.flatnonzero(mask)
+        if len(bad):
+            violations[rule] = {"count": int(len(bad)), "examples": [describe(i) for i in bad[:_EXAMPLES]]}
+
+    def slot(i):
+        return f"day {i // P + 1} period {i % P + 1}"
+
+    if arrays.unknown:
+        violations["unknown_entities"] = {"count": len(arrays.unknown), "examples": arrays.unknown[:_EXAMPLES]}
+
+    # group lectures: one event per (group, subject, slot, doctor)
+    ev_group, ev_subject, ev_day, ev_period, ev_teacher = arrays.lecture_events()
+    ev_slot = ev_day * P + ev_period
+
+    # Hall and lab capacity per slot
+    report("hall_capacity", _count(ev_slot, D * P) > HALLS, slot)
+    sec_slot = arrays.sec_day * P + arrays.sec_period
+    report("lab_capacity", _count(sec_slot, D * P) > LABS, slot)
+
+    # Each lecture and section exactly once, and only for the environment's subjects
+    def unit_subject(i):
+        e, g, c = arrays.units[i // n_subjects]
+        return f"{g}/{c} {arrays.subjects[i % n_subjects]}"
+
+    expected = arrays.required.ravel().astype(np.int64)
+    lectures = _count(arrays.lec_unit * n_subjects + arrays.lec_subject, n_units * n_subjects)
+    sections = _count(arrays.sec_unit * n_subjects + arrays.sec_subject, n_units * n_subjects)
+    report("lecture_once", lectures != expected, unit_subject)
+    report("section_once", sections != expected, unit_subject)
+
+    # All classes of a group take a lecture together, with the same doctor
+    events_per_subject = _count(ev_group * n_subjects + ev_subject, n_groups * n_subjects)
+    rows_per_event = np.zeros(len(ev_group), dtype=np.int64)
+    if len(ev_group):
+        key = np.stack([arrays.lec_group, arrays.lec_subject, arrays.lec_day, arrays.lec_period, arrays.lec_teacher], axis=1)
+        _, inverse = np.unique(key, axis=0, return_inverse=True)
+        rows_per_event = np.bincount(inverse.ravel(), minlength=len(ev_group))
+    report(
+        "group_lecture_sync",
+        np.concatenate([events_per_subject > 1, rows_per_event != arrays.group_size[ev_group]]),
+        lambda i: (f"{arrays.groups[i // n_subjects]} {arrays.subjects[i % n_subjects]}" if i < len(events_per_subject)
+                   else f"{arrays.groups[ev_group[i - len(events_per_subject)]]} {arrays.subjects[ev_subject[i - len(events_per_subject)]]}"),
+    )
+
+    # Teachers teach at most one session per slot
+    report("doctor_single_slot", _count(ev_teacher * D * P + ev_slot, n_doctors * D * P) > 1,
+           lambda i: f"{arrays.doctors[i // (D * P)]} {slot(i % (D * P))}")
+    report("assistant_single_slot", _count(arrays.sec_teacher * D * P + sec_slot, n_assistants * D * P) > 1,
+           lambda i: f"{arrays.assistants[i // (D * P)]} {slot(i % (D * P))}")
+
+    # Weekly period and subject loads AL / TL
+    report("doctor_period_load", _count(ev_teacher, n_doctors) > TL[0], lambda i: arrays.doctors[i])
+    report("assistant_period_load", _count(arrays.sec_teacher, n_assistants) > AL[0], lambda i: arrays.assistants[i])
+    doctor_subjects = np.zeros((n_doctors, n_subjects), dtype=bool)
+    doctor_subjects[ev_teacher, ev_subject] = True
+    assistant_subjects = np.zeros((n_assistants, n_subjects), dtype=bool)
+    assistant_subjects[arrays.sec_teacher, arrays.sec_subject] = True
+    report("doctor_subject_load", doctor_subjects.sum(axis=1) > TL[1], lambda i: arrays.doctors[i])
+    report("assistant_subject_load", assistant_subjects.sum(axis=1) > AL[1], lambda i: arrays.assistants[i])
+
+    # NoDouble: a class has at most one session per slot
+    report("no_double", arrays.busy.ravel() > 1,
+           lambda i: f"{'/'.join(arrays.units[i // (D * P)][1:])} {slot(i % (D * P))}")
+
+    # Teachers only teach in slots they are available in
+    AT = arrays.time_matrix(data['AT'], arrays.assistants)
+    TT = arrays.time_matrix(data['TT'], arrays.doctors)
+    report("doctor_unavailable", TT[ev_teacher, ev_day, ev_period] == UNAVAILABLE,
+           lambda i: f"{arrays.doctors[ev_teacher[i]]} {slot(ev_slot[i])}")
+    report("assistant_unavailable", AT[arrays.sec_teacher, arrays.sec_day, arrays.sec_period] == UNAVAILABLE,
+           lambda i: f"{arrays.assistants[arrays.sec_teacher[i]]} {slot(sec_slot[i])}")
+
+    # === Objective components, as the model counts them ===
+    load, busy_day, deviation, gap = arrays.day_statistics()
+    # the model has no variable in an unavailable slot, so it never earns -1 there
+    AT, TT = np.maximum(AT, 0), np.maximum(TT, 0)
+    AS = arrays.subject_matrix(data['AS'], arrays.assistants)
+    TS = arrays.subject_matrix(data['TS'], arrays.doctors)
+    preferences = -(
+        AT[arrays.sec_teacher, arrays.sec_day, arrays.sec_period].sum()
+        + TT[arrays.lec_teacher, arrays.lec_day, arrays.lec_period].sum()   # counted per class, as in the model
+        + AS[assistant_subjects].sum()
+        + TS[doctor_subjects].sum()
+    )
+    components = {
+        "deviation": int(deviation.sum()),
+        "days": int(busy_day.sum()),
+        "gaps": int(gap.sum()),
+        "preferences": int(preferences),
+    }
+    if weights is None:
+        from scheduelModel import DEFAULT_WEIGHTS
+        weights = DEFAULT_WEIGHTS
+    objective = float(sum(weights[k] * v for k, v in components.items()))
+
+    return {
+        "feasible": not violations,
+        "violations": violations,
+        "components": components,
+        "objective": objective,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python schedule_verifier.py inputs.json solution.json")
+    with open(sys.argv[1]) as f:
+        inputs = json.load(f)
+    with open(sys.argv[2]) as f:
+        result = verify_schedule(inputs, json.load(f))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    sys.exit(0 if result["feasible"] else 1)
@@ -3,10 +3,16 @@ from tkinter import ttk, messagebox, simpledialog, filedialog
 import json
 import os
 import time
-import threading
 
-# Import the logic file (assumed to be scheduler_logic.py)
-from scheduelModel import scheduelModel 
+# The model runs in a child process, see solver_worker.py
+from solver_worker import SolverWorker
+from input_loader import InputLoader
+from preference_table import (PreferenceTable, ROLES, PREFERRED, NEUTRAL, UNAVAILABLE, export_csv, import_csv,
+                              time_columns)
+
+# clicking a time cell cycles preferred -> neutral -> unavailable
+NEXT_TIME_VALUE = {PREFERRED: NEUTRAL, NEUTRAL: UNAVAILABLE, UNAVAILABLE: PREFERRED}
+TIME_LABELS = {PREFERRED: "Yes", NEUTRAL: "-", UNAVAILABLE: "No"}
 
 class Tooltip:
     """A class to create tooltips for widgets that appear on hover."""
@@ -37,8 +43,186 @@ class Tooltip:
             self.tooltip.destroy()
             self.tooltip = None
 
+class VirtualList(ttk.Frame):
+    """A searchable list that only creates rows for the visible window.
+
+    Drop-in for the tk.Listbox calls the app uses (insert at END, delete,
+    get, size, curselection, select_set, bind '<<ListboxSelect>>'). Indices
+    are positions in the filtered list, whatever part of it is scrolled into
+    view. The inner Listbox holds `height` rows at most, so showing or
+    filtering thousands of entries costs the same as showing four.
+    """
+    def __init__(self, parent, height=4, width=30, searchable=True):
+        super().__init__(parent)
+        self.height = height
+        self.items = []      # every entry
+        self.keys = []       # lower-case entries for the search
+        self.view = []       # indices into self.items matching the filter
+        self.offset = 0      # first entry of self.view on screen
+        self.selected = None # index into self.items
+        self.query = ""
+        self.callbacks = []
+
+        self.search = tk.StringVar()
+        if searchable:
+            entry = ttk.Entry(self, textvariable=self.search, width=width)
+            entry.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 2))
+            Tooltip(entry, "Type to filter the list")
+            self.search.trace("w", lambda *args: self.apply_filter(self.search.get()))
+        self.listbox = tk.Listbox(self, height=height, width=width, exportselection=False, activestyle="none")
+        self.listbox.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.columnconfigure(0, weight=1)
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda e: self._scroll_by(1))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+
+    # --------------------------------------- Listbox interface
+
+    def set_items(self, items):
+        """Replace all entries at once; keeps the selection if nothing changed."""
+        items = list(items)
+        if items == self.items:
+            return
+        self.items = items
+        self.keys = [str(item).lower() for item in items]
+        self.selected = None
+        self.offset = 0
+        self._refilter(full=True)
+
+    def insert(self, index, *items):
+        if index not in (tk.END, "end"):
+            raise ValueError("VirtualList only appends entries")
+        for item in items:
+            self.items.append(item)
+            self.keys.append(str(item).lower())
+            if self.query in self.keys[-1]:
+                self.view.append(len(self.items) - 1)
+        self._render()
+
+    def delete(self, first, last=None):
+        """Delete the filtered entries first..last (tk.END for all of them)."""
+        if last in (tk.END, "end"):
+            last = len(self.view) - 1
+        elif last is None:
+            last = first
+        removed = set(self.view[first:last + 1])
+        if not removed:
+            return
+        selected_item = None if self.selected is None or self.selected in removed else self.selected
+        kept = [i for i in range(len(self.items)) if i not in removed]
+        if selected_item is not None:
+            selected_item = kept.index(selected_item)
+        self.items = [self.items[i] for i in kept]
+        self.keys = [self.keys[i] for i in kept]
+        self.selected = selected_item
+        self._refilter(full=True)
+
+    def get(self, index):
+        # like tk.Listbox, an index past the end gives an empty string
+        return self.items[self.view[index]] if 0 <= index < len(self.view) else ""
+
+    def size(self):
+        return len(self.view)
+
+    def curselection(self):
+        if self.selected is None or self.selected not in self.view:
+            return ()
+        return (self.view.index(self.selected),)
+
+    def select_set(self, index):
+        self.selected = self.view[index]
+        self.see(index)
+
+    def selection_clear(self, *args):
+        self.selected = None
+        self._render()
+
+    def see(self, index):
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.height:
+            self.offset = index - self.height + 1
+        self._render()
+
+    def bind(self, sequence=None, func=None, add=None):
+        if sequence == "<<ListboxSelect>>":
+            self.callbacks.append(func)
+        else:
+            self.listbox.bind(sequence, func, add)
+
+    # --------------------------------------- filtering and drawing
+
+    def apply_filter(self, query):
+        query = query.strip().lower()
+        # a longer query only narrows the current matches
+        narrowing = self.query and query.startswith(self.query)
+        self.query = query
+        self.offset = 0
+        self._refilter(full=not narrowing)
+
+    def _refilter(self, full):
+        candidates = range(len(self.items)) if full else self.view
+        if self.query:
+            self.view = [i for i in candidates if self.query in self.keys[i]]
+        else:
+            self.view = list(candidates)
+        self.offset = max(0, min(self.offset, len(self.view) - self.height))
+        self._render()
+
+    def _render(self):
+        window = self.view[self.offset:self.offset + self.height]
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *(self.items[i] for i in window))
+        if self.selected in window:
+            self.listbox.selection_set(window.index(self.selected))
+        if self.view:
+            self.scrollbar.set(self.offset / len(self.view), min(1.0, (self.offset + self.height) / len(self.view)))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_by(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.view) - self.height))
+        self._render()
+        return "break"
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.offset = int(float(amount) * len(self.view))
+            self._scroll_by(0)
+        elif unit == tk.PAGES:
+            self._scroll_by(int(amount) * self.height)
+        else:
+            self._scroll_by(int(amount))
+
+    def _on_select(self, event):
+        shown = self.listbox.curselection()
+        if not shown:
+            return
+        self.selected = self.view[self.offset + shown[0]]
+        for callback in self.callbacks:
+            callback(event)
+
+    def _move_selection(self, step):
+        if self.view:
+            position = self.curselection()
+            index = max(0, min(len(self.view) - 1, position[0] + step if position else 0))
+            self.select_set(index)
+            for callback in self.callbacks:
+                callback(None)
+        return "break"
+
 class PreferenceDialog:
-    """A dialog to set time preferences for assistants and doctors."""
+    """A dialog to set time preferences for assistants and doctors.
+
+    Each slot is a button that cycles preferred (Yes), neutral (-) and
+    unavailable (No).
+    """
     def __init__(self, parent, days, periods, title, existing_prefs=None):
         self.top = tk.Toplevel(parent)
         self.top.title(title)
@@ -46,18 +230,13 @@ class PreferenceDialog:
         self.days = list(range(1, days + 1))
         self.periods = list(range(1, periods + 1))
         
-        # Initialize preferences with existing values if provided, else default to True
-        self.preferences = {}
-        if existing_prefs is not None:
-            for d in self.days:
-                for p in self.periods:
-                    # Use existing preference if available, otherwise default to True
-                    self.preferences[(d, p)] = tk.BooleanVar(value=bool(existing_prefs.get((d, p), 1)))
-        else:
-            self.preferences = {(d, p): tk.BooleanVar(value=True) for d in self.days for p in self.periods}
-        
-        # Create a grid of checkboxes for each day and period
-        ttk.Label(self.top, text="Select preferred days and periods:").pack(pady=5)
+        # Initialize preferences with existing values if provided, else default to preferred
+        existing_prefs = existing_prefs or {}
+        self.preferences = {(d, p): existing_prefs.get((d, p), PREFERRED) for d in self.days for p in self.periods}
+        self.buttons = {}
+
+        # Create a grid of buttons for each day and period
+        ttk.Label(self.top, text="Click a slot to cycle Yes (preferred), - (neutral), No (unavailable):").pack(pady=5)
         frame = ttk.Frame(self.top)
         frame.pack(fill="both", expand=True, padx=10, pady=10)
         
@@ -66,12 +245,14 @@ class PreferenceDialog:
         for p in self.periods:
             ttk.Label(frame, text=f"P{p}").grid(row=0, column=p, padx=5, pady=5)
         
-        # Checkboxes for each day and period
+        # A button for each day and period
         for d in self.days:
             ttk.Label(frame, text=f"Day {d}").grid(row=d, column=0, padx=5, pady=5)
             for p in self.periods:
-                chk = ttk.Checkbutton(frame, variable=self.preferences[(d, p)])
-                chk.grid(row=d, column=p, padx=5, pady=5)
+                button = ttk.Button(frame, width=4, text=TIME_LABELS.get(self.preferences[(d, p)], "?"),
+                                    command=lambda slot=(d, p): self.cycle(slot))
+                button.grid(row=d, column=p, padx=2, pady=2)
+                self.buttons[(d, p)] = button
         
         # Buttons
         ttk.Button(self.top, text="Save", command=self.save).pack(pady=10)
@@ -81,16 +262,20 @@ class PreferenceDialog:
         ttk.Button(self.top, text="Cancel", command=self.top.destroy).pack(pady=5)
         self.result = None
 
+    def cycle(self, slot):
+        self.preferences[slot] = NEXT_TIME_VALUE.get(self.preferences[slot], PREFERRED)
+        self.buttons[slot].configure(text=TIME_LABELS[self.preferences[slot]])
+
     def save(self):
         """Save the selected preferences as a dictionary."""
-        self.result = {(d, p): 1 if self.preferences[(d, p)].get() else 0 for d in self.days for p in self.periods}
+        self.result = dict(self.preferences)
         self.top.destroy()
 
     def reset(self):
-        """Reset all time preferences to the default value (True)."""
-        for d in self.days:
-            for p in self.periods:
-                self.preferences[(d, p)].set(True)
+        """Reset all time preferences to the default value (preferred)."""
+        for slot in self.preferences:
+            self.preferences[slot] = PREFERRED
+            self.buttons[slot].configure(text=TIME_LABELS[PREFERRED])
 
 class SubjectPreferenceDialog:
     """A dialog to set subject preferences for assistants and doctors."""
@@ -136,6 +321,195 @@ class SubjectPreferenceDialog:
         for s in self.subjects:
             self.preferences[s].set(False)
 
+class PreferenceGridDialog:
+    """Spreadsheet-like editor of the preferences of many teachers at once.
+
+    One row per teacher and one column per time slot (or subject). Clicking
+    a cell toggles it (time cells cycle preferred, neutral, unavailable),
+    dragging paints the same value over more cells, and clicking a name or
+    a column header does the same to the whole row or column.
+    Edits are written straight into the PreferenceTable. Only the visible
+    rows and columns are drawn, so the grid scrolls smoothly for hundreds
+    of teachers.
+    """
+    ROW_HEIGHT = 22
+    CELL_WIDTH = 48
+    NAME_WIDTH = 150
+
+    def __init__(self, parent, title, list_teachers, tables, columns, defaults, on_import=None, on_export=None):
+        # tables/columns/defaults are {"time": ..., "subject": ...}
+        self.list_teachers = list_teachers
+        self.teachers = list_teachers()
+        self.on_import = on_import
+        self.tables = tables
+        self.all_columns = columns
+        self.defaults = defaults
+        self.row_offset = 0
+        self.col_offset = 0
+        self.paint_value = None
+
+        self.top = tk.Toplevel(parent)
+        self.top.title(title)
+        self.top.geometry("800x500")
+
+        toolbar = ttk.Frame(self.top)
+        toolbar.pack(fill="x", padx=10, pady=5)
+        self.kind = tk.StringVar(value="time")
+        ttk.Radiobutton(toolbar, text="Time", variable=self.kind, value="time", command=self.reset_view).pack(side="left")
+        ttk.Radiobutton(toolbar, text="Subjects", variable=self.kind, value="subject", command=self.reset_view).pack(side="left", padx=(5, 20))
+        if on_import is not None:
+            ttk.Button(toolbar, text="Import CSV", command=self.import_csv).pack(side="left", padx=5)
+        if on_export is not None:
+            ttk.Button(toolbar, text="Export CSV", command=lambda: on_export(self.kind.get())).pack(side="left", padx=5)
+        ttk.Button(toolbar, text="Close", command=self.top.destroy).pack(side="right")
+
+        grid_frame = ttk.Frame(self.top)
+        grid_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.canvas = tk.Canvas(grid_frame, bg="white", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vbar = ttk.Scrollbar(grid_frame, orient=tk.VERTICAL, command=lambda *a: self._on_scroll("rows", *a))
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.hbar = ttk.Scrollbar(grid_frame, orient=tk.HORIZONTAL, command=lambda *a: self._on_scroll("cols", *a))
+        self.hbar.grid(row=1, column=0, sticky="ew")
+        grid_frame.rowconfigure(0, weight=1)
+        grid_frame.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.draw())
+        self.canvas.bind("<Button-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", lambda e: setattr(self, "paint_value", None))
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll("rows", -1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll("rows", -1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll("rows", 1))
+
+    # --------------------------------------- geometry
+
+    @property
+    def columns(self):
+        return self.all_columns[self.kind.get()]
+
+    @property
+    def table(self):
+        return self.tables[self.kind.get()]
+
+    def _visible(self):
+        rows = max(1, (self.canvas.winfo_height() - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+        cols = max(1, (self.canvas.winfo_width() - self.NAME_WIDTH) // self.CELL_WIDTH)
+        return rows, cols
+
+    def _cell_at(self, x, y):
+        """(row, column) under the pointer; -1 for the header row or the name column."""
+        row = -1 if y < self.ROW_HEIGHT else self.row_offset + (y - self.ROW_HEIGHT) // self.ROW_HEIGHT
+        col = -1 if x < self.NAME_WIDTH else self.col_offset + (x - self.NAME_WIDTH) // self.CELL_WIDTH
+        if row >= len(self.teachers) or col >= len(self.columns):
+            return None
+        return row, col
+
+    # --------------------------------------- drawing
+
+    def reset_view(self):
+        self.col_offset = 0
+        self.draw()
+
+    def import_csv(self):
+        if self.on_import(self.kind.get()):
+            # the import may have added teachers
+            self.teachers = self.list_teachers()
+            self.draw()
+
+    def draw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        rows, cols = self._visible()
+        default = self.defaults[self.kind.get()]
+        shown_columns = self.columns[self.col_offset:self.col_offset + cols]
+        for j, column in enumerate(shown_columns):
+            x = self.NAME_WIDTH + j * self.CELL_WIDTH
+            label = f"D{column[0]}P{column[1]}" if isinstance(column, tuple) else str(column)[:6]
+            canvas.create_text(x + self.CELL_WIDTH / 2, self.ROW_HEIGHT / 2, text=label, font=("Arial", 8, "bold"))
+        for i, teacher in enumerate(self.teachers[self.row_offset:self.row_offset + rows]):
+            y = self.ROW_HEIGHT * (i + 1)
+            canvas.create_text(5, y + self.ROW_HEIGHT / 2, text=teacher, anchor="w", font=("Arial", 9))
+            for j, column in enumerate(shown_columns):
+                x = self.NAME_WIDTH + j * self.CELL_WIDTH
+                value = self.table.value(teacher, column, default)
+                fill = "#A5D6A7" if value > 0 else "#EF9A9A" if value == UNAVAILABLE else "white"
+                canvas.create_rectangle(x + 1, y + 1, x + self.CELL_WIDTH - 1, y + self.ROW_HEIGHT - 1,
+                                        fill=fill, outline="#BDBDBD")
+        self._set_scrollbar(self.vbar, self.row_offset, rows, len(self.teachers))
+        self._set_scrollbar(self.hbar, self.col_offset, cols, len(self.columns))
+
+    @staticmethod
+    def _set_scrollbar(bar, offset, shown, total):
+        if total:
+            bar.set(offset / total, min(1.0, (offset + shown) / total))
+        else:
+            bar.set(0, 1)
+
+    def _scroll(self, axis, step):
+        rows, cols = self._visible()
+        if axis == "rows":
+            self.row_offset = max(0, min(self.row_offset + step, len(self.teachers) - rows))
+        else:
+            self.col_offset = max(0, min(self.col_offset + step, len(self.columns) - cols))
+        self.draw()
+        return "break"
+
+    def _on_scroll(self, axis, action, amount, unit=None):
+        rows, cols = self._visible()
+        shown, total = (rows, len(self.teachers)) if axis == "rows" else (cols, len(self.columns))
+        if action == tk.MOVETO:
+            offset = int(float(amount) * total)
+            step = offset - (self.row_offset if axis == "rows" else self.col_offset)
+        elif unit == tk.PAGES:
+            step = int(amount) * shown
+        else:
+            step = int(amount)
+        self._scroll(axis, step)
+
+    # --------------------------------------- editing
+
+    def _set(self, teacher, column, value):
+        self.table.set_value(teacher, column, value, default=self.defaults[self.kind.get()])
+
+    def _next(self, value):
+        if self.kind.get() == "time":
+            return NEXT_TIME_VALUE.get(value, PREFERRED)
+        return 0 if value > 0 else 1
+
+    def _on_press(self, event):
+        cell = self._cell_at(event.x, event.y)
+        if cell is None or cell == (-1, -1) or not self.teachers or not self.columns:
+            return
+        row, col = cell
+        default = self.defaults[self.kind.get()]
+        if row == -1:
+            # toggle a whole column
+            column = self.columns[col]
+            value = self._next(self.table.value(self.teachers[0], column, default))
+            for teacher in self.teachers:
+                self._set(teacher, column, value)
+        elif col == -1:
+            # toggle a whole row
+            teacher = self.teachers[row]
+            value = self._next(self.table.value(teacher, self.columns[0], default))
+            for column in self.columns:
+                self._set(teacher, column, value)
+        else:
+            teacher, column = self.teachers[row], self.columns[col]
+            self.paint_value = self._next(self.table.value(teacher, column, default))
+            self._set(teacher, column, self.paint_value)
+        self.draw()
+
+    def _on_drag(self, event):
+        cell = self._cell_at(event.x, event.y)
+        if self.paint_value is None or cell is None or -1 in cell:
+            return
+        teacher, column = self.teachers[cell[0]], self.columns[cell[1]]
+        if self.table.value(teacher, column, self.defaults[self.kind.get()]) != self.paint_value:
+            self._set(teacher, column, self.paint_value)
+            self.draw()
+
 class SchedulingApp:
     """Main application class for collecting scheduling inputs."""
     def __init__(self, root):
@@ -152,6 +526,10 @@ class SchedulingApp:
         self.labs = tk.StringVar(value="9")
         self.days = tk.StringVar(value="5")
         self.periods = tk.StringVar(value="5")
+        # Address of a job service (job_service.py); empty means solve on this computer
+        self.server_url = tk.StringVar(value="")
+        # LP-rounding draft first, as a preview and MIP start (--mip-start)
+        self.mip_start = tk.BooleanVar(value=True)
 
         # Variables for assistant and doctor workload limits (AL and TL)
         self.assistant_max_periods = tk.StringVar(value="8")
@@ -166,11 +544,13 @@ class SchedulingApp:
         self.subjects = {}
         self.assistants = {}  # {env: [assistants]} for UI purposes
         self.doctors = {}    # {env: [doctors]} for UI purposes
-        # Flat dictionaries for preferences
-        self.assistant_time_prefs = {}    # {assistant: {(d, p): 1 or 0}}
-        self.doctor_time_prefs = {}       # {doctor: {(d, p): 1 or 0}}
-        self.assistant_subject_prefs = {} # {assistant: {s: 1 or 0}}
-        self.doctor_subject_prefs = {}    # {doctor: {s: 1 or 0}}
+        # Preference tables, used like {teacher: {(d, p): 1, 0 or -1} or {s: 1 or 0}} (see preference_table.py)
+        self.assistant_time_prefs = PreferenceTable()
+        self.doctor_time_prefs = PreferenceTable()
+        self.assistant_subject_prefs = PreferenceTable()
+        self.doctor_subject_prefs = PreferenceTable()
+        # Inputs the UI does not edit (room lists, class sizes...), kept from the loaded file
+        self.extra_inputs = {}
 
         self.setup_ui()
 
@@ -353,12 +733,21 @@ class SchedulingApp:
         self.periods.trace("w", lambda *args: self.check_entry(periods_entry, self.periods))
         Tooltip(periods_entry, "Number of periods per day (1-10)")
 
+        ttk.Label(param_frame, text="Solver Server:", style="TLabel").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
+        server_entry = ttk.Entry(param_frame, textvariable=self.server_url, width=25, state="normal")
+        server_entry.grid(row=4, column=1, sticky=tk.W, padx=5, pady=5)
+        Tooltip(server_entry, "Job service address, e.g. http://server:8765 (leave empty to solve locally)")
+
+        mip_start_check = ttk.Checkbutton(param_frame, text="Draft first", variable=self.mip_start)
+        mip_start_check.grid(row=5, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+        Tooltip(mip_start_check, "Make a quick draft schedule (schedule/draft) and start the solver from it")
+
         # Environments Frame (Left Column)
         env_frame = ttk.LabelFrame(left_frame, text="🌍 Environments", padding="15", style="Custom.TLabelframe")
         env_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
         env_frame.configure(borderwidth=2, relief="groove")
 
-        self.env_listbox = tk.Listbox(env_frame, height=4, exportselection=False, width=30)
+        self.env_listbox = VirtualList(env_frame, height=4, width=30)
         self.env_listbox.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), padx=5, pady=5)
         if not self.environments:
             self.env_listbox.insert(tk.END, "Add an environment to start...")
@@ -380,7 +769,7 @@ class SchedulingApp:
         subject_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
         subject_frame.configure(borderwidth=2, relief="groove")
 
-        self.subject_listbox = tk.Listbox(subject_frame, height=4, width=30)
+        self.subject_listbox = VirtualList(subject_frame, height=4, width=30)
         self.subject_listbox.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
 
         add_subject_btn = ttk.Button(subject_frame, text="➕ Add", command=self.add_subject, style="Add.TButton")
@@ -396,7 +785,7 @@ class SchedulingApp:
         group_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
         group_frame.configure(borderwidth=2, relief="groove")
 
-        self.group_listbox = tk.Listbox(group_frame, height=4, exportselection=False, width=30)
+        self.group_listbox = VirtualList(group_frame, height=4, width=30)
         self.group_listbox.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
 
         delete_group_btn = ttk.Button(group_frame, text="🗑 Delete Group", command=self.delete_group, style="Delete.TButton")
@@ -407,7 +796,7 @@ class SchedulingApp:
         add_class_btn.grid(row=1, column=1, padx=5, pady=5)
         Tooltip(add_class_btn, "Add a class to the selected group")
 
-        self.class_listbox = tk.Listbox(group_frame, height=4, width=30)
+        self.class_listbox = VirtualList(group_frame, height=4, width=30)
         self.class_listbox.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=5)
 
         delete_class_btn = ttk.Button(group_frame, text="🗑 Delete Class", command=self.delete_class, style="Delete.TButton")
@@ -421,7 +810,7 @@ class SchedulingApp:
 
         # Assistants Section
         ttk.Label(staff_frame, text="Assistants:", style="TLabel").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.assistant_listbox = tk.Listbox(staff_frame, height=4, width=20)
+        self.assistant_listbox = VirtualList(staff_frame, height=4, width=20)
         self.assistant_listbox.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=5, pady=5)
 
         # Add fields for assistant workload limits (AL)
@@ -453,9 +842,13 @@ class SchedulingApp:
         delete_assistant_btn.grid(row=9, column=0, padx=5, pady=5)
         Tooltip(delete_assistant_btn, "Delete the selected assistant")
 
+        all_assistant_prefs_btn = ttk.Button(staff_frame, text="🗂 Edit All Preferences", command=lambda: self.edit_all_preferences("assistant"), style="Custom.TButton")
+        all_assistant_prefs_btn.grid(row=10, column=0, padx=5, pady=5)
+        Tooltip(all_assistant_prefs_btn, "Edit, import or export the preferences of all assistants in one grid")
+
         # Doctors Section
         ttk.Label(staff_frame, text="Doctors:", style="TLabel").grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
-        self.doctor_listbox = tk.Listbox(staff_frame, height=4, width=20)
+        self.doctor_listbox = VirtualList(staff_frame, height=4, width=20)
         self.doctor_listbox.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=5, pady=5)
 
         # Add fields for doctor workload limits (TL)
@@ -487,6 +880,10 @@ class SchedulingApp:
         delete_doctor_btn.grid(row=9, column=1, padx=5, pady=5)
         Tooltip(delete_doctor_btn, "Delete the selected doctor")
 
+        all_doctor_prefs_btn = ttk.Button(staff_frame, text="🗂 Edit All Preferences", command=lambda: self.edit_all_preferences("doctor"), style="Custom.TButton")
+        all_doctor_prefs_btn.grid(row=10, column=1, padx=5, pady=5)
+        Tooltip(all_doctor_prefs_btn, "Edit, import or export the preferences of all doctors in one grid")
+
         # Action Buttons (Right Column)
         action_frame = ttk.Frame(right_frame)
         action_frame.grid(row=2, column=0, pady=20)
@@ -508,6 +905,7 @@ class SchedulingApp:
         Tooltip(generate_btn, "Generate schedules using the input data")
 
         self.env_listbox.bind('<<ListboxSelect>>', self.update_groups)
+        self.group_listbox.bind('<<ListboxSelect>>', self.update_classes)
 
     def clear_inputs(self):
         """Reset all input fields and data structures to their default state."""
@@ -525,120 +923,100 @@ class SchedulingApp:
         self.subjects = {}
         self.assistants = {}
         self.doctors = {}
-        self.assistant_time_prefs = {}
-        self.doctor_time_prefs = {}
-        self.assistant_subject_prefs = {}
-        self.doctor_subject_prefs = {}
-
-        self.env_listbox.delete(0, tk.END)
-        self.env_listbox.insert(tk.END, "Add an environment to start...")
-        self.group_listbox.delete(0, tk.END)
-        self.class_listbox.delete(0, tk.END)
-        self.subject_listbox.delete(0, tk.END)
-        self.assistant_listbox.delete(0, tk.END)
-        self.doctor_listbox.delete(0, tk.END)
+        self.assistant_time_prefs = PreferenceTable()
+        self.doctor_time_prefs = PreferenceTable()
+        self.assistant_subject_prefs = PreferenceTable()
+        self.doctor_subject_prefs = PreferenceTable()
+        self.extra_inputs = {}
+
+        self.env_listbox.set_items(["Add an environment to start..."])
+        self.clear_environment_lists()
 
     def browse_inputs(self):
-        """Open a file dialog to select a JSON file and load its contents."""
-        try:
-            file_path = filedialog.askopenfilename(
-                title="Select JSON File",
-                filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
-            )
-            if not file_path:
-                return  # User canceled the dialog
-
-            with open(file_path, "r") as f:
-                data = json.load(f)
-
-            # Populate basic parameters
-            self.halls.set(str(data.get("halls", 4)))
-            self.labs.set(str(data.get("labs", 9)))
-            self.days.set(str(data.get("days", 5)))
-            self.periods.set(str(data.get("periods", 5)))
-            self.assistant_max_periods.set(str(data.get("AL", [8, 3])[0]))
-            self.assistant_max_subjects.set(str(data.get("AL", [8, 3])[1]))
-            self.doctor_max_periods.set(str(data.get("TL", [5, 3])[0]))
-            self.doctor_max_subjects.set(str(data.get("TL", [5, 3])[1]))
-
-            # Load environments, groups, and subjects
-            self.environments = data.get("environments", [])
-            self.groups = data.get("groups", {})
-            self.subjects = data.get("subjects", {})
-
-            # Reconstruct classes to match the {env: {group: [classes]}} format
-            flat_classes = data.get("classes", {})
-            self.classes = {env: {} for env in self.environments}
-            for env in self.environments:
-                for group in self.groups.get(env, []):
-                    # Assign classes for the group, default to empty list if not found
-                    self.classes[env][group] = flat_classes.get(group, [])
-
-            # Initialize assistants and doctors dictionaries
-            self.assistants = {env: [] for env in self.environments}
-            self.doctors = {env: [] for env in self.environments}
-
-            # Populate assistants and doctors, mapping them to environments
-            loaded_assistants = data.get("A", [])
-            loaded_doctors = data.get("T", [])
-            # For simplicity, distribute assistants and doctors based on subject preferences
-            for env in self.environments:
-                env_subjects = set(self.subjects.get(env, []))
-                for assistant in loaded_assistants:
-                    # Check if assistant has preferences for any subjects in this environment
-                    assistant_prefs = data.get("AS", {}).get(assistant, {})
-                    if any(subject in env_subjects and assistant_prefs.get(subject, 0) == 1 for subject in assistant_prefs):
-                        self.assistants[env].append(assistant)
-                for doctor in loaded_doctors:
-                    # Check if doctor has preferences for any subjects in this environment
-                    doctor_prefs = data.get("TS", {}).get(doctor, {})
-                    if any(subject in env_subjects and doctor_prefs.get(subject, 0) == 1 for subject in doctor_prefs):
-                        self.doctors[env].append(doctor)
-
-            # Load and convert time preferences (AT and TT)
-            self.assistant_time_prefs = {}
-            self.doctor_time_prefs = {}
-            for assistant in loaded_assistants:
-                at_prefs = data.get("AT", {}).get(assistant, {})
-                self.assistant_time_prefs[assistant] = {
-                    (day, period): at_prefs.get(str(day), {}).get(str(period), 0)
-                    for day in range(1, int(self.days.get()) + 1)
-                    for period in range(1, int(self.periods.get()) + 1)
-                }
-            for doctor in loaded_doctors:
-                tt_prefs = data.get("TT", {}).get(doctor, {})
-                self.doctor_time_prefs[doctor] = {
-                    (day, period): tt_prefs.get(str(day), {}).get(str(period), 0)
-                    for day in range(1, int(self.days.get()) + 1)
-                    for period in range(1, int(self.periods.get()) + 1)
-                }
-
-            # Load subject preferences (AS and TS)
-            self.assistant_subject_prefs = data.get("AS", {})
-            self.doctor_subject_prefs = data.get("TS", {})
-
-            # Populate the environment listbox
-            self.env_listbox.delete(0, tk.END)
-            for env in self.environments:
-                self.env_listbox.insert(tk.END, env)
-            if not self.environments:
-                self.env_listbox.insert(tk.END, "Add an environment to start...")
+        """Open a file dialog to select a JSON file and load it in the background."""
+        file_path = filedialog.askopenfilename(
+            title="Select JSON File",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return  # User canceled the dialog
+
+        # Parsing, checking and preparing a large file runs in input_loader's
+        # thread; the widgets are only touched once everything is ready
+        progress_dialog = tk.Toplevel(self.root)
+        progress_dialog.title("Loading Inputs")
+        progress_dialog.geometry("300x100")
+        progress_dialog.transient(self.root)
+        progress_dialog.grab_set()
+        progress_dialog.protocol("WM_DELETE_WINDOW", lambda: None)
 
-            # Clear other listboxes
-            self.group_listbox.delete(0, tk.END)
-            self.class_listbox.delete(0, tk.END)
-            self.subject_listbox.delete(0, tk.END)
-            self.assistant_listbox.delete(0, tk.END)
-            self.doctor_listbox.delete(0, tk.END)
+        status_label = ttk.Label(progress_dialog, text="Loading inputs, please wait...")
+        status_label.pack(pady=10)
+        progress_bar = ttk.Progressbar(progress_dialog, length=200, mode="indeterminate")
+        progress_bar.pack(pady=10)
+        progress_bar.start(10)
 
-            # Update UI if an environment is selected
-            if self.environments and self.env_listbox.size() > 0:
-                self.env_listbox.select_set(0)  # Select the first environment
-                self.update_groups(None)  # Trigger UI update
+        loader = InputLoader()
+        loader.submit(file_path)
 
-            messagebox.showinfo("Success", "Inputs loaded successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error loading inputs: {str(e)}")
+        def check_loader():
+            loader.poll()
+            if loader.running():
+                status_label.configure(text=f"Loading inputs ({loader.phase})...")
+                self.root.after(50, check_loader)
+                return
+            progress_bar.stop()
+            progress_dialog.destroy()
+            if loader.error:
+                messagebox.showerror("Error", f"Error loading inputs: {loader.error}")
+                return
+            self.apply_loaded_inputs(loader.result)
+            warnings = loader.result["warnings"]
+            if warnings:
+                shown = "\n".join(warnings[:10])
+                more = f"\n... and {len(warnings) - 10} more" if len(warnings) > 10 else ""
+                messagebox.showwarning("Loaded with warnings", f"Inputs loaded with warnings:\n{shown}{more}")
+            else:
+                messagebox.showinfo("Success", "Inputs loaded successfully.")
+
+        self.root.after(50, check_loader)
+
+    def apply_loaded_inputs(self, loaded):
+        """Show the structures prepared by input_loader.read_inputs in one batch."""
+        # Populate basic parameters
+        self.halls.set(str(loaded["halls"]))
+        self.labs.set(str(loaded["labs"]))
+        self.days.set(str(loaded["days"]))
+        self.periods.set(str(loaded["periods"]))
+        self.assistant_max_periods.set(str(loaded["AL"][0]))
+        self.assistant_max_subjects.set(str(loaded["AL"][1]))
+        self.doctor_max_periods.set(str(loaded["TL"][0]))
+        self.doctor_max_subjects.set(str(loaded["TL"][1]))
+
+        # Keep the room assignment inputs so they are written back on save
+        self.extra_inputs = loaded["extra_inputs"]
+
+        self.environments = loaded["environments"]
+        self.groups = loaded["groups"]
+        self.classes = loaded["classes"]
+        self.subjects = loaded["subjects"]
+        self.assistants = loaded["assistants"]
+        self.doctors = loaded["doctors"]
+        self.assistant_time_prefs = loaded["assistant_time_prefs"]
+        self.doctor_time_prefs = loaded["doctor_time_prefs"]
+        self.assistant_subject_prefs = loaded["assistant_subject_prefs"]
+        self.doctor_subject_prefs = loaded["doctor_subject_prefs"]
+
+        # Populate the environment listbox
+        self.env_listbox.set_items(self.environments or ["Add an environment to start..."])
+
+        # Clear other listboxes
+        self.clear_environment_lists()
+
+        # Update UI if an environment is selected
+        if self.environments and self.env_listbox.size() > 0:
+            self.env_listbox.select_set(0)  # Select the first environment
+            self.update_groups(None)  # Trigger UI update
 
     def add_environment(self):
         """Add a new environment to the list and initialize its data structures."""
@@ -682,11 +1060,7 @@ class SchedulingApp:
             self.env_listbox.delete(selected[0])
             if not self.environments:
                 self.env_listbox.insert(tk.END, "Add an environment to start...")
-            self.group_listbox.delete(0, tk.END)
-            self.class_listbox.delete(0, tk.END)
-            self.subject_listbox.delete(0, tk.END)
-            self.assistant_listbox.delete(0, tk.END)
-            self.doctor_listbox.delete(0, tk.END)
+            self.clear_environment_lists()
 
     def add_group(self):
         """Add a new group to the selected environment."""
@@ -714,7 +1088,7 @@ class SchedulingApp:
             self.groups[env].remove(group)
             del self.classes[env][group]
             self.group_listbox.delete(selected[0])
-            self.class_listbox.delete(0, tk.END)
+            self.class_listbox.set_items([])
 
     def add_class(self):
         """Add a new class to the selected group."""
@@ -938,37 +1312,127 @@ class SchedulingApp:
                 del self.doctor_subject_prefs[doctor]
             self.doctor_listbox.delete(selected[0])
 
+    def preference_tables(self, kind):
+        """{role: PreferenceTable} of one kind, "time" or "subject"."""
+        if kind == "time":
+            return {"assistant": self.assistant_time_prefs, "doctor": self.doctor_time_prefs}
+        return {"assistant": self.assistant_subject_prefs, "doctor": self.doctor_subject_prefs}
+
+    def preference_columns(self, kind):
+        if kind == "time":
+            return time_columns(int(self.days.get()), int(self.periods.get()))
+        return sorted({s for e in self.environments for s in self.subjects.get(e, [])})
+
+    def teachers_of(self, role):
+        staff = self.assistants if role == "assistant" else self.doctors
+        return list(dict.fromkeys(t for env in self.environments for t in staff.get(env, [])))
+
+    def edit_all_preferences(self, role):
+        """Open the grid editor with the preferences of every assistant or doctor."""
+        if not self.validate_positive_integer(self.days.get()) or not self.validate_positive_integer(self.periods.get()):
+            messagebox.showerror("Error", "Please enter valid Days and Periods before setting preferences.")
+            return
+        PreferenceGridDialog(
+            self.root,
+            f"Preferences of all {role}s",
+            lambda: self.teachers_of(role),
+            {kind: self.preference_tables(kind)[role] for kind in ("time", "subject")},
+            {kind: self.preference_columns(kind) for kind in ("time", "subject")},
+            # the single-teacher dialogs start from "available" and "not preferred"
+            {"time": 1, "subject": 0},
+            on_import=self.import_preferences,
+            on_export=self.export_preferences,
+        )
+
+    def import_preferences(self, kind):
+        """Load time or subject preferences of many teachers from a CSV file.
+
+        Teachers not known yet are added to the selected environment.
+        Returns True when something was imported.
+        """
+        path = filedialog.askopenfilename(
+            title=f"Import {kind} preferences",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not path:
+            return False
+        try:
+            imported = import_csv(path, kind)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Error importing preferences: {e}")
+            return False
+
+        selected = self.env_listbox.curselection()
+        env = self.env_listbox.get(selected[0]) if selected else None
+        if env == "Add an environment to start...":
+            env = None
+        tables = self.preference_tables(kind)
+        added = skipped = 0
+        for role in ROLES:
+            staff = self.assistants if role == "assistant" else self.doctors
+            known = set(self.teachers_of(role))
+            for teacher, prefs in imported[role].items():
+                if teacher not in known:
+                    if env is None:
+                        skipped += 1
+                        continue
+                    staff[env].append(teacher)
+                    added += 1
+                tables[role][teacher] = prefs
+        self.update_groups(None)
+
+        message = f"Imported preferences of {sum(len(v) for v in imported.values()) - skipped} teachers ({added} new)."
+        if skipped:
+            message += f"\n{skipped} unknown teachers were skipped: select an environment to add them."
+        messagebox.showinfo("Import", message)
+        return True
+
+    def export_preferences(self, kind):
+        """Write the time or subject preferences of all teachers to a CSV file."""
+        path = filedialog.asksaveasfilename(
+            title=f"Export {kind} preferences",
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            export_csv(path, self.preference_tables(kind), self.preference_columns(kind),
+                       teachers={role: self.teachers_of(role) for role in ROLES},
+                       default=1 if kind == "time" else 0)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error exporting preferences: {e}")
+
+    def clear_environment_lists(self):
+        """Empty the lists that show the contents of an environment."""
+        for listbox in (self.group_listbox, self.class_listbox, self.subject_listbox,
+                        self.assistant_listbox, self.doctor_listbox):
+            listbox.set_items([])
+
     def update_groups(self, event):
         """Update the groups, classes, subjects, assistants, and doctors listboxes when an environment is selected."""
-        self.group_listbox.delete(0, tk.END)
-        self.class_listbox.delete(0, tk.END)
-        self.subject_listbox.delete(0, tk.END)
-        self.assistant_listbox.delete(0, tk.END)
-        self.doctor_listbox.delete(0, tk.END)
         selected = self.env_listbox.curselection()
-        if selected and self.env_listbox.get(selected[0]) != "Add an environment to start...":
-            env = self.env_listbox.get(selected[0])
-            for group in self.groups.get(env, []):
-                self.group_listbox.insert(tk.END, group)
-            for subject in self.subjects.get(env, []):
-                self.subject_listbox.insert(tk.END, subject)
-            for assistant in self.assistants.get(env, []):
-                self.assistant_listbox.insert(tk.END, assistant)
-            for doctor in self.doctors.get(env, []):
-                self.doctor_listbox.insert(tk.END, doctor)
-        self.group_listbox.bind('<<ListboxSelect>>', self.update_classes)
+        if not selected or self.env_listbox.get(selected[0]) == "Add an environment to start...":
+            self.clear_environment_lists()
+            return
+        env = self.env_listbox.get(selected[0])
+        # set_items leaves a list alone when its entries did not change
+        self.group_listbox.set_items(self.groups.get(env, []))
+        self.subject_listbox.set_items(self.subjects.get(env, []))
+        self.assistant_listbox.set_items(self.assistants.get(env, []))
+        self.doctor_listbox.set_items(self.doctors.get(env, []))
+        self.update_classes(event)
 
     def update_classes(self, event):
         """Update the classes listbox when a group is selected."""
-        self.class_listbox.delete(0, tk.END)
         selected = self.group_listbox.curselection()
-        if selected:
-            env = self.env_listbox.get(self.env_listbox.curselection()[0])
-            group = self.group_listbox.get(selected[0])
-            if env not in self.classes or group not in self.classes[env]:
-                return
-            for class_name in self.classes[env].get(group, []):
-                self.class_listbox.insert(tk.END, class_name)
+        env_selected = self.env_listbox.curselection()
+        if not selected or not env_selected:
+            self.class_listbox.set_items([])
+            return
+        env = self.env_listbox.get(env_selected[0])
+        group = self.group_listbox.get(selected[0])
+        self.class_listbox.set_items(self.classes.get(env, {}).get(group, []))
 
     def save_inputs(self):
         """Validate and save all inputs to a JSON file."""
@@ -1050,9 +1514,9 @@ class SchedulingApp:
             AT = {}
             TT = {}
             for a in A:
-                AT[a] = {d: {p: self.assistant_time_prefs[a].get((d, p), 0) for p in PERIODS} for d in DAYS}
+                AT[a] = self.assistant_time_prefs.time_dict(a, DAYS, PERIODS)
             for t in T:
-                TT[t] = {d: {p: self.doctor_time_prefs[t].get((d, p), 0) for p in PERIODS} for d in DAYS}
+                TT[t] = self.doctor_time_prefs.time_dict(t, DAYS, PERIODS)
 
             # Prepare AS and TS in the specified format: AS[a][s], TS[t][s]
             all_subjects = sorted({s for e in self.environments for s in self.subjects[e]})
@@ -1082,6 +1546,7 @@ class SchedulingApp:
                 "AS": AS,
                 "TS": TS
             }
+            data.update(self.extra_inputs)
 
             # Save to a JSON file
             os.makedirs("inputs", exist_ok=True)
@@ -1104,41 +1569,51 @@ class SchedulingApp:
         # Create a modal dialog with a progress bar
         progress_dialog = tk.Toplevel(self.root)
         progress_dialog.title("Generating Schedules")
-        progress_dialog.geometry("300x100")
+        progress_dialog.geometry("300x140")
         progress_dialog.transient(self.root)
         progress_dialog.grab_set()
 
-        ttk.Label(progress_dialog, text="Generating schedules, please wait...").pack(pady=10)
+        status_label = ttk.Label(progress_dialog, text="Generating schedules, please wait...")
+        status_label.pack(pady=10)
         progress_bar = ttk.Progressbar(progress_dialog, length=200, mode="determinate", maximum=100)
         progress_bar.pack(pady=10)
 
-        # Variables to control the generation process
-        self.generation_complete = False
-        self.generation_error = None
-
-        def run_generation():
-            """Run the generation in a separate thread."""
-            try:
-                # -------------------- START: Generate Schedules Modifications --------------------
-                # Call the generate_schedules function from scheduler_logic.py
-                # The function is expected to handle its own output saving
-                scheduelModel()
-                # -------------------- END: Generate Schedules Modifications --------------------
-            except Exception as e:
-                self.generation_error = str(e)
-            finally:
-                self.generation_complete = True
+        # Build, solve and render in a separate process so the GUI heap stays flat
+        # and a runaway solve can be killed, or hand the job to the job service
+        server_url = self.server_url.get().strip()
+        if server_url:
+            # the HTTP client is only loaded for remote solves
+            from job_service import RemoteWorker
+
+            worker = RemoteWorker(server_url)
+        else:
+            worker = SolverWorker()
+        # local runs are recorded like command line ones; the job service keeps its own history
+        options = {} if server_url else {"history_path": "run_history.jsonl"}
+        try:
+            # with a MIP start the LP draft lands in schedule/draft within seconds
+            worker.submit(data, mip_start=self.mip_start.get(), **options)
+        except OSError as e:
+            progress_dialog.destroy()
+            messagebox.showerror("Error", f"Could not submit the job to {server_url}: {e}")
+            return
+
+        ttk.Button(progress_dialog, text="Cancel", command=worker.terminate, style="Delete.TButton").pack(pady=5)
+        progress_dialog.protocol("WM_DELETE_WINDOW", worker.terminate)
 
         def update_progress():
-            """Update the progress bar while generation is running."""
+            """Update the progress bar while the worker process is running."""
             start_time = time.time()
             estimated_duration = 10  # Estimated time in seconds (adjust as needed)
-            while not self.generation_complete:
+            while worker.running():
+                worker.poll()
                 elapsed = time.time() - start_time
                 progress = min(100, (elapsed / estimated_duration) * 100)
                 progress_bar["value"] = progress
+                status_label.configure(text=f"Generating schedules ({worker.phase})...")
                 progress_dialog.update()
                 time.sleep(0.1)  # Update every 100ms
+            worker.poll()
 
             # Ensure the progress bar reaches 100% when done
             progress_bar["value"] = 100
@@ -1146,51 +1621,24 @@ class SchedulingApp:
 
             # Close the dialog and show the result
             progress_dialog.destroy()
-            if self.generation_error:
-                messagebox.showerror("Error", f"Error generating schedules: {self.generation_error}")
+            if worker.error:
+                messagebox.showerror("Error", f"Error generating schedules: {worker.error}")
+            elif not worker.result["verification"]["feasible"]:
+                # the last warning names the broken constraints
+                notes = "\n".join(worker.result["warnings"])
+                messagebox.showerror("No schedule", f"No schedule was rendered ({worker.result['status']}).\n\n{notes}")
+            elif worker.result.get("warnings"):
+                location = "the job folder on the server" if server_url else "the 'schedule' folder"
+                notes = "\n".join(worker.result["warnings"])
+                messagebox.showwarning("Success", f"Schedules generated ({worker.result['status']}). Check {location}."
+                                                  f"\n\nWarnings:\n{notes}")
             else:
-                # -------------------- START: Generate Schedules Modifications --------------------
-                # Show a success message without saving the output here
-                messagebox.showinfo("Success", "Schedules generated successfully. Check the output as specified by the logic file.")
-                # -------------------- END: Generate Schedules Modifications --------------------
+                location = "the job folder on the server" if server_url else "the 'schedule' folder"
+                messagebox.showinfo("Success", f"Schedules generated successfully ({worker.result['status']}). Check {location}.")
 
-        # Start the generation in a separate thread
-        threading.Thread(target=run_generation, daemon=True).start()
         # Start updating the progress bar
         update_progress()
 
-    def update_groups(self, event):
-        """Update the groups, classes, subjects, assistants, and doctors listboxes when an environment is selected."""
-        self.group_listbox.delete(0, tk.END)
-        self.class_listbox.delete(0, tk.END)
-        self.subject_listbox.delete(0, tk.END)
-        self.assistant_listbox.delete(0, tk.END)
-        self.doctor_listbox.delete(0, tk.END)
-        selected = self.env_listbox.curselection()
-        if selected and self.env_listbox.get(selected[0]) != "Add an environment to start...":
-            env = self.env_listbox.get(selected[0])
-            for group in self.groups.get(env, []):
-                self.group_listbox.insert(tk.END, group)
-            for subject in self.subjects.get(env, []):
-                self.subject_listbox.insert(tk.END, subject)
-            for assistant in self.assistants.get(env, []):
-                self.assistant_listbox.insert(tk.END, assistant)
-            for doctor in self.doctors.get(env, []):
-                self.doctor_listbox.insert(tk.END, doctor)
-        self.group_listbox.bind('<<ListboxSelect>>', self.update_classes)
-
-    def update_classes(self, event):
-        """Update the classes listbox when a group is selected."""
-        self.class_listbox.delete(0, tk.END)
-        selected = self.group_listbox.curselection()
-        if selected:
-            env = self.env_listbox.get(self.env_listbox.curselection()[0])
-            group = self.group_listbox.get(selected[0])
-            if env not in self.classes or group not in self.classes[env]:
-                return
-            for class_name in self.classes[env].get(group, []):
-                self.class_listbox.insert(tk.END, class_name)
-
 if __name__ == "__main__":
     """Entry point for the application."""
     root = tk.Tk()
@@ -0,0 +1,87 @@
+"""Several diverse near-optimal schedules from one model.
+
+After the normal solve, solution_pool() keeps the objective within
+`tolerance` of the schedule found and asks CBC for different ones: every
+schedule adds a no-good cut over its lecture and section placements (Y of
+the first class of each group, X), so the next schedule moves at least
+`min_changes` sessions away from each earlier one. The model is built
+once; every solve only adds the new cut and is warm-started from the last
+schedule, and the cuts and the bound are removed again at the end.
+
+The main solve may have stopped on the time limit, so a pool solve can
+beat it; the bound then follows the better schedule, and the caller is
+expected to make the best of them its answer.
+
+    python scheduelModel.py --alternatives 3 --alternative-gap 0.05
+"""
+import time
+
+import pulp
+
+# a stopped solve still reports an incumbent through sol_status
+_FOUND = (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+
+
+def placements(tm):
+    """The session variables of `tm` that are 1 in its current values.
+
+    A group lecture is counted once, through its first class.
+    """
+    first = {g: classes[0] for g, classes in enumerate(tm.index.group_classes)}
+    chosen = [var for (e, g, c, s, d, p), var in tm.Y.items() if c == first[g] and (var.varValue or 0) > 0.5]
+    chosen += [var for var in tm.X.values() if (var.varValue or 0) > 0.5]
+    return chosen
+
+
+def solution_pool(tm, solver, count, time_limit, tolerance=0.05, min_changes=1):
+    """Find up to `count` more schedules close to the one held in `tm`.
+
+    `tm` must hold a solved schedule. The objective is bounded by its value
+    plus `tolerance` of its magnitude, and the time limit is shared by the
+    solves, time left by one going to the next. Stops early when a solve
+    finds nothing. Whenever a schedule beats the best so far, the bound is
+    moved to `tolerance` of it. Returns one compact solution per schedule
+    found (see extract_solution) with its status, objective and components
+    added, possibly better than the one held in `tm`; pooled teachers are
+    named as in the main solve, and a schedule whose pools can not be
+    split is skipped. `tm.model` is left without the added constraints.
+    """
+    from scheduelModel import OBJECTIVES, extract_solution
+
+    model = tm.model
+    objective = model.objective
+    best = pulp.value(objective)
+    model += objective <= best + tolerance * abs(best), "pool_objective"
+    added = ["pool_objective"]
+    try:
+        alternatives = []
+        deadline = time.perf_counter() + time_limit
+        for n in range(count):
+            cut = placements(tm)
+            added.append(f"pool_cut{n}")
+            model += pulp.lpSum(cut) <= len(cut) - min_changes, added[-1]
+            remaining = deadline - time.perf_counter()
+            if remaining < 1:
+                break
+            model.solve(solver(max(1, remaining / (count - n)), warmStart=True))
+            if model.sol_status not in _FOUND:
+                break
+            value = pulp.value(objective)
+            if value < best - 1e-6:
+                best = value
+                model.constraints.pop("pool_objective")
+                model += objective <= best + tolerance * abs(best), "pool_objective"
+            solution = extract_solution(tm.index, tm.Y, tm.X, tm.I, tm.J)
+            if tm.pools is not None:
+                from teacher_pools import disaggregate
+
+                solution = disaggregate(tm, solution)
+            if solution is not None:
+                solution["status"] = pulp.LpStatus[model.status]
+                solution["objective"] = value
+                solution["components"] = {k: pulp.value(tm.objectives[k]) for k in OBJECTIVES}
+                alternatives.append(solution)
+        return alternatives
+    finally:
+        for name in added:
+            model.constraints.pop(name, None)
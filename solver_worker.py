@@ -0,0 +1,130 @@
+import json
+import os
+import signal
+import time
+import multiprocessing as mp
+
+# The child process is started with "spawn" so it never inherits the Tk
+# interpreter state, and every pulp / matplotlib object dies with it.
+_CONTEXT = mp.get_context("spawn")
+
+# seconds a cancelled child gets to exit before it is killed
+_TERMINATE_GRACE = 5
+
+
+def _worker_main(conn, request):
+    """Entry point of the child process: solve one request and report back.
+
+    Messages sent to the parent are tuples:
+        ("progress", phase)   while the model is built, solved and rendered
+        ("result", solution)  the compact solution from scheduelModel()
+        ("error", message)    if anything raised
+    """
+    if hasattr(os, "setsid"):
+        # own process group, so terminate() also reaches the CBC subprocess
+        os.setsid()
+    try:
+        from scheduelModel import scheduelModel
+
+        data = json.loads(request["data"])
+        solution = scheduelModel(
+            data,
+            progress=lambda phase: conn.send(("progress", phase)),
+            **request.get("options", {})
+        )
+        conn.send(("result", solution))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class SolverWorker:
+    """Runs one scheduelModel() solve in a child process.
+
+    Inputs go in as JSON text (the same form as the saved inputs file), the
+    compact solution comes back over a pipe. A fresh process is used for every
+    solve so the caller's memory stays flat, and `terminate` kills a runaway
+    build or solve immediately.
+    """
+    def __init__(self):
+        self.process = None
+        self.conn = None
+        self.phase = None
+        self.result = None
+        self.error = None
+
+    def submit(self, data, **options):
+        """Start solving `data` with the given scheduelModel() keyword options."""
+        if self.running():
+            raise RuntimeError("A solve is already running in this worker.")
+        self.phase = "starting"
+        self.result = None
+        self.error = None
+        parent_conn, child_conn = _CONTEXT.Pipe(duplex=False)
+        request = {"data": json.dumps(data), "options": options}
+        self.process = _CONTEXT.Process(target=_worker_main, args=(child_conn, request), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def running(self):
+        """Return True while the child process is alive or has unread messages."""
+        return self.process is not None and (self.process.is_alive() or (self.conn is not None and self.conn.poll()))
+
+    def poll(self, timeout=0):
+        """Drain pending messages from the child and return them as a list."""
+        messages = []
+        if self.conn is None:
+            return messages
+        try:
+            while self.conn.poll(timeout):
+                kind, payload = self.conn.recv()
+                messages.append((kind, payload))
+                if kind == "progress":
+                    self.phase = payload
+                elif kind == "result":
+                    self.result = payload
+                    self.phase = "done"
+                elif kind == "error":
+                    self.error = payload
+                    self.phase = "failed"
+                timeout = 0
+        except EOFError:
+            self._finish()
+            self.process.join(1)
+            if self.result is None and self.error is None:
+                self.error = f"Solver process exited with code {self.process.exitcode}"
+                self.phase = "failed"
+        return messages
+
+    def wait(self, timeout=None):
+        """Block until the solve finishes and return the compact solution."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running() and (deadline is None or time.monotonic() < deadline):
+            self.poll(0.1)
+        self.poll()
+        if self.error:
+            raise RuntimeError(self.error)
+        return self.result
+
+    def terminate(self):
+        """Kill the child process, discarding any partial work."""
+        if self.process is not None and self.process.is_alive():
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+            except (AttributeError, OSError):
+                # no process groups here, or the child has not called setsid() yet
+                self.process.terminate()
+            self.process.join(_TERMINATE_GRACE)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.error = "Solve cancelled"
+            self.phase = "cancelled"
+        self._finish()
+
+    def _finish(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
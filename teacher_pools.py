@@ -0,0 +1,111 @@
+"""Pooling of interchangeable teachers.
+
+Teachers with identical time and subject preferences (their load limits,
+AL/TL, are shared by everyone anyway) are interchangeable: build_model can
+model each pool as one teacher that may take as many sessions per slot,
+periods per week and subjects as all its members together, which divides
+the I/J/ADS/TDS variables and the per-teacher constraints by the pool size.
+The pooled schedule names only the first teacher of each pool;
+disaggregate() then shares its sessions out among the members with a small
+assignment problem per pool, the slots being fixed by then.
+
+    python scheduelModel.py --pool-teachers
+"""
+import json
+
+import pulp
+
+
+def find_pools(data):
+    """{"A": [[assistant, ...]], "T": [[doctor, ...]]}, the teachers with identical preferences.
+
+    Every teacher is in exactly one pool, pools and their members keep the
+    input order.
+    """
+    pools = {}
+    for role, time_key, subject_key in (("A", "AT", "AS"), ("T", "TT", "TS")):
+        by_prefs = {}
+        for teacher in data[role]:
+            # a subject missing from the preferences counts as 0
+            subjects = {s: v for s, v in data[subject_key].get(teacher, {}).items() if v}
+            key = json.dumps([data[time_key][teacher], subjects], sort_keys=True)
+            by_prefs.setdefault(key, []).append(teacher)
+        pools[role] = list(by_prefs.values())
+    return pools
+
+
+def _split_pool(members, sessions, counts, limits, time_limit):
+    """{session: member} for the sessions of one pool, or None if they can not be split.
+
+    `sessions` maps a session key to its (subject, day, period) and
+    `counts` how many members teach each subject in the pooled solve; the
+    assignment keeps those counts when it can and minimizes the largest
+    load so the periods are spread over the members.
+    """
+    subjects = sorted({s for s, d, p in sessions.values()})
+    slots = {}
+    for key, (s, d, p) in sessions.items():
+        slots.setdefault((d, p), []).append(key)
+
+    for keep_counts in (True, False):
+        model = pulp.LpProblem("Pool", pulp.LpMinimize)
+        x = {(m, k): pulp.LpVariable(f"x{i}", cat="Binary")
+             for i, (m, k) in enumerate((m, k) for m in members for k in sessions)}
+        y = {(m, s): pulp.LpVariable(f"y{i}", cat="Binary")
+             for i, (m, s) in enumerate((m, s) for m in members for s in subjects)}
+        largest = pulp.LpVariable("largest", 0)
+        model += largest
+        for k in sessions:
+            model += pulp.lpSum(x[m, k] for m in members) == 1
+        for m in members:
+            for keys in slots.values():
+                model += pulp.lpSum(x[m, k] for k in keys) <= 1
+            load = pulp.lpSum(x[m, k] for k in sessions)
+            model += load <= limits[0]
+            model += load <= largest
+            model += pulp.lpSum(y[m, s] for s in subjects) <= limits[1]
+            for k, (s, d, p) in sessions.items():
+                model += x[m, k] <= y[m, s]
+        if keep_counts:
+            for s in subjects:
+                model += pulp.lpSum(y[m, s] for m in members) == counts.get(s, 0)
+        model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+        if pulp.LpStatus[model.status] == "Optimal":
+            return {k: m for m in members for k in sessions if (pulp.value(x[m, k]) or 0) > 0.5}
+    return None
+
+
+def disaggregate(tm, solution, time_limit=10):
+    """Replace the pooled teachers of `solution` by named members of their pool.
+
+    `tm` is the pooled TimetableModel the solution was extracted from; the
+    number of members teaching each subject is read from its ADS/TDS. A
+    lecture is given to one member for all the classes of its group.
+    Returns a new solution, or None when a pool can not be split within
+    the AL/TL limits (the pooled model is a relaxation of the full one).
+    """
+    index = tm.index
+    data = tm.data
+    result = dict(solution)
+    for kind, role, limits, subject_counts in (("lectures", "T", data["TL"], tm.TDS),
+                                               ("sections", "A", data["AL"], tm.ADS)):
+        rows = [list(r) for r in solution[kind]]
+        for pool_id, members in enumerate(tm.pools[role]):
+            if len(members) == 1:
+                continue
+            sessions = {}
+            for r in rows:
+                if r[6] == members[0]:
+                    # a lecture is one row per class of the group
+                    key = (r[0], r[1], r[3], r[4], r[5]) if kind == "lectures" else tuple(r[:6])
+                    sessions[key] = (r[3], r[4], r[5])
+            counts = {s: round(pulp.value(subject_counts[pool_id, index.subject_id[s]]) or 0)
+                      for s in {s for s, d, p in sessions.values()}}
+            split = _split_pool(members, sessions, counts, limits, time_limit)
+            if split is None:
+                return None
+            for r in rows:
+                if r[6] == members[0]:
+                    r[6] = split[(r[0], r[1], r[3], r[4], r[5]) if kind == "lectures" else tuple(r[:6])]
+        result[kind] = rows
+    return result
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the modules live at the top level, the instance generator with the benchmarks
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+from instances import generate_instance  # noqa: E402
+
+
+@pytest.fixture
+def tiny():
+    """One group of two classes over two days: both formulations prove it optimal in seconds."""
+    return generate_instance(3, environments=1, groups=1, classes=2, subjects=2,
+                             assistants=2, doctors=2, days=2, periods=3)
+
+
+@pytest.fixture
+def overbooked():
+    """More sessions than the week has teachers for; no schedule exists."""
+    return generate_instance(1, environments=1, groups=2, classes=2, subjects=3,
+                             assistants=1, doctors=1, days=2, periods=2)
@@ -0,0 +1,22 @@
+import pytest
+
+from checkpoint import load_checkpoint, write_checkpoint
+from scheduelModel import input_hash
+
+
+def test_checkpoint_round_trip(tiny, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    solution = {"status": "Optimal", "objective": 86.0, "elapsed": 1.5,
+                "lectures": [["year1", "year1-g1", None, "subject1", 1, 1, "doctor1"]],
+                "sections": [["year1", "year1-g1", "year1-g1-c1", "subject1", 1, 2, "assistant1"]]}
+    write_checkpoint(path, solution, input_hash(tiny))
+    record = load_checkpoint(path, input_hash(tiny))
+    assert {k: record[k] for k in solution} == solution
+    assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+
+def test_checkpoint_of_other_inputs_is_rejected(tiny, overbooked, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    write_checkpoint(path, {"lectures": [], "sections": []}, input_hash(tiny))
+    with pytest.raises(ValueError):
+        load_checkpoint(path, input_hash(overbooked))
@@ -0,0 +1,13 @@
+import pulp
+import pytest
+
+from scheduelModel import build_model
+
+
+@pytest.mark.parametrize("compactness", ["bigm", "tight"])
+def test_formulations_reach_the_same_optimum(tiny, compactness):
+    tm = build_model(tiny, compactness)
+    tm.model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=60))
+    assert tm.model.sol_status == pulp.LpSolutionOptimal
+    # the optimum of generate_instance(3) for the tiny fixture
+    assert pulp.value(tm.model.objective) == pytest.approx(86)
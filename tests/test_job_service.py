@@ -0,0 +1,49 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from job_service import make_server
+
+
+@pytest.fixture
+def service_url(tmp_path):
+    server = make_server(port=0, workers=1, output_root=str(tmp_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, body):
+    request = urllib.request.Request(f"{url}/jobs", data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[1, 2]",
+    b'"data"',
+    b"{}",
+    b'{"data": {}, "options": [1]}',
+    b'{"data": {}, "options": {"solver": "gurobi"}}',
+    b'{"data": {}, "options": {"checkpoint": "/etc/passwd"}}',
+    b'{"data": {}, "options": {"resume_from": "no-such-job"}}',
+])
+def test_bad_payloads_get_400(service_url, body):
+    status, reply = _post(service_url, body)
+    assert status == 400
+    assert reply["error"].startswith("Invalid job request")
+
+
+def test_unknown_job_is_404(service_url):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"{service_url}/jobs/no-such-job", timeout=10)
+    assert error.value.code == 404
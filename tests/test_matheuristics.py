@@ -0,0 +1,20 @@
+import pytest
+
+from scheduelModel import scheduelModel
+
+
+def test_relax_and_fix_finds_a_feasible_schedule(tiny, tmp_path):
+    solution = scheduelModel(tiny, time_limit=20, output_dir=str(tmp_path), method="relax-and-fix", window=1)
+    assert solution["verification"]["feasible"], solution["verification"]["violations"]
+    assert solution["objective"] == pytest.approx(solution["verification"]["objective"])
+    assert solution["windows"]
+
+
+def test_relax_and_fix_fails_cleanly(overbooked, tmp_path):
+    solution = scheduelModel(overbooked, time_limit=10, output_dir=str(tmp_path), method="relax-and-fix")
+    assert not solution["verification"]["feasible"]
+    assert solution["objective"] is None
+    assert solution["lectures"] == [] and solution["sections"] == []
+    assert solution["warnings"][-1].startswith("no feasible schedule found")
+    # nothing rendered, only the CBC logs
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["logs"]
@@ -0,0 +1,15 @@
+from scheduelModel import scheduelModel, _placements
+
+
+def test_alternatives_differ_and_stay_within_tolerance(tiny, tmp_path):
+    gap = 0.1
+    solution = scheduelModel(tiny, time_limit=30, output_dir=str(tmp_path), alternatives=2, alternative_gap=gap)
+    assert solution["verification"]["feasible"]
+    assert solution["alternatives"]
+    placed = _placements(solution)
+    for alternative in solution["alternatives"]:
+        assert alternative["verification"]["feasible"]
+        assert alternative["changes"] >= 1
+        assert _placements(alternative) != placed
+        assert solution["objective"] - 1e-6 <= alternative["objective"]
+        assert alternative["objective"] <= solution["objective"] + gap * abs(solution["objective"]) + 1e-6
@@ -0,0 +1,23 @@
+import copy
+
+import pytest
+
+from scheduelModel import scheduelModel
+from schedule_verifier import verify_schedule
+
+
+def test_solved_schedule_passes(tiny, tmp_path):
+    solution = scheduelModel(tiny, time_limit=20, output_dir=str(tmp_path))
+    verification = verify_schedule(tiny, solution)
+    assert verification["feasible"], verification["violations"]
+    assert verification["objective"] == pytest.approx(solution["objective"])
+
+
+def test_broken_schedule_fails(tiny, tmp_path):
+    solution = scheduelModel(tiny, time_limit=20, output_dir=str(tmp_path))
+    broken = copy.deepcopy(solution)
+    broken["lectures"].pop()
+    broken["sections"].append(list(broken["sections"][0]))
+    verification = verify_schedule(tiny, broken)
+    assert not verification["feasible"]
+    assert {"lecture_once", "section_once"} <= set(verification["violations"])